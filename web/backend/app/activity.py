@@ -0,0 +1,98 @@
+"""Write-behind recorder for User.last_active.
+
+Authenticated requests only note "user X was active at T" in memory. The
+pending timestamps are written in one batched UPDATE every
+ACTIVITY_FLUSH_INTERVAL seconds and on shutdown (see lifespan in app.main),
+so no request pays for a write transaction just to track activity.
+"""
+import asyncio
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional, Set
+
+from sqlalchemy import case, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_FLUSH_INTERVAL", "30"))  # seconds
+
+
+class ActivityRecorder:
+    """Collects user id -> last activity pairs and flushes them in batches."""
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        # Defaults to app.database.SessionLocal, resolved on first flush
+        self.session_factory = session_factory
+        self._pending: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+
+    def record(self, user_id: int, when: Optional[datetime] = None) -> None:
+        """Note that a user was active (now, unless given)."""
+        when = when or datetime.utcnow()
+        with self._lock:
+            if user_id not in self._pending or self._pending[user_id] < when:
+                self._pending[user_id] = when
+
+    def pending(self) -> Dict[int, datetime]:
+        """Return a copy of the not yet flushed timestamps."""
+        with self._lock:
+            return dict(self._pending)
+
+    def clear(self) -> None:
+        """Drop all pending timestamps without writing them."""
+        with self._lock:
+            self._pending.clear()
+
+    def flush(self) -> int:
+        """Write all pending timestamps with a single UPDATE ... CASE.
+
+        On failure the timestamps are put back and retried with the next flush.
+
+        Returns:
+            Number of users updated
+        """
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        session_factory = self.session_factory
+        if session_factory is None:
+            from app.database import SessionLocal
+            session_factory = SessionLocal
+
+        try:
+            with session_factory() as db:
+                db.execute(
+                    update(models.User)
+                    .where(models.User.id.in_(batch))
+                    .values(last_active=case(batch, value=models.User.id))
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+        except Exception as e:
+            logger.warning(f"⚠️  Could not flush last_active for {len(batch)} users: {e}")
+            for user_id, when in batch.items():
+                self.record(user_id, when)
+            return 0
+        return len(batch)
+
+    def active_user_ids(self, db: Session, since: datetime) -> Set[int]:
+        """IDs of users active since a point in time - database merged with pending."""
+        active = set(db.scalars(select(models.User.id).where(models.User.last_active >= since)))
+        active.update(user_id for user_id, when in self.pending().items() if when >= since)
+        return active
+
+    async def run(self, interval: float = ACTIVITY_FLUSH_INTERVAL) -> None:
+        """Flush periodically until cancelled (started by the app lifespan)."""
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(self.flush)
+
+
+activity_recorder = ActivityRecorder()
@@ -1,10 +1,41 @@
 """Anmeldung (Registration) Repository - Data access layer for Anmeldung domain."""
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from typing import List, Optional
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, update, insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from app import models
 from app.anmeldung import schemas as anmeldung_schemas
+from app.grunddaten.repository import FigurRepository
+from app.shared.pagination import apply_keyset, decode_cursor, next_cursor
+from app.shared.utils import set_association
+
+
+# Loading plan for everything map_anmeldung_to_dto touches: the Kind (many-to-one)
+# with its Verein/Verband/Versicherung is joined, the figuren collection is
+# fetched with one SELECT ... IN per page instead of one lazy load per row.
+ANMELDUNG_EAGER_LOADS = (
+    joinedload(models.Anmeldung.kind).joinedload(models.Kind.verein),
+    joinedload(models.Anmeldung.kind).joinedload(models.Kind.verband),
+    joinedload(models.Anmeldung.kind).joinedload(models.Kind.versicherung),
+    selectinload(models.Anmeldung.figuren),
+)
+
+# Anmeldungen are listed by id - the cursor context guards against reuse elsewhere
+LIST_CURSOR_CONTEXT = {"list": "anmeldung"}
+
+
+def build_list_statements(skip: int, limit: int, cursor: Optional[str]):
+    """Build the page statement (Anmeldung, id) and the COUNT statement for list_page."""
+    stmt = select(models.Anmeldung, models.Anmeldung.id.label("sort_key_0")).order_by(models.Anmeldung.id)
+    if cursor is not None:
+        stmt = apply_keyset(
+            stmt, [models.Anmeldung.id], decode_cursor(cursor, **LIST_CURSOR_CONTEXT), descending=False
+        )
+    else:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit + 1), select(func.count(models.Anmeldung.id))
 
 
 class AnmeldungRepository:
@@ -30,8 +61,8 @@ class AnmeldungRepository:
     def get_with_details(self, anmeldung_id: int) -> Optional[models.Anmeldung]:
         """Get an Anmeldung by ID with eager loading of related entities.
 
-        This method uses SQLAlchemy's joinedload to efficiently fetch the
-        Anmeldung along with its related Kind and Figuren in a single query.
+        Uses ANMELDUNG_EAGER_LOADS, so the Anmeldung with its Kind (incl. Verein,
+        Verband, Versicherung) and Figuren is fetched in two queries.
 
         Args:
             anmeldung_id: ID of the Anmeldung to retrieve
@@ -40,8 +71,7 @@ class AnmeldungRepository:
             Anmeldung model instance with eager-loaded relationships if found, None otherwise
         """
         return self.db.query(models.Anmeldung).options(
-            joinedload(models.Anmeldung.kind),
-            joinedload(models.Anmeldung.figuren)
+            *ANMELDUNG_EAGER_LOADS
         ).filter(models.Anmeldung.id == anmeldung_id).first()
 
     def list(self, skip: int = 0, limit: int = 100) -> List[models.Anmeldung]:
@@ -52,31 +82,104 @@ class AnmeldungRepository:
             limit: Maximum number of records to return
 
         Returns:
-            List of Anmeldung instances with eager-loaded Kind and nested entities
+            List of Anmeldung instances with eager-loaded Kind, nested entities and Figuren
         """
-        return self.db.query(models.Anmeldung).options(
-            joinedload(models.Anmeldung.kind).joinedload(models.Kind.verein),
-            joinedload(models.Anmeldung.kind).joinedload(models.Kind.verband),
-            joinedload(models.Anmeldung.kind).joinedload(models.Kind.versicherung)
-        ).offset(skip).limit(limit).all()
+        anmeldungen, _, _ = self.list_page(skip=skip, limit=limit)
+        return anmeldungen
+
+    def list_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> tuple[List[models.Anmeldung], Optional[str], Optional[int]]:
+        """List Anmeldungen ordered by id with keyset (cursor) or offset pagination.
+
+        Args:
+            skip: Number of records to skip - ignored when a cursor is given
+            limit: Maximum number of records to return
+            cursor: Cursor from a previous page's next_cursor
+            include_total: Also count all Anmeldungen
+
+        Returns:
+            Tuple of (Anmeldung instances, cursor for the next page or None, total count or None)
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        stmt, total_stmt = build_list_statements(skip, limit, cursor)
+        rows = self.db.execute(stmt.options(*ANMELDUNG_EAGER_LOADS)).unique().all()
+        total_count = self.db.scalar(total_stmt) if include_total else None
+        return [row[0] for row in rows[:limit]], next_cursor(rows, limit, **LIST_CURSOR_CONTEXT), total_count
 
     def get_next_startnummer(self, wettkampf_id: int) -> int:
-        """Get the next available startnummer for a competition.
+        """Allocate the next startnummer for a competition.
 
-        This method performs an atomic MAX query to determine the next
-        startnummer, avoiding race conditions in concurrent registrations.
+        See reserve_startnummern - the number belongs to the current
+        transaction and is released again if it is rolled back.
 
         Args:
             wettkampf_id: ID of the Wettkampf (competition)
 
         Returns:
-            Next available startnummer (1 if this is the first registration)
+            Allocated startnummer (1 if this is the first registration)
         """
-        max_startnummer = self.db.query(func.max(models.Anmeldung.startnummer)).filter(
-            models.Anmeldung.wettkampf_id == wettkampf_id
-        ).scalar()
+        return self.reserve_startnummern(wettkampf_id, 1).start
+
+    def reserve_startnummern(self, wettkampf_id: int, count: int) -> range:
+        """Atomically reserve a block of consecutive startnummern.
 
-        return (max_startnummer or 0) + 1
+        Increments the competition's row in startnummer_sequenz with
+        UPDATE ... RETURNING, which takes the write lock - concurrent
+        registrations serialize on it instead of reading the same MAX().
+        The counter never falls behind numbers assigned by other means
+        (legacy data, imports): it continues after the highest existing
+        startnummer, a cheap lookup on ux_anmeldung_wettkampf_startnummer.
+
+        Args:
+            wettkampf_id: ID of the Wettkampf (competition)
+            count: Number of startnummern to reserve
+
+        Returns:
+            Range of the reserved startnummern
+        """
+        sequenz = models.StartnummerSequenz.__table__
+        self.db.execute(
+            sqlite_insert(sequenz)
+            .values(wettkampf_id=wettkampf_id, last_value=0)
+            .on_conflict_do_nothing(index_elements=["wettkampf_id"])
+        )
+        max_startnummer = select(
+            func.coalesce(func.max(models.Anmeldung.startnummer), 0)
+        ).where(models.Anmeldung.wettkampf_id == wettkampf_id).scalar_subquery()
+        last_value = self.db.execute(
+            update(sequenz)
+            .where(sequenz.c.wettkampf_id == wettkampf_id)
+            .values(last_value=func.max(sequenz.c.last_value, max_startnummer) + count)
+            .returning(sequenz.c.last_value)
+        ).scalar_one()
+        return range(last_value - count + 1, last_value + 1)
+
+    def registered_kind_ids(self, wettkampf_id: int, kind_ids: Iterable[int]) -> Set[int]:
+        """Return which of the given Kinder are already registered for a competition.
+
+        Args:
+            wettkampf_id: ID of the Wettkampf
+            kind_ids: IDs of the Kinder to check
+
+        Returns:
+            Set of the Kind IDs with an existing Anmeldung
+        """
+        kind_ids = set(kind_ids)
+        if not kind_ids:
+            return set()
+        return set(self.db.scalars(
+            select(models.Anmeldung.kind_id).where(
+                models.Anmeldung.wettkampf_id == wettkampf_id,
+                models.Anmeldung.kind_id.in_(kind_ids)
+            )
+        ))
 
     def count_final_registrations(self, wettkampf_id: int) -> int:
         """Count final (non-vorläufig) active registrations for a competition.
@@ -113,6 +216,46 @@ class AnmeldungRepository:
         self.db.flush()  # Get the ID without committing
         return db_anmeldung
 
+    def bulk_create(self, wettkampf_id: int, rows: List[Dict[str, Any]], figur_ids: List[List[int]]) -> List[int]:
+        """Insert several Anmeldungen of one competition and their Figur links with executemany.
+
+        Every row needs a (reserved) startnummer: the new IDs are read back in
+        one query via the unique (wettkampf_id, startnummer) index, as SQLite
+        cannot return them from an executemany. Does not commit - the caller
+        owns the transaction.
+
+        Args:
+            wettkampf_id: ID of the Wettkampf all rows belong to
+            rows: Column values per Anmeldung (without wettkampf_id)
+            figur_ids: Figur IDs per Anmeldung, in the order of rows
+
+        Returns:
+            IDs of the inserted Anmeldungen, in the order of rows
+        """
+        if not rows:
+            return []
+        self.db.execute(
+            insert(models.Anmeldung.__table__),
+            [{**row, "wettkampf_id": wettkampf_id} for row in rows]
+        )
+        startnummern = [row["startnummer"] for row in rows]
+        id_by_startnummer = dict(self.db.execute(
+            select(models.Anmeldung.startnummer, models.Anmeldung.id).where(
+                models.Anmeldung.wettkampf_id == wettkampf_id,
+                models.Anmeldung.startnummer.in_(startnummern)
+            )
+        ).all())
+        anmeldung_ids = [id_by_startnummer[startnummer] for startnummer in startnummern]
+
+        links = [
+            {"anmeldung_id": anmeldung_id, "figur_id": figur_id}
+            for anmeldung_id, ids in zip(anmeldung_ids, figur_ids)
+            for figur_id in ids
+        ]
+        if links:
+            self.db.execute(insert(models.anmeldung_figur_association), links)
+        return anmeldung_ids
+
     def update(
         self,
         anmeldung_id: int,
@@ -183,6 +326,9 @@ class AnmeldungRepository:
     def set_figuren(self, anmeldung_id: int, figur_ids: List[int]) -> Optional[models.Anmeldung]:
         """Set all Figuren for an Anmeldung at once.
 
+        Only the difference to the current Figuren is written (see
+        set_association); unknown Figur IDs are ignored.
+
         Args:
             anmeldung_id: ID of the Anmeldung
             figur_ids: List of Figur IDs to set
@@ -194,15 +340,68 @@ class AnmeldungRepository:
         if not db_anmeldung:
             return None
 
-        # Clear existing figures
-        db_anmeldung.figuren.clear()
-
-        # Add new figures
-        for figur_id in figur_ids:
-            figur = self.db.query(models.Figur).filter(models.Figur.id == figur_id).first()
-            if figur:
-                db_anmeldung.figuren.append(figur)
+        set_association(
+            self.db,
+            models.anmeldung_figur_association.c.anmeldung_id,
+            models.anmeldung_figur_association.c.figur_id,
+            anmeldung_id,
+            FigurRepository(self.db).existing_ids(figur_ids)
+        )
 
         self.db.commit()
-        self.db.refresh(db_anmeldung)
         return db_anmeldung
+
+
+class AsyncAnmeldungRepository:
+    """Async repository for the Anmeldung read paths (ENABLE_ASYNC_DB).
+
+    Async sessions cannot lazy-load, so every relationship the mapper touches
+    (kind with verein/verband/versicherung, figuren) is loaded up front.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """Initialize repository with async database session."""
+        self.db = db
+
+    async def get_with_details(self, anmeldung_id: int) -> Optional[models.Anmeldung]:
+        """Get an Anmeldung by ID with its Kind and Figuren.
+
+        Args:
+            anmeldung_id: ID of the Anmeldung to retrieve
+
+        Returns:
+            Anmeldung model instance with eager-loaded relationships if found, None otherwise
+        """
+        result = await self.db.scalars(
+            select(models.Anmeldung)
+            .options(*ANMELDUNG_EAGER_LOADS)
+            .where(models.Anmeldung.id == anmeldung_id)
+        )
+        return result.unique().first()
+
+    async def list(self, skip: int = 0, limit: int = 100) -> List[models.Anmeldung]:
+        """List all Anmeldungen with pagination and eager loading.
+
+        Args:
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+
+        Returns:
+            List of Anmeldung instances with eager-loaded Kind and Figuren
+        """
+        anmeldungen, _, _ = await self.list_page(skip=skip, limit=limit)
+        return anmeldungen
+
+    async def list_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> tuple[List[models.Anmeldung], Optional[str], Optional[int]]:
+        """Async variant of AnmeldungRepository.list_page."""
+        stmt, total_stmt = build_list_statements(skip, limit, cursor)
+        result = await self.db.execute(stmt.options(*ANMELDUNG_EAGER_LOADS))
+        rows = result.unique().all()
+        total_count = await self.db.scalar(total_stmt) if include_total else None
+        return [row[0] for row in rows[:limit]], next_cursor(rows, limit, **LIST_CURSOR_CONTEXT), total_count
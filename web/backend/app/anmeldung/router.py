@@ -1,22 +1,28 @@
 """Anmeldung (Registration) API Router."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import date
 
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db, get_async_db
 from app import models, auth
 from app.anmeldung import schemas as anmeldung_schemas
-from app.anmeldung.repository import AnmeldungRepository
+from app.anmeldung.repository import AnmeldungRepository, AsyncAnmeldungRepository
 from app.anmeldung.services import AnmeldungService
 from app.anmeldung.dtos import AnmeldungDTO
 from app.anmeldung.mappers import map_anmeldung_to_dto, map_anmeldungen_to_dtos
 from app.kind.repository import KindRepository
 from app.wettkampf.repository import WettkampfRepository
 from app.grunddaten.repository import FigurRepository
+from app.shared.pagination import InvalidCursorError
 
 router = APIRouter(prefix="/api", tags=["anmeldung"])
 
+# Async variants of the hot read endpoints (see app.kind.router.async_router)
+async_router = APIRouter(prefix="/api", tags=["anmeldung"], include_in_schema=False)
+
 
 def get_anmeldung_service(db: Session = Depends(get_db)) -> AnmeldungService:
     """Dependency to get AnmeldungService instance."""
@@ -29,13 +35,30 @@ def get_anmeldung_service(db: Session = Depends(get_db)) -> AnmeldungService:
 
 @router.get("/anmeldung", response_model=List[AnmeldungDTO])
 def list_anmeldung(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     service: AnmeldungService = Depends(get_anmeldung_service),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    current_user: auth.Principal = Depends(auth.require_app_read_permission)
 ):
-    """Get list of all registrations."""
-    anmeldungen = service.list_anmeldungen(skip=skip, limit=limit)
+    """Get list of all registrations.
+
+    Pass the X-Next-Cursor header of a page as `cursor` for the next page
+    (keyset pagination). X-Total-Count is only sent with include_total=true.
+    """
+    try:
+        anmeldungen, next_cursor, total_count = service.list_anmeldungen_page(
+            skip=skip, limit=limit, cursor=cursor, include_total=include_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if total_count is not None:
+        response.headers["X-Total-Count"] = str(total_count)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     # Map ORM models to DTOs
     return map_anmeldungen_to_dtos(anmeldungen)
 
@@ -44,7 +67,7 @@ def list_anmeldung(
 def get_anmeldung(
     anmeldung_id: int,
     service: AnmeldungService = Depends(get_anmeldung_service),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    current_user: auth.Principal = Depends(auth.require_app_read_permission)
 ):
     """Get a specific registration by ID."""
     anmeldung = service.get_anmeldung(anmeldung_id)
@@ -58,7 +81,7 @@ def get_anmeldung(
 def create_anmeldung(
     anmeldung: anmeldung_schemas.AnmeldungCreate,
     service: AnmeldungService = Depends(get_anmeldung_service),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """
     Create a new registration with automatic startnummer assignment.
@@ -79,12 +102,35 @@ def create_anmeldung(
         raise HTTPException(status_code=409, detail=f"Registration conflict: {str(e)}")
 
 
+@router.post(
+    "/wettkampf/{wettkampf_id}/anmeldungen:bulk",
+    response_model=List[anmeldung_schemas.BulkAnmeldungResult]
+)
+def create_anmeldungen_bulk(
+    wettkampf_id: int,
+    anmeldungen: List[anmeldung_schemas.BulkAnmeldungItem],
+    service: AnmeldungService = Depends(get_anmeldung_service),
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
+):
+    """
+    Register a whole club roster for a competition in one request.
+
+    - Same 'vorläufig' rules as POST /anmeldung, checked for all rows at once
+    - Startnummern are assigned as one consecutive block in input order
+    - Returns one result per row; rejected rows ('abgelehnt') are not stored
+    """
+    try:
+        return service.create_anmeldungen_bulk(wettkampf_id, anmeldungen)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
 @router.put("/anmeldung/{anmeldung_id}", response_model=AnmeldungDTO)
 def update_anmeldung(
     anmeldung_id: int,
     anmeldung: anmeldung_schemas.AnmeldungUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """
     Update a registration.
@@ -149,10 +195,52 @@ def update_anmeldung(
 def delete_anmeldung(
     anmeldung_id: int,
     service: AnmeldungService = Depends(get_anmeldung_service),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Delete a registration."""
     deleted = service.delete_anmeldung(anmeldung_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Anmeldung not found")
     return None
+
+
+# ============================================================================
+# ASYNC READ ENDPOINTS (ENABLE_ASYNC_DB)
+# ============================================================================
+
+@async_router.get("/anmeldung", response_model=List[AnmeldungDTO])
+async def list_anmeldung_async(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: auth.Principal = Depends(auth.require_app_read_permission_async)
+):
+    """Async variant of list_anmeldung."""
+    try:
+        anmeldungen, next_cursor, total_count = await AsyncAnmeldungRepository(db).list_page(
+            skip=skip, limit=limit, cursor=cursor, include_total=include_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if total_count is not None:
+        response.headers["X-Total-Count"] = str(total_count)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return map_anmeldungen_to_dtos(anmeldungen)
+
+
+@async_router.get("/anmeldung/{anmeldung_id}", response_model=AnmeldungDTO)
+async def get_anmeldung_async(
+    anmeldung_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: auth.Principal = Depends(auth.require_app_read_permission_async)
+):
+    """Async variant of get_anmeldung."""
+    anmeldung = await AsyncAnmeldungRepository(db).get_with_details(anmeldung_id)
+    if not anmeldung:
+        raise HTTPException(status_code=404, detail="Anmeldung not found")
+    return map_anmeldung_to_dto(anmeldung)
@@ -33,3 +33,18 @@ class Anmeldung(BaseModel):
     figuren: List["Figur"] = []
     insurance_ok: bool
     kind: Optional["Kind"] = None
+
+
+# Bulk registration (POST /api/wettkampf/{id}/anmeldungen:bulk)
+class BulkAnmeldungItem(BaseModel):
+    kind_id: int
+    figur_ids: List[int] = []
+
+
+class BulkAnmeldungResult(BaseModel):
+    kind_id: int
+    status: str  # "aktiv", "vorläufig" or "abgelehnt" (not registered)
+    anmeldung_id: int | None = None
+    startnummer: int | None = None
+    vorlaeufig: int | None = None
+    reasons: List[str] = []
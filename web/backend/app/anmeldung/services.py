@@ -1,6 +1,9 @@
 """Anmeldung (Registration) Service - Business logic layer for Anmeldung domain."""
+import time
 from datetime import date
-from typing import List
+from typing import List, Optional
+
+from sqlalchemy.exc import IntegrityError, OperationalError
 
 from app import models
 from app.anmeldung import schemas as anmeldung_schemas
@@ -10,6 +13,21 @@ from app.wettkampf.repository import WettkampfRepository
 from app.grunddaten.repository import FigurRepository
 
 
+# Retries for registrations that lost a race for the startnummer (or the write lock)
+CREATE_MAX_ATTEMPTS = 5
+CREATE_RETRY_DELAY = 0.05  # seconds, doubled after every attempt
+
+
+def is_retryable_conflict(error: Exception) -> bool:
+    """Return True for errors a repeated registration attempt can resolve."""
+    message = str(error.orig if hasattr(error, "orig") else error).lower()
+    if isinstance(error, IntegrityError):
+        return "startnummer" in message
+    if isinstance(error, OperationalError):
+        return "locked" in message or "busy" in message
+    return False
+
+
 class AnmeldungService:
     """Service layer for Anmeldung domain business logic."""
 
@@ -54,12 +72,30 @@ class AnmeldungService:
         2. No figures are selected
         3. Maximum participants for the competition is reached
 
+        Conflicts on the startnummer or the database write lock are retried
+        with exponential backoff (CREATE_MAX_ATTEMPTS).
+
         Args:
             input_data: Anmeldung creation data
 
         Returns:
             Created Anmeldung model instance with status_reasons attribute
         """
+        return self._retry_on_conflict(self._create_anmeldung, input_data)
+
+    def _retry_on_conflict(self, create, *args):
+        """Run a create attempt, rolling back and retrying retryable conflicts."""
+        for attempt in range(CREATE_MAX_ATTEMPTS):
+            try:
+                return create(*args)
+            except (IntegrityError, OperationalError) as e:
+                self.anmeldung_repo.db.rollback()
+                if attempt == CREATE_MAX_ATTEMPTS - 1 or not is_retryable_conflict(e):
+                    raise
+                time.sleep(CREATE_RETRY_DELAY * 2 ** attempt)
+
+    def _create_anmeldung(self, input_data: anmeldung_schemas.AnmeldungCreate) -> models.Anmeldung:
+        """Single attempt of create_anmeldung."""
         # Validate Wettkampf exists
         wettkampf = self.wettkampf_repo.get(input_data.wettkampf_id)
         if not wettkampf:
@@ -91,7 +127,7 @@ class AnmeldungService:
                 is_vorlaeufig = 1
                 reasons.append("maximale Teilnehmerzahl erreicht")
 
-        # Get next startnummer
+        # Allocate the startnummer within this transaction
         next_startnummer = self.anmeldung_repo.get_next_startnummer(input_data.wettkampf_id)
 
         # Create a basic Anmeldung using repository
@@ -122,6 +158,114 @@ class AnmeldungService:
 
         return db_anmeldung
 
+    def create_anmeldungen_bulk(
+        self,
+        wettkampf_id: int,
+        items: List[anmeldung_schemas.BulkAnmeldungItem]
+    ) -> List[anmeldung_schemas.BulkAnmeldungResult]:
+        """Register a whole roster for a competition in one transaction.
+
+        Applies the same vorläufig rules as create_anmeldung, but checks
+        insurance, Figuren and capacity with one query each, reserves all
+        startnummern as one block and inserts with executemany.
+
+        Rows are rejected ("abgelehnt") if the Kind does not exist, is listed
+        twice or is already registered for the competition. Unknown Figur IDs
+        are ignored, as in create_anmeldung.
+
+        Args:
+            wettkampf_id: ID of the Wettkampf
+            items: Kind and Figur IDs per registration
+
+        Returns:
+            One result per item, in input order
+
+        Raises:
+            ValueError: If the Wettkampf does not exist
+        """
+        return self._retry_on_conflict(self._create_anmeldungen_bulk, wettkampf_id, items)
+
+    def _create_anmeldungen_bulk(
+        self,
+        wettkampf_id: int,
+        items: List[anmeldung_schemas.BulkAnmeldungItem]
+    ) -> List[anmeldung_schemas.BulkAnmeldungResult]:
+        """Single attempt of create_anmeldungen_bulk."""
+        wettkampf = self.wettkampf_repo.get(wettkampf_id)
+        if not wettkampf:
+            raise ValueError("Wettkampf not found")
+
+        kind_ids = [item.kind_id for item in items]
+        insured = self.kind_repo.get_insurance_status(kind_ids)
+        already_registered = self.anmeldung_repo.registered_kind_ids(wettkampf_id, kind_ids)
+        known_figuren = self.figur_repo.existing_ids(f for item in items for f in item.figur_ids)
+        final_count = self.anmeldung_repo.count_final_registrations(wettkampf_id)
+
+        results = []
+        accepted = []
+        seen = set()
+        for item in items:
+            if item.kind_id not in insured:
+                rejection = "Kind nicht gefunden"
+            elif item.kind_id in seen:
+                rejection = "Kind mehrfach in der Liste"
+            elif item.kind_id in already_registered:
+                rejection = "Kind bereits angemeldet"
+            else:
+                rejection = None
+            seen.add(item.kind_id)
+
+            if rejection:
+                results.append(anmeldung_schemas.BulkAnmeldungResult(
+                    kind_id=item.kind_id, status="abgelehnt", reasons=[rejection]
+                ))
+                continue
+
+            figur_ids = [f for f in dict.fromkeys(item.figur_ids) if f in known_figuren]
+            reasons = []
+            if not insured[item.kind_id]:
+                reasons.append("keine Versicherung")
+            if not figur_ids:
+                reasons.append("keine Figuren ausgewählt")
+            if wettkampf.max_teilnehmer and final_count >= wettkampf.max_teilnehmer:
+                reasons.append("maximale Teilnehmerzahl erreicht")
+            if not reasons:
+                final_count += 1
+
+            result = anmeldung_schemas.BulkAnmeldungResult(
+                kind_id=item.kind_id,
+                status="vorläufig" if reasons else "aktiv",
+                vorlaeufig=1 if reasons else 0,
+                reasons=reasons
+            )
+            results.append(result)
+            accepted.append((result, figur_ids))
+
+        if accepted:
+            startnummern = self.anmeldung_repo.reserve_startnummern(wettkampf_id, len(accepted))
+            for (result, _), startnummer in zip(accepted, startnummern):
+                result.startnummer = startnummer
+
+            anmeldung_ids = self.anmeldung_repo.bulk_create(
+                wettkampf_id,
+                [
+                    {
+                        "kind_id": result.kind_id,
+                        "startnummer": result.startnummer,
+                        "anmeldedatum": date.today(),
+                        "vorlaeufig": result.vorlaeufig,
+                        "status": result.status,
+                    }
+                    for result, _ in accepted
+                ],
+                [figur_ids for _, figur_ids in accepted]
+            )
+            for (result, _), anmeldung_id in zip(accepted, anmeldung_ids):
+                result.anmeldung_id = anmeldung_id
+
+        self.anmeldung_repo.db.commit()
+        return results
+
     def get_anmeldung(self, anmeldung_id: int) -> models.Anmeldung:
         """Get an Anmeldung by ID with details.
 
@@ -145,6 +289,28 @@ class AnmeldungService:
         """
         return self.anmeldung_repo.list(skip=skip, limit=limit)
 
+    def list_anmeldungen_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> tuple[List[models.Anmeldung], Optional[str], Optional[int]]:
+        """List Anmeldungen with keyset (cursor) or offset pagination.
+
+        Args:
+            skip: Number of records to skip (ignored with a cursor)
+            limit: Maximum number of records to return
+            cursor: Cursor returned for the previous page
+            include_total: Whether to count all Anmeldungen
+
+        Returns:
+            Tuple of (list of Anmeldung instances, next cursor, total count)
+        """
+        return self.anmeldung_repo.list_page(
+            skip=skip, limit=limit, cursor=cursor, include_total=include_total
+        )
+
     def delete_anmeldung(self, anmeldung_id: int) -> bool:
         """Delete an Anmeldung.
 
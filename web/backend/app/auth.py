@@ -1,12 +1,17 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_async_db
 from app import models
+from app.principal_cache import Principal, principal_cache
+from app.activity import activity_recorder
+from app.hashing import hash_pool
 import os
 import logging
 
@@ -31,6 +36,18 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password, hashed_password):
+    """verify_password on the hash pool - use this in async endpoints."""
+    return await hash_pool.run(pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    """get_password_hash on the hash pool - use this in async endpoints."""
+    return await hash_pool.run(pwd_context.hash, password)
+
+def get_password_hash_pooled(password):
+    """get_password_hash on the hash pool - use this in sync endpoints."""
+    return hash_pool.run_sync(pwd_context.hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -62,17 +79,12 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
 
 async def get_current_active_user(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
 ):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     
-    # Update last_active timestamp
-    now = datetime.utcnow()
-    # Only update if last_active is None or older than 60 seconds to reduce DB writes
-    if not current_user.last_active or (now - current_user.last_active).total_seconds() > 60:
-        current_user.last_active = now
-        db.commit()
+    # last_active is written behind (see app.activity)
+    activity_recorder.record(current_user.id)
         
     return current_user
 
@@ -86,6 +98,27 @@ async def get_current_admin_user(current_user: models.User = Depends(get_current
     return current_user
 
 
+def check_admin_token(token: Optional[str], db: Session) -> models.User:
+    """Resolve a bearer token to an active admin user, or raise 401/403.
+
+    For endpoints that accept other credentials as well and therefore cannot
+    depend on get_current_admin_user (whose scheme rejects them up front).
+    """
+    if not token:
+        raise _app_credentials_exception()
+    user = db.query(models.User).filter(models.User.username == _username_from_token(token)).first()
+    if user is None:
+        raise _app_credentials_exception()
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    if user.role not in ["ADMIN", "CLEO"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access admin resources"
+        )
+    return user
+
+
 def get_or_create_default_app_user(db: Session) -> models.User:
     """Get or create default app user for development mode (ENABLE_APP_AUTH=false)."""
     user = db.query(models.User).filter(models.User.username == DEFAULT_APP_USER).first()
@@ -108,19 +141,16 @@ def get_or_create_default_app_user(db: Session) -> models.User:
     return user
 
 
-async def get_current_app_user(
-    db: Session = Depends(get_db),
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_http_bearer),
-) -> models.User:
-    """
-    Get current app user. Always requires a valid JWT token.
+def _app_credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
-    This ensures that permissions are properly checked based on the authenticated user,
-    not a default development user with full rights.
 
-    ENABLE_APP_AUTH environment variable no longer affects token requirement,
-    but can still be used for other auth-related features in the future.
-    """
+def _require_token(credentials: Optional[HTTPAuthorizationCredentials]) -> str:
+    """Return the bearer token or raise 401 - there is no fallback to a default user."""
     token = credentials.credentials if credentials else None
     logger.info(f"[AUTH] ENABLE_APP_AUTH={ENABLE_APP_AUTH}, token={'present' if token else 'absent'}, credentials={'present' if credentials else 'absent'}")
 
@@ -137,24 +167,25 @@ async def get_current_app_user(
             detail=detail,
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    # Validate token and get user
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    return token
+
+
+def _username_from_token(token: str) -> str:
+    """Decode the JWT and return its subject (username)."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
-            raise credentials_exception
+            raise _app_credentials_exception()
     except JWTError:
-        raise credentials_exception
-    
-    user = db.query(models.User).filter(models.User.username == username).first()
+        raise _app_credentials_exception()
+    return username
+
+
+def _check_app_user(user: Optional[Union[models.User, Principal]]) -> None:
+    """Raise if the resolved user may not access the app."""
     if user is None:
-        raise credentials_exception
+        raise _app_credentials_exception()
 
     logger.info(f"[AUTH] Token validated for user: {user.username}, role: {user.role}, can_read: {user.can_read_all}, can_write: {user.can_write_all}")
 
@@ -169,18 +200,66 @@ async def get_current_app_user(
             detail="Not authorized to access app resources",
         )
 
-    # Update last_active timestamp (throttle to reduce DB writes)
-    now = datetime.utcnow()
-    if not user.last_active or (now - user.last_active).total_seconds() > 60:
-        user.last_active = now
-        db.commit()
+
+def get_current_app_user(
+    db: Session = Depends(get_db),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_http_bearer),
+) -> models.User:
+    """
+    Get current app user. Always requires a valid JWT token.
+
+    This ensures that permissions are properly checked based on the authenticated user,
+    not a default development user with full rights.
+
+    ENABLE_APP_AUTH environment variable no longer affects token requirement,
+    but can still be used for other auth-related features in the future.
+
+    Declared as a plain function so FastAPI runs the synchronous DB lookup in
+    its threadpool instead of on the event loop.
+    """
+    token = _require_token(credentials)
+
+    # Validate token and get user
+    username = _username_from_token(token)
+    user = db.query(models.User).filter(models.User.username == username).first()
+    _check_app_user(user)
+
+    # last_active is written behind (see app.activity)
+    activity_recorder.record(user.id)
 
     return user
 
 
+def get_current_app_principal(
+    db: Session = Depends(get_db),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_http_bearer),
+) -> Principal:
+    """
+    Get the current app user as a Principal, served from the principal cache.
+
+    Same checks as get_current_app_user, but the user row is only read on a
+    cache miss. Used by the permission dependencies - endpoints that need
+    the full user row depend on get_current_app_user instead.
+    """
+    token = _require_token(credentials)
+    username = _username_from_token(token)
+
+    principal = principal_cache.get(username)
+    if principal is None:
+        user = db.query(models.User).filter(models.User.username == username).first()
+        _check_app_user(user)
+        principal = Principal.from_user(user)
+        principal_cache.put(principal)
+    else:
+        _check_app_user(principal)
+
+    activity_recorder.record(principal.id)
+    return principal
+
+
 async def require_app_read_permission(
-    current_user: models.User = Depends(get_current_app_user),
-) -> models.User:
+    current_user: Principal = Depends(get_current_app_principal),
+) -> Principal:
     """Require read permission for app operations."""
     # Admin and CLEO always have read access
     if current_user.role in ["ADMIN", "CLEO"]:
@@ -197,8 +276,8 @@ async def require_app_read_permission(
 
 
 async def require_app_write_permission(
-    current_user: models.User = Depends(get_current_app_user),
-) -> models.User:
+    current_user: Principal = Depends(get_current_app_principal),
+) -> Principal:
     """Require write permission for app operations (create, update, delete)."""
     # Admin and CLEO always have write access
     if current_user.role in ["ADMIN", "CLEO"]:
@@ -215,3 +294,37 @@ async def require_app_write_permission(
 
     logger.info(f"[AUTH] Write access granted to user: {current_user.username}")
     return current_user
+
+
+# ============================================================================
+# ASYNC DEPENDENCIES (ENABLE_ASYNC_DB)
+# ============================================================================
+# Same checks as above, but the user lookup runs on the async session so the
+# event loop is never blocked by a synchronous database call.
+
+async def get_current_app_principal_async(
+    db: AsyncSession = Depends(get_async_db),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_http_bearer),
+) -> Principal:
+    """Async variant of get_current_app_principal."""
+    token = _require_token(credentials)
+    username = _username_from_token(token)
+
+    principal = principal_cache.get(username)
+    if principal is None:
+        user = await db.scalar(select(models.User).where(models.User.username == username))
+        _check_app_user(user)
+        principal = Principal.from_user(user)
+        principal_cache.put(principal)
+    else:
+        _check_app_user(principal)
+
+    activity_recorder.record(principal.id)
+    return principal
+
+
+async def require_app_read_permission_async(
+    current_user: Principal = Depends(get_current_app_principal_async),
+) -> Principal:
+    """Async variant of require_app_read_permission."""
+    return await require_app_read_permission(current_user)
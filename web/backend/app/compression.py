@@ -0,0 +1,230 @@
+"""Response compression (brotli, gzip) for API responses.
+
+JSON lists repeat the same keys and nested Verein/Verband/Versicherung objects
+per row and shrink to a fraction of their size. Responses are compressed if
+
+- the client accepts br or gzip (brotli needs the optional `brotli` package),
+- the content type is in COMPRESSIBLE_TYPES,
+- they are not encoded already (precompressed frontend files, see app.spa),
+- the body is at least COMPRESSION_MIN_SIZE bytes - or unknown yet, because
+  the response streams: streamed bodies are compressed chunk by chunk.
+
+Compressed bodies of responses with an ETag (Grunddaten lists, conditional
+GETs) are kept in a small LRU per ETag, encoding and digest of the original
+body, so repeated identical payloads are compressed once. The digest guards
+against one ETag standing for two bodies (e.g. within the table version check
+interval) - hashing is far cheaper than compressing.
+"""
+import hashlib
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.spa import accepted_encodings
+
+try:
+    import brotli
+except ImportError:  # optional - gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bytes
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+# Brotli's higher qualities are meant for static files, 4 is cheaper than gzip -6 and smaller
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_CACHE_ENTRIES = int(os.getenv("COMPRESSION_CACHE_ENTRIES", "64"))
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class _GzipStream:
+    def __init__(self):
+        # wbits 31: gzip container
+        self._compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+_STREAMS = {"br": _BrotliStream, "gzip": _GzipStream}
+
+
+def available_encodings():
+    """Encodings this process can produce."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a complete body."""
+    stream = _STREAMS[encoding]()
+    return stream.compress(body) + stream.finish()
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.lower().startswith(COMPRESSIBLE_TYPES)
+
+
+# (ETag, path, encoding, digest of the uncompressed body)
+CacheKey = Tuple[bytes, str, str, bytes]
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies by (ETag, path, encoding, body digest)."""
+
+    def __init__(self, max_entries: int = COMPRESSION_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: CacheKey, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+compressed_body_cache = CompressedBodyCache()
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing eligible responses."""
+
+    def __init__(self, app, min_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.min_size = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = dict(scope.get("headers") or []).get(b"accept-encoding", b"").decode("latin-1")
+        encoding = next((e for e in accepted_encodings(accept_encoding) if e in available_encodings()), None)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        stream = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, stream, passthrough
+            if message["type"] == "http.response.start":
+                headers = {k.lower(): v for k, v in message.get("headers", [])}
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                passthrough = (
+                    b"content-encoding" in headers
+                    or message["status"] < 200
+                    or message["status"] in (204, 304)
+                    or not is_compressible(content_type)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    # Wait for the first body chunk to decide
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if stream is None and not more_body:
+                # Complete body in one message
+                if len(body) < self.min_size:
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressed = self._compress_complete(scope, start_message, body, encoding)
+                await send(self._start(start_message, encoding, len(compressed)))
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            if stream is None:
+                # Streaming response - compress chunk by chunk
+                stream = _STREAMS[encoding]()
+                await send(self._start(start_message, encoding, None))
+            chunk = stream.compress(body) if body else b""
+            if not more_body:
+                chunk += stream.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _compress_complete(scope, start_message, body: bytes, encoding: str) -> bytes:
+        etag = dict((k.lower(), v) for k, v in start_message.get("headers", [])).get(b"etag")
+        if etag is None:
+            return compress(body, encoding)
+        key = (etag, scope["path"], encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = compressed_body_cache.get(key)
+        if compressed is None:
+            compressed = compress(body, encoding)
+            compressed_body_cache.put(key, compressed)
+        return compressed
+
+    @staticmethod
+    def _start(start_message, encoding: str, content_length: Optional[int]):
+        headers = []
+        vary = None
+        for name, value in start_message.get("headers", []):
+            lower = name.lower()
+            if lower == b"content-length":
+                continue
+            if lower == b"vary":
+                vary = value
+                continue
+            if lower == b"etag" and not value.startswith(b"W/"):
+                # The compressed body is not byte-identical to the original
+                value = b"W/" + value
+            headers.append((name, value))
+        headers.append((b"content-encoding", encoding.encode()))
+        if vary is None:
+            headers.append((b"vary", b"Accept-Encoding"))
+        elif b"accept-encoding" not in vary.lower():
+            headers.append((b"vary", vary + b", Accept-Encoding"))
+        else:
+            headers.append((b"vary", vary))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode()))
+        return {**start_message, "headers": headers}
@@ -1,16 +1,82 @@
 """Database configuration supporting SQLite and Turso/libSQL."""
+import logging
 import os
 from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from app.metrics import TimedQueuePool, TimedAsyncAdaptedQueuePool
+from app import metrics
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from fastapi import Depends, Request
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Database URL - defaults to local SQLite for development
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./aquarius.db")
 TURSO_AUTH_TOKEN = os.getenv("TURSO_AUTH_TOKEN")
 
+# Embedded replica (ADR-015): local file synced from the Turso primary, used for reads
+TURSO_REPLICA_PATH = os.getenv("TURSO_REPLICA_PATH")
+TURSO_SYNC_INTERVAL = float(os.getenv("TURSO_SYNC_INTERVAL", "60"))
+# Set after a write so the same client reads from the primary until the replica caught up
+READ_YOUR_WRITES_COOKIE = "aq_read_primary"
+
+# Async database access for the hot read endpoints (feature flag, local SQLite only - see ASYNC_DRIVERS)
+ENABLE_ASYNC_DB = os.getenv("ENABLE_ASYNC_DB", "false").lower() == "true"
+
+# Performance profiles - selected via DB_PROFILE environment variable.
+# Pool settings apply to file-based SQLite and remote Turso connections,
+# pragmas are only applied to local SQLite files.
+DB_PROFILES = {
+    # Previous behaviour: default pooling, only foreign keys enabled
+    "minimal": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_recycle": -1,
+        "pragmas": {},
+    },
+    # Default for development and the 256 MB fly machine
+    "default": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_recycle": 1800,
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": 64 * 1024 * 1024,
+            "cache_size": -16000,  # negative = KiB, i.e. ~16 MB
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,
+        },
+    },
+    # Competition days with many clerks writing at the same time
+    "high-concurrency": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_recycle": 900,
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": 256 * 1024 * 1024,
+            "cache_size": -64000,
+            "temp_store": "MEMORY",
+            "busy_timeout": 10000,
+        },
+    },
+}
+
+DB_PROFILE = os.getenv("DB_PROFILE", "default")
+if DB_PROFILE not in DB_PROFILES:
+    raise ValueError(
+        f"Unknown DB_PROFILE '{DB_PROFILE}'. Available profiles: {', '.join(DB_PROFILES)}"
+    )
+db_profile = DB_PROFILES[DB_PROFILE]
+
 connect_args = {}
+IS_REMOTE_DATABASE = False
 
 # Determine database type and configure accordingly
 if DATABASE_URL.startswith("libsql://"):
@@ -18,35 +84,160 @@ if DATABASE_URL.startswith("libsql://"):
     # Extract hostname and build proper SQLAlchemy URL
     hostname = DATABASE_URL.replace("libsql://", "")
     DATABASE_URL = f"sqlite+libsql://{hostname}?secure=true"
+    IS_REMOTE_DATABASE = True
+    # Pooled connections are handed between request threads
+    connect_args["check_same_thread"] = False
     if TURSO_AUTH_TOKEN:
         connect_args["auth_token"] = TURSO_AUTH_TOKEN
 elif DATABASE_URL.startswith("sqlite"):
     # Local SQLite
     connect_args["check_same_thread"] = False
 
+
+def is_memory_database(url: str) -> bool:
+    """Return True for in-memory SQLite URLs (which must not be pooled)."""
+    parsed = make_url(url)
+    return not parsed.host and parsed.database in (None, "", ":memory:")
+
+
+# Pragmas are SQLite file settings - Turso manages its own storage
+SQLITE_PRAGMAS = {} if IS_REMOTE_DATABASE else dict(db_profile["pragmas"])
+
+engine_kwargs = {}
+if not is_memory_database(DATABASE_URL):
+    engine_kwargs.update(
+        poolclass=TimedQueuePool,
+        pool_size=db_profile["pool_size"],
+        max_overflow=db_profile["max_overflow"],
+        pool_recycle=db_profile["pool_recycle"],
+        pool_pre_ping=IS_REMOTE_DATABASE,
+    )
+
 # Create engine
 engine = create_engine(
     DATABASE_URL,
     connect_args=connect_args,
-    echo=False  # Set to True for debugging
+    echo=False,  # Set to True for debugging
+    **engine_kwargs
 )
 
 
-# Enable foreign keys for SQLite
+def instrument_engine(engine) -> None:
+    """Register the metrics SQL listeners on an engine."""
+    metrics.instrument_engine(engine)
+
+
+instrument_engine(engine)
+
+
+# Enable foreign keys and profile pragmas for SQLite
 @event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_conn, connection_record):
-    try:
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
-    except Exception:
-        # Remote connections may not support this pragma
-        pass
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    # One failing profile pragma (e.g. WAL on a filesystem without shared
+    # memory) must not skip the others
+    for name, value in SQLITE_PRAGMAS.items():
+        try:
+            cursor.execute(f"PRAGMA {name}={value}")
+        except Exception as e:
+            logger.warning(f"⚠️  PRAGMA {name}={value} failed (DB_PROFILE={DB_PROFILE}): {e}")
+    cursor.close()
 
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Read replica engine - only for Turso with TURSO_REPLICA_PATH configured
+replica_engine = None
+ReplicaSessionLocal = None
+
+if IS_REMOTE_DATABASE and TURSO_REPLICA_PATH:
+    replica_engine = create_engine(
+        f"sqlite+libsql:///{os.path.abspath(TURSO_REPLICA_PATH)}",
+        connect_args={
+            "sync_url": f"libsql://{hostname}",
+            "auth_token": TURSO_AUTH_TOKEN or "",
+            "sync_interval": TURSO_SYNC_INTERVAL,
+            "check_same_thread": False,
+        },
+        poolclass=TimedQueuePool,
+        pool_size=db_profile["pool_size"],
+        max_overflow=db_profile["max_overflow"],
+        pool_recycle=db_profile["pool_recycle"],
+        echo=False,
+    )
+
+    def sync_replica(dbapi_conn, connection_record):
+        """Pull the latest frames from the primary when a replica connection opens."""
+        dbapi_conn.sync()
+
+    event.listen(replica_engine, "connect", sync_replica)
+    instrument_engine(replica_engine)
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
+# Async driver per sync driver. Local SQLite only: the libSQL "async" dialect
+# wraps the synchronous libsql_experimental DBAPI and fails under asyncio
+# (AwaitRequired), so Turso keeps the sync routers.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def async_db_supported(url: str) -> bool:
+    """Return True if the database URL has a real async driver."""
+    return make_url(url).drivername in ASYNC_DRIVERS
+
+
+def get_async_database_url(url: str) -> str:
+    """Derive the async driver URL from the (sync) database URL."""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+
+if ENABLE_ASYNC_DB and not async_db_supported(DATABASE_URL):
+    logger.warning(
+        f"⚠️  ENABLE_ASYNC_DB ignored: no async driver for {make_url(DATABASE_URL).drivername}, "
+        "serving the sync endpoints"
+    )
+    ENABLE_ASYNC_DB = False
+
+# Created on first use so the async driver is only required with ENABLE_ASYNC_DB
+async_engine = None
+AsyncSessionLocal = None
+
+
+def get_async_engine():
+    """Return the shared async engine, creating it on first use."""
+    global async_engine, AsyncSessionLocal
+    if async_engine is None:
+        if not async_db_supported(DATABASE_URL):
+            raise RuntimeError(
+                f"No async driver for {make_url(DATABASE_URL).drivername} - unset ENABLE_ASYNC_DB"
+            )
+        async_engine_kwargs = dict(engine_kwargs)
+        if "poolclass" in async_engine_kwargs:
+            async_engine_kwargs["poolclass"] = TimedAsyncAdaptedQueuePool
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            connect_args=connect_args,
+            echo=False,
+            **async_engine_kwargs
+        )
+        event.listen(async_engine.sync_engine, "connect", set_sqlite_pragma)
+        instrument_engine(async_engine.sync_engine)
+        AsyncSessionLocal = async_sessionmaker(
+            bind=async_engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return async_engine
+
 
 def get_db():
     """Dependency for FastAPI routes to get database session."""
@@ -57,6 +248,30 @@ def get_db():
         db.close()
 
 
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """Dependency for read-only routes.
+
+    Uses the embedded replica if one is configured, otherwise (or if the client
+    recently wrote, see READ_YOUR_WRITES_COOKIE) the primary session.
+    """
+    if ReplicaSessionLocal is None or request.cookies.get(READ_YOUR_WRITES_COOKIE):
+        yield db
+        return
+
+    replica_db = ReplicaSessionLocal()
+    try:
+        yield replica_db
+    finally:
+        replica_db.close()
+
+
+async def get_async_db():
+    """Dependency for async FastAPI routes to get an async database session."""
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,76 @@
+"""Grunddaten (Master Data) Cache - serialized list responses per table.
+
+Reference tables change a few times per season but are listed on every page
+mount. The list endpoints cache their serialized JSON per query and serve it
+as long as the table's counter (see app.shared.versions) is unchanged.
+Entries are kept per database engine: while the embedded replica lags,
+replica and primary readers (read-your-writes) see different counters and
+payloads, and both stay cached.
+
+Verband lists carry nomination counts, so Kind writes bump "verband" as well.
+"""
+import threading
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.shared.versions import TableVersions, table_versions
+
+
+class ReferenceDataCache:
+    """Serialized responses per (table, engine, query) tagged with the table version."""
+
+    def __init__(self, versions: Optional[TableVersions] = None):
+        self.versions = versions if versions is not None else table_versions
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple[str, Engine, Hashable], Tuple[int, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, db: Session, table_name: str, key: Hashable, loader: Callable[[], bytes]) -> bytes:
+        """Return the cached payload for a query, loading it if the table changed.
+
+        Args:
+            db: Session used for the version check (and by the loader)
+            table_name: Cached table
+            key: Query parameters identifying the payload
+            loader: Returns the serialized payload from the database
+
+        Returns:
+            Serialized JSON payload
+        """
+        version = self.versions.current(db).get(table_name, 0)
+        bind = db.get_bind()
+        cache_key = (table_name, getattr(bind, "engine", bind), key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        payload = loader()
+        with self._lock:
+            self._entries[cache_key] = (version, payload)
+        return payload
+
+    def invalidate(self, table_names: Set[str]) -> None:
+        """Drop the entries of tables."""
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] in table_names]:
+                del self._entries[cache_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+reference_cache = ReferenceDataCache()
+table_versions.add_listener(reference_cache.invalidate)
@@ -0,0 +1,101 @@
+"""Verband (Association) nomination counts - materialized by SQLite triggers.
+
+`verband.nomination_count` holds the number of Kinder nominated by each
+Verband, so the Verband list reads and sorts it from an index instead of
+counting the kind table per request. Triggers on kind keep it current for
+every write path (ORM, bulk statements, manual SQL).
+
+rebuild() recounts from the kind table (drift repair, see
+rebuild_nomination_counts.py).
+"""
+import logging
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+_CREATE_STATEMENTS = (
+    """
+    CREATE INDEX IF NOT EXISTS ix_verband_nomination_count_name
+    ON verband (nomination_count, name)
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS kind_nomination_ai AFTER INSERT ON kind
+    WHEN new.verband_id IS NOT NULL BEGIN
+        UPDATE verband SET nomination_count = nomination_count + 1 WHERE id = new.verband_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS kind_nomination_ad AFTER DELETE ON kind
+    WHEN old.verband_id IS NOT NULL BEGIN
+        UPDATE verband SET nomination_count = nomination_count - 1 WHERE id = old.verband_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS kind_nomination_au AFTER UPDATE OF verband_id ON kind
+    WHEN old.verband_id IS NOT new.verband_id BEGIN
+        UPDATE verband SET nomination_count = nomination_count - 1 WHERE id = old.verband_id;
+        UPDATE verband SET nomination_count = nomination_count + 1 WHERE id = new.verband_id;
+    END
+    """,
+)
+
+_REBUILD_STATEMENT = """
+    UPDATE verband SET nomination_count = (
+        SELECT count(*) FROM kind WHERE kind.verband_id = verband.id
+    )
+"""
+
+
+def _column_exists(connection: Connection) -> bool:
+    columns = connection.execute(text("PRAGMA table_info(verband)")).fetchall()
+    return any(row[1] == "nomination_count" for row in columns)
+
+
+def install(connection: Connection) -> bool:
+    """Add the column, index and triggers if missing, and fill a new column.
+
+    Args:
+        connection: Connection inside a transaction (e.g. from engine.begin())
+
+    Returns:
+        True if the counts are maintained, False on non-SQLite databases
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+
+    is_new = not _column_exists(connection)
+    if is_new:
+        logger.info("📝 Adding verband.nomination_count")
+        connection.execute(text(
+            "ALTER TABLE verband ADD COLUMN nomination_count INTEGER NOT NULL DEFAULT 0"
+        ))
+    for statement in _CREATE_STATEMENTS:
+        connection.execute(text(statement))
+
+    if is_new:
+        rebuild(connection)
+    return True
+
+
+def rebuild(connection: Connection) -> int:
+    """Recount the nominations of all Verbände.
+
+    Returns:
+        Number of Verbände whose count was wrong
+    """
+    drifted = connection.execute(text(
+        "SELECT count(*) FROM verband WHERE nomination_count != "
+        "(SELECT count(*) FROM kind WHERE kind.verband_id = verband.id)"
+    )).scalar() or 0
+    connection.execute(text(_REBUILD_STATEMENT))
+    return drifted
+
+
+# The triggers live on kind, which is created after verband (foreign key)
+@event.listens_for(models.Kind.__table__, "after_create")
+def _install_after_create(target, connection, **kw):
+    install(connection)
@@ -1,6 +1,7 @@
 """Grunddaten (Master Data) Repository - Data access layer for Grunddaten domain."""
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Iterable, Optional, Set
 
 from app import models
 
@@ -24,3 +25,17 @@ class FigurRepository:
         return self.db.query(models.Figur).filter(
             models.Figur.id == figur_id
         ).first()
+
+    def existing_ids(self, figur_ids: Iterable[int]) -> Set[int]:
+        """Return which of the given Figur IDs exist (one query).
+
+        Args:
+            figur_ids: IDs to check
+
+        Returns:
+            Set of the IDs that exist
+        """
+        figur_ids = set(figur_ids)
+        if not figur_ids:
+            return set()
+        return set(self.db.scalars(select(models.Figur.id).where(models.Figur.id.in_(figur_ids))))
@@ -8,18 +8,54 @@ Handles all master data endpoints:
 - Versicherung (Insurance) - Read-only
 - Figur (Figure) - CRUD
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from sqlalchemy import func, asc, desc
-from typing import List
+from sqlalchemy import asc, desc
+from typing import Callable, Dict, Hashable, List, Optional, Type
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app import models, auth
 from app.grunddaten import schemas as grunddaten_schemas
+from app.grunddaten.cache import reference_cache
+from app.shared.conditional import ConditionalGet
 
 router = APIRouter(prefix="/api", tags=["grunddaten"])
 
 
+def cached_list_response(
+    db: Session,
+    table_name: str,
+    key: Hashable,
+    schema: Type,
+    load_rows: Callable[[], list],
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Serve a list endpoint from the reference data cache (see grunddaten.cache).
+
+    Args:
+        db: Session for the version check and the loader
+        table_name: Cached table
+        key: Query parameters of the request
+        schema: Response item schema
+        load_rows: Loads the rows (ORM objects or schema instances) on a miss
+        headers: Extra response headers (ETag from ConditionalGet)
+
+    Returns:
+        JSON response with the serialized list
+    """
+    adapter = TypeAdapter(List[schema])
+
+    def load() -> bytes:
+        return adapter.dump_json(adapter.validate_python(load_rows(), from_attributes=True))
+
+    return Response(
+        content=reference_cache.get_or_load(db, table_name, key, load),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
 # ============================================================================
 # SAISON CRUD ENDPOINTS
 # ============================================================================
@@ -29,17 +65,22 @@ def list_saison(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    current_user: auth.Principal = Depends(auth.require_app_read_permission),
+    etag: Dict[str, str] = Depends(ConditionalGet("saison", primary=True))
 ):
     """Get list of all seasons."""
-    return db.query(models.Saison).offset(skip).limit(limit).all()
+    return cached_list_response(
+        db, "saison", (skip, limit), grunddaten_schemas.Saison,
+        lambda: db.query(models.Saison).offset(skip).limit(limit).all(),
+        headers=etag,
+    )
 
 
 @router.get("/saison/{saison_id}", response_model=grunddaten_schemas.Saison)
 def get_saison(
     saison_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    current_user: auth.Principal = Depends(auth.require_app_read_permission)
 ):
     """Get a specific season by ID."""
     saison = db.query(models.Saison).filter(models.Saison.id == saison_id).first()
@@ -52,7 +93,7 @@ def get_saison(
 def create_saison(
     saison: grunddaten_schemas.SaisonCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Create a new season."""
     db_saison = models.Saison(**saison.model_dump())
@@ -67,7 +108,7 @@ def update_saison(
     saison_id: int,
     saison: grunddaten_schemas.SaisonUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Update a season."""
     db_saison = db.query(models.Saison).filter(models.Saison.id == saison_id).first()
@@ -86,7 +127,7 @@ def update_saison(
 def delete_saison(
     saison_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Delete a season."""
     db_saison = db.query(models.Saison).filter(models.Saison.id == saison_id).first()
@@ -107,17 +148,22 @@ def list_schwimmbad(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    current_user: auth.Principal = Depends(auth.require_app_read_permission),
+    etag: Dict[str, str] = Depends(ConditionalGet("schwimmbad", primary=True))
 ):
     """Get list of all pools."""
-    return db.query(models.Schwimmbad).offset(skip).limit(limit).all()
+    return cached_list_response(
+        db, "schwimmbad", (skip, limit), grunddaten_schemas.Schwimmbad,
+        lambda: db.query(models.Schwimmbad).offset(skip).limit(limit).all(),
+        headers=etag,
+    )
 
 
 @router.get("/schwimmbad/{schwimmbad_id}", response_model=grunddaten_schemas.Schwimmbad)
 def get_schwimmbad(
     schwimmbad_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    current_user: auth.Principal = Depends(auth.require_app_read_permission)
 ):
     """Get a specific pool by ID."""
     schwimmbad = db.query(models.Schwimmbad).filter(models.Schwimmbad.id == schwimmbad_id).first()
@@ -130,7 +176,7 @@ def get_schwimmbad(
 def create_schwimmbad(
     schwimmbad: grunddaten_schemas.SchwimmbadCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Create a new pool."""
     db_schwimmbad = models.Schwimmbad(**schwimmbad.model_dump())
@@ -145,7 +191,7 @@ def update_schwimmbad(
     schwimmbad_id: int,
     schwimmbad: grunddaten_schemas.SchwimmbadUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Update a pool."""
     db_schwimmbad = db.query(models.Schwimmbad).filter(models.Schwimmbad.id == schwimmbad_id).first()
@@ -164,7 +210,7 @@ def update_schwimmbad(
 def delete_schwimmbad(
     schwimmbad_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Delete a pool."""
     db_schwimmbad = db.query(models.Schwimmbad).filter(models.Schwimmbad.id == schwimmbad_id).first()
@@ -185,17 +231,22 @@ def list_verein(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    current_user: auth.Principal = Depends(auth.require_app_read_permission),
+    etag: Dict[str, str] = Depends(ConditionalGet("verein", primary=True))
 ):
     """Get list of all clubs."""
-    return db.query(models.Verein).offset(skip).limit(limit).all()
+    return cached_list_response(
+        db, "verein", (skip, limit), grunddaten_schemas.Verein,
+        lambda: db.query(models.Verein).offset(skip).limit(limit).all(),
+        headers=etag,
+    )
 
 
 @router.get("/verein/{verein_id}", response_model=grunddaten_schemas.Verein)
 def get_verein(
     verein_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    current_user: auth.Principal = Depends(auth.require_app_read_permission)
 ):
     """Get a specific club by ID."""
     verein = db.query(models.Verein).filter(models.Verein.id == verein_id).first()
@@ -208,7 +259,7 @@ def get_verein(
 def create_verein(
     verein: grunddaten_schemas.VereinCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Create a new club."""
     db_verein = models.Verein(**verein.model_dump())
@@ -223,7 +274,7 @@ def update_verein(
     verein_id: int,
     verein: grunddaten_schemas.VereinUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Update a club."""
     db_verein = db.query(models.Verein).filter(models.Verein.id == verein_id).first()
@@ -242,7 +293,7 @@ def update_verein(
 def delete_verein(
     verein_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Delete a club."""
     db_verein = db.query(models.Verein).filter(models.Verein.id == verein_id).first()
@@ -265,40 +316,29 @@ def list_verbaende(
     sort_by: str = "name",
     sort_order: str = "asc",
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    current_user: auth.Principal = Depends(auth.require_app_read_permission),
+    etag: Dict[str, str] = Depends(ConditionalGet("verband", primary=True))
 ):
     """Get list of all associations (read-only) with nomination counts."""
-    sort_fields = {
-        "name": models.Verband.name,
-        "nomination_count": "nomination_count",
-    }
-    sort_column = sort_fields.get(sort_by, models.Verband.name)
-    order_fn = desc if sort_order.lower() == "desc" else asc
-
-    nomination_count = func.count(models.Kind.id).label("nomination_count")
-    query = (
-        db.query(models.Verband, nomination_count)
-        .outerjoin(models.Kind, models.Kind.verband_id == models.Verband.id)
-        .group_by(models.Verband.id)
-    )
-
-    if sort_column == "nomination_count":
-        query = query.order_by(order_fn(nomination_count), models.Verband.name)
-    else:
-        query = query.order_by(order_fn(sort_column), models.Verband.name)
-
-    rows = query.offset(skip).limit(limit).all()
-    return [
-        grunddaten_schemas.VerbandWithCount(
-            id=verband.id,
-            name=verband.name,
-            abkuerzung=verband.abkuerzung,
-            land=verband.land,
-            ort=verband.ort,
-            nomination_count=count,
+    def load_rows():
+        sort_fields = {
+            "name": models.Verband.name,
+            "nomination_count": models.Verband.nomination_count,
+        }
+        sort_column = sort_fields.get(sort_by, models.Verband.name)
+        order_fn = desc if sort_order.lower() == "desc" else asc
+        return (
+            db.query(models.Verband)
+            .order_by(order_fn(sort_column), models.Verband.name)
+            .offset(skip)
+            .limit(limit)
+            .all()
         )
-        for verband, count in rows
-    ]
+
+    return cached_list_response(
+        db, "verband", (skip, limit, sort_by, sort_order.lower()), grunddaten_schemas.VerbandWithCount, load_rows,
+        headers=etag,
+    )
 
 
 # ============================================================================
@@ -310,15 +350,20 @@ def list_versicherungen(
     skip: int = 0,
     limit: int = 200,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    current_user: auth.Principal = Depends(auth.require_app_read_permission),
+    etag: Dict[str, str] = Depends(ConditionalGet("versicherung", primary=True))
 ):
     """Get list of all insurance companies (read-only)."""
-    return (
-        db.query(models.Versicherung)
-        .order_by(models.Versicherung.name)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    return cached_list_response(
+        db, "versicherung", (skip, limit), grunddaten_schemas.Versicherung,
+        lambda: (
+            db.query(models.Versicherung)
+            .order_by(models.Versicherung.name)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        ),
+        headers=etag,
     )
 
 
@@ -330,18 +375,23 @@ def list_versicherungen(
 def list_figur(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    db: Session = Depends(get_read_db),
+    current_user: auth.Principal = Depends(auth.require_app_read_permission),
+    etag: Dict[str, str] = Depends(ConditionalGet("figur"))
 ):
     """Get list of all figures."""
-    return db.query(models.Figur).offset(skip).limit(limit).all()
+    return cached_list_response(
+        db, "figur", (skip, limit), grunddaten_schemas.Figur,
+        lambda: db.query(models.Figur).offset(skip).limit(limit).all(),
+        headers=etag,
+    )
 
 
 @router.get("/figur/{figur_id}", response_model=grunddaten_schemas.Figur)
 def get_figur(
     figur_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    current_user: auth.Principal = Depends(auth.require_app_read_permission)
 ):
     """Get a specific figure by ID."""
     figur = db.query(models.Figur).filter(models.Figur.id == figur_id).first()
@@ -354,7 +404,7 @@ def get_figur(
 def create_figur(
     figur: grunddaten_schemas.FigurCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Create a new figure."""
     db_figur = models.Figur(**figur.model_dump())
@@ -369,7 +419,7 @@ def update_figur(
     figur_id: int,
     figur: grunddaten_schemas.FigurUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Update a figure."""
     db_figur = db.query(models.Figur).filter(models.Figur.id == figur_id).first()
@@ -388,7 +438,7 @@ def update_figur(
 def delete_figur(
     figur_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Delete a figure."""
     db_figur = db.query(models.Figur).filter(models.Figur.id == figur_id).first()
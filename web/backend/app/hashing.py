@@ -0,0 +1,95 @@
+"""Dedicated thread pool for bcrypt hashing and verification.
+
+A bcrypt round takes hundreds of milliseconds of pure CPU. Called from an
+`async def` endpoint it blocks the event loop and with it every other request,
+so the login, 2FA and password-setting endpoints hand that work to this pool
+instead. The pool
+is bounded (HASH_POOL_SIZE workers) so a login storm cannot starve the default
+thread pool that serves the sync endpoints; excess work waits in its queue.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+HASH_POOL_SIZE = int(os.getenv("HASH_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+
+
+class HashPool:
+    """Bounded executor for CPU-heavy hashing, with queue-depth metrics."""
+
+    def __init__(self, max_workers: int = HASH_POOL_SIZE):
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self._total_wait = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="hash"
+                )
+            return self._executor
+
+    def _call(self, submitted_at: float, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self._total_wait += time.monotonic() - submitted_at
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def _enqueue(self) -> ThreadPoolExecutor:
+        executor = self._get_executor()
+        with self._lock:
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        return executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on the pool and await its result."""
+        executor = self._enqueue()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self._call, time.monotonic(), fn, *args)
+
+    def run_sync(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on the pool from a sync endpoint's worker thread and wait.
+
+        Keeps the hashing of sync endpoints within the pool's bound as well.
+        """
+        executor = self._enqueue()
+        return executor.submit(self._call, time.monotonic(), fn, *args).result()
+
+    def shutdown(self) -> None:
+        """Stop the worker threads (a new executor is created on next use)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, float]:
+        """Return worker count, queue depth and average queue wait."""
+        with self._lock:
+            started = self.completed + self.running
+            return {
+                "workers": self.max_workers,
+                "running": self.running,
+                "queued": self.queued,
+                "max_queue_depth": self.max_queue_depth,
+                "completed": self.completed,
+                "avg_wait_ms": round(self._total_wait / started * 1000, 1) if started else 0.0,
+            }
+
+
+hash_pool = HashPool()
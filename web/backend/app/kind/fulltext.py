@@ -0,0 +1,173 @@
+"""Kind (Child) Full-Text Search - SQLite FTS5 index for the Kind search box.
+
+The `kind_fts` virtual table mirrors vorname, nachname and the Verein name of
+every Kind (rowid = kind.id) and is kept in sync by triggers on kind and
+verein (insert, update, delete). The unicode61
+tokenizer with remove_diacritics folds umlauts, so "Mull" matches "Müller".
+
+If FTS5 is not available (e.g. on a libSQL build without the module), the
+index is simply not created and KindRepository falls back to ILIKE filtering.
+"""
+import logging
+import re
+import weakref
+from typing import Optional
+
+from sqlalchemy import event, text, select, table, column, literal_column
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "kind_fts"
+
+kind_fts = table(FTS_TABLE, column("rowid"))
+
+_CREATE_STATEMENTS = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        vorname, nachname, verein,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS kind_fts_ai AFTER INSERT ON kind BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, vorname, nachname, verein)
+        VALUES (new.id, new.vorname, new.nachname,
+                (SELECT name FROM verein WHERE id = new.verein_id));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS kind_fts_ad AFTER DELETE ON kind BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS kind_fts_au AFTER UPDATE OF vorname, nachname, verein_id ON kind BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        INSERT INTO {FTS_TABLE}(rowid, vorname, nachname, verein)
+        VALUES (new.id, new.vorname, new.nachname,
+                (SELECT name FROM verein WHERE id = new.verein_id));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS verein_kind_fts_au AFTER UPDATE OF name ON verein BEGIN
+        UPDATE {FTS_TABLE} SET verein = new.name
+        WHERE rowid IN (SELECT id FROM kind WHERE verein_id = new.id);
+    END
+    """,
+    # Kinder keep the verein_id of a deleted or renumbered Verein (no cascade):
+    # re-read the name, which is NULL once no Verein has that id
+    f"""
+    CREATE TRIGGER IF NOT EXISTS verein_kind_fts_ad AFTER DELETE ON verein BEGIN
+        UPDATE {FTS_TABLE} SET verein = NULL
+        WHERE rowid IN (SELECT id FROM kind WHERE verein_id = old.id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS verein_kind_fts_au_id AFTER UPDATE OF id ON verein BEGIN
+        UPDATE {FTS_TABLE}
+        SET verein = (SELECT verein.name FROM kind JOIN verein ON verein.id = kind.verein_id
+                      WHERE kind.id = {FTS_TABLE}.rowid)
+        WHERE rowid IN (SELECT id FROM kind WHERE verein_id IN (old.id, new.id));
+    END
+    """,
+)
+
+_REBUILD_STATEMENTS = (
+    f"DELETE FROM {FTS_TABLE}",
+    f"""
+    INSERT INTO {FTS_TABLE}(rowid, vorname, nachname, verein)
+    SELECT kind.id, kind.vorname, kind.nachname, verein.name
+    FROM kind LEFT OUTER JOIN verein ON verein.id = kind.verein_id
+    """,
+)
+
+# Per-engine cache of "is the index installed?" - avoids a catalog lookup per search
+_availability: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _index_exists(connection: Connection) -> bool:
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE},
+    ).first() is not None
+
+
+def install(connection: Connection) -> bool:
+    """Create the FTS5 table and triggers if missing, and populate a new index.
+
+    Args:
+        connection: Connection inside a transaction (e.g. from engine.begin())
+
+    Returns:
+        True if the index is available, False if FTS5 is not supported
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+
+    is_new = not _index_exists(connection)
+    try:
+        for statement in _CREATE_STATEMENTS:
+            connection.execute(text(statement))
+    except OperationalError as e:
+        logger.warning(f"⚠️  FTS5 not available, Kind search falls back to ILIKE: {e}")
+        _availability[connection.engine] = False
+        return False
+
+    if is_new:
+        rebuild(connection)
+
+    _availability[connection.engine] = True
+    return True
+
+
+def rebuild(connection: Connection) -> None:
+    """Repopulate the index from the kind and verein tables (drift repair)."""
+    for statement in _REBUILD_STATEMENTS:
+        connection.execute(text(statement))
+
+
+def is_available(session: Session) -> bool:
+    """Return True if the FTS5 index exists for the session's database."""
+    bind = session.get_bind()
+    engine = getattr(bind, "engine", bind)
+    if engine not in _availability:
+        _availability[engine] = _index_exists(session.connection())
+    return _availability[engine]
+
+
+def build_match_query(term: str) -> Optional[str]:
+    """Turn free text into an FTS5 prefix query ("max mu" -> '"max"* "mu"*').
+
+    Tokens are quoted so FTS5 operators in user input are matched literally.
+
+    Returns:
+        The MATCH expression, or None if the term contains no searchable tokens
+    """
+    tokens = [t for t in re.split(r"[^\w]+", term) if t]
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def matching_kind_ids(match_query: str) -> Select:
+    """Subquery selecting the ids of all Kinder matching an FTS5 query."""
+    return select(kind_fts.c.rowid).where(literal_column(FTS_TABLE).op("MATCH")(match_query))
+
+
+# Keep the index in lockstep with the kind table's lifecycle (create_all/drop_all)
+@event.listens_for(models.Kind.__table__, "after_create")
+def _install_after_create(target, connection, **kw):
+    install(connection)
+
+
+@event.listens_for(models.Kind.__table__, "before_drop")
+def _drop_before_drop(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+    _availability.pop(connection.engine, None)
@@ -1,11 +1,125 @@
 """Kind (Child) Repository - Data access layer for Kind domain."""
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, asc, desc, case
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, or_, asc, desc, case
+from sqlalchemy.sql import Select
+from typing import Dict, Iterable, List, Optional
 
 from app import models
 from app.kind import schemas as kind_schemas
-from app.auth import get_password_hash
+from app.kind import fulltext
+from app.shared.pagination import apply_keyset, decode_cursor, next_cursor
+from app.auth import get_password_hash_pooled
+
+
+# Relationships every Kind response maps (verein, verband, versicherung)
+KIND_EAGER_LOADS = (
+    joinedload(models.Kind.verein),
+    joinedload(models.Kind.verband),
+    joinedload(models.Kind.versicherung),
+)
+
+
+def insurance_ok_expression():
+    """SQL expression that is 1 if a Kind has insurance coverage, else 0."""
+    has_contract_insurance = (
+        models.Kind.versicherung_id.isnot(None)
+        & models.Kind.vertrag.isnot(None)
+        & (models.Kind.vertrag != "")
+    )
+    return case(
+        (models.Kind.verein_id.isnot(None), 1),
+        (models.Kind.verband_id.isnot(None), 1),
+        (has_contract_insurance, 1),
+        else_=0,
+    )
+
+
+# Supported sort_by values - anything else sorts by nachname
+SORT_FIELDS = ("vorname", "nachname", "verein", "unversichert")
+
+
+def sort_keys(sort_by: str) -> list:
+    """Sort key expressions for a sort field, ending with nachname and id as tie-breakers.
+
+    The trailing id makes the order total, which keyset pagination requires.
+    """
+    if sort_by == "vorname":
+        primary = [models.Kind.vorname]
+    elif sort_by == "verein":
+        # NULL would never compare in a keyset condition - sort Kinder without Verein as ""
+        primary = [func.coalesce(models.Verein.name, "")]
+    elif sort_by == "unversichert":
+        primary = [insurance_ok_expression()]
+    else:
+        primary = []
+    return primary + [models.Kind.nachname, models.Kind.id]
+
+
+def build_search_statements(
+    query: Optional[str] = None,
+    sort_by: Optional[str] = "nachname",
+    sort_order: Optional[str] = "asc",
+    use_fulltext: bool = False,
+    cursor: Optional[str] = None
+) -> tuple[Select, Select, dict]:
+    """Build the Kind search statements shared by the sync and async repositories.
+
+    Args:
+        query: Optional search query to filter by vorname, nachname, or verein name
+        sort_by: Field to sort by (vorname, nachname, verein, unversichert)
+        sort_order: Sort order (asc or desc)
+        use_fulltext: Filter through the FTS5 index (prefix, diacritic-insensitive)
+            instead of ILIKE substring matching
+        cursor: Optional keyset cursor - continue after the row it points to
+
+    Returns:
+        Tuple of (filtered statement for counting, sorted page statement selecting
+        (Kind, *sort key values), cursor context)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for another sort order
+    """
+    sort_by = sort_by if sort_by in SORT_FIELDS else "nachname"
+    descending = sort_order == "desc"
+    context = {"sort_by": sort_by, "sort_order": "desc" if descending else "asc"}
+
+    stmt = select(models.Kind)
+    verein_joined = False
+
+    # Search (Filter)
+    match_query = fulltext.build_match_query(query) if (query and use_fulltext) else None
+    if match_query:
+        stmt = stmt.where(models.Kind.id.in_(fulltext.matching_kind_ids(match_query)))
+    elif query:
+        search_term = f"%{query}%"
+        stmt = stmt.outerjoin(models.Verein, models.Kind.verein_id == models.Verein.id).where(
+            or_(
+                models.Kind.vorname.ilike(search_term),
+                models.Kind.nachname.ilike(search_term),
+                models.Verein.name.ilike(search_term)
+            )
+        )
+        verein_joined = True
+
+    filter_stmt = stmt
+
+    # Sorting - all keys in the same direction so a cursor position is a simple row comparison
+    if sort_by == "verein" and not verein_joined:
+        stmt = stmt.outerjoin(models.Verein, models.Kind.verein_id == models.Verein.id)
+    keys = sort_keys(sort_by)
+    stmt = stmt.add_columns(*[key.label(f"sort_key_{i}") for i, key in enumerate(keys)])
+    stmt = stmt.order_by(*[desc(key) if descending else asc(key) for key in keys])
+
+    if cursor is not None:
+        stmt = apply_keyset(stmt, keys, decode_cursor(cursor, **context), descending)
+
+    return filter_stmt, stmt, context
+
+
+def count_statement(stmt: Select) -> Select:
+    """Wrap a filtered statement into a COUNT query."""
+    return select(func.count()).select_from(stmt.order_by(None).subquery())
 
 
 class KindRepository:
@@ -29,7 +143,7 @@ class KindRepository:
         # Hash password if provided
         password = kind_dict.pop('password', None)
         if password:
-            kind_dict['hashed_password'] = get_password_hash(password)
+            kind_dict['hashed_password'] = get_password_hash_pooled(password)
 
         db_kind = models.Kind(**kind_dict)
         self.db.add(db_kind)
@@ -37,9 +151,7 @@ class KindRepository:
         self.db.refresh(db_kind)
         # Eagerly load relationships for response
         db_kind = self.db.query(models.Kind).options(
-            joinedload(models.Kind.verein),
-            joinedload(models.Kind.verband),
-            joinedload(models.Kind.versicherung)
+            *KIND_EAGER_LOADS
         ).filter(models.Kind.id == db_kind.id).first()
         return db_kind
 
@@ -53,11 +165,26 @@ class KindRepository:
             Kind model instance with eagerly loaded relationships if found, None otherwise
         """
         return self.db.query(models.Kind).options(
-            joinedload(models.Kind.verein),
-            joinedload(models.Kind.verband),
-            joinedload(models.Kind.versicherung)
+            *KIND_EAGER_LOADS
         ).filter(models.Kind.id == kind_id).first()
 
+    def get_insurance_status(self, kind_ids: Iterable[int]) -> Dict[int, bool]:
+        """Get the insurance status of several Kinder in one query.
+
+        Args:
+            kind_ids: IDs of the Kinder to check
+
+        Returns:
+            Mapping of Kind ID to insurance status - unknown IDs are missing
+        """
+        kind_ids = set(kind_ids)
+        if not kind_ids:
+            return {}
+        rows = self.db.execute(
+            select(models.Kind.id, insurance_ok_expression()).where(models.Kind.id.in_(kind_ids))
+        )
+        return {kind_id: bool(insured) for kind_id, insured in rows}
+
     def search(
         self,
         skip: int = 0,
@@ -70,6 +197,7 @@ class KindRepository:
 
         This method encapsulates the complex search logic previously in the router,
         including searching across Kind and Verein names, and sorting by various fields.
+        Searches use the FTS5 index (see app.kind.fulltext) when it is installed.
 
         Args:
             skip: Number of records to skip (pagination offset)
@@ -81,65 +209,59 @@ class KindRepository:
         Returns:
             Tuple of (list of Kind instances with eager loaded relationships, total count)
         """
-        db_query = self.db.query(models.Kind).options(
-            joinedload(models.Kind.verein),
-            joinedload(models.Kind.verband),
-            joinedload(models.Kind.versicherung)
+        results, _, total_count = self.search_page(
+            skip=skip,
+            limit=limit,
+            query=query,
+            sort_by=sort_by,
+            sort_order=sort_order
         )
+        return results, total_count
 
-        # Search (Filter)
-        if query:
-            search_term = f"%{query}%"
-            db_query = db_query.join(models.Verein, isouter=True).filter(
-                or_(
-                    models.Kind.vorname.ilike(search_term),
-                    models.Kind.nachname.ilike(search_term),
-                    models.Verein.name.ilike(search_term)
-                )
-            )
+    def search_page(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        query: Optional[str] = None,
+        sort_by: Optional[str] = "nachname",
+        sort_order: Optional[str] = "asc",
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> tuple[List[models.Kind], Optional[str], Optional[int]]:
+        """Search for Kind records with keyset (cursor) or offset pagination.
+
+        Args:
+            skip: Number of records to skip - ignored when a cursor is given
+            limit: Maximum number of records to return
+            query: Optional search query to filter by vorname, nachname, or verein name
+            sort_by: Field to sort by (vorname, nachname, verein, unversichert)
+            sort_order: Sort order (asc or desc)
+            cursor: Cursor from a previous page's next_cursor
+            include_total: Run the COUNT query for the total number of matches
+
+        Returns:
+            Tuple of (Kind instances, cursor for the next page or None, total count or None)
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or was issued for another sort order
+        """
+        use_fulltext = bool(query) and fulltext.is_available(self.db)
+        filter_stmt, page_stmt, context = build_search_statements(
+            query, sort_by, sort_order, use_fulltext=use_fulltext, cursor=cursor
+        )
 
         # Total count for pagination
-        total_count = db_query.count()
-
-        # Sorting
-        if sort_by:
-            sort_column = None
-            if sort_by == "vorname":
-                sort_column = models.Kind.vorname
-            elif sort_by == "nachname":
-                sort_column = models.Kind.nachname
-            elif sort_by == "verein":
-                # Ensure join if not already joined
-                if not query:
-                    db_query = db_query.join(models.Verein, isouter=True)
-                sort_column = models.Verein.name
-            elif sort_by == "unversichert":
-                has_contract_insurance = (
-                    models.Kind.versicherung_id.isnot(None)
-                    & models.Kind.vertrag.isnot(None)
-                    & (models.Kind.vertrag != "")
-                )
-                insurance_ok = case(
-                    (models.Kind.verein_id.isnot(None), 1),
-                    (models.Kind.verband_id.isnot(None), 1),
-                    (has_contract_insurance, 1),
-                    else_=0,
-                )
-                sort_column = insurance_ok
-
-            if sort_column is not None:
-                if sort_order == "desc":
-                    db_query = db_query.order_by(desc(sort_column), models.Kind.nachname)
-                else:
-                    db_query = db_query.order_by(asc(sort_column), models.Kind.nachname)
-        else:
-            # Default sorting
-            db_query = db_query.order_by(models.Kind.nachname)
-
-        # Apply pagination
-        results = db_query.offset(skip).limit(limit).all()
+        total_count = self.db.scalar(count_statement(filter_stmt)) if include_total else None
 
-        return results, total_count
+        if cursor is None:
+            page_stmt = page_stmt.offset(skip)
+
+        # Fetch one extra row to know whether there is a next page
+        rows = self.db.execute(
+            page_stmt.options(*KIND_EAGER_LOADS).limit(limit + 1)
+        ).unique().all()
+
+        return [row[0] for row in rows[:limit]], next_cursor(rows, limit, **context), total_count
 
     def update(self, kind_id: int, kind_data: kind_schemas.KindUpdate) -> Optional[models.Kind]:
         """Update an existing Kind.
@@ -162,7 +284,7 @@ class KindRepository:
         if 'password' in update_data:
             password = update_data.pop('password')
             if password:
-                update_data['hashed_password'] = get_password_hash(password)
+                update_data['hashed_password'] = get_password_hash_pooled(password)
 
         for key, value in update_data.items():
             setattr(db_kind, key, value)
@@ -209,3 +331,75 @@ class KindRepository:
         })
         self.db.commit()
         return updated_count
+
+
+class AsyncKindRepository:
+    """Async repository for the Kind read paths (ENABLE_ASYNC_DB)."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize repository with async database session."""
+        self.db = db
+
+    async def get(self, kind_id: int) -> Optional[models.Kind]:
+        """Get a Kind by ID.
+
+        Args:
+            kind_id: ID of the Kind to retrieve
+
+        Returns:
+            Kind model instance with eagerly loaded relationships if found, None otherwise
+        """
+        result = await self.db.scalars(
+            select(models.Kind).options(*KIND_EAGER_LOADS).where(models.Kind.id == kind_id)
+        )
+        return result.unique().first()
+
+    async def search(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        query: Optional[str] = None,
+        sort_by: Optional[str] = "nachname",
+        sort_order: Optional[str] = "asc"
+    ) -> tuple[List[models.Kind], int]:
+        """Search for Kind records - async variant of KindRepository.search.
+
+        Returns:
+            Tuple of (list of Kind instances with eager loaded relationships, total count)
+        """
+        results, _, total_count = await self.search_page(
+            skip=skip,
+            limit=limit,
+            query=query,
+            sort_by=sort_by,
+            sort_order=sort_order
+        )
+        return results, total_count
+
+    async def search_page(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        query: Optional[str] = None,
+        sort_by: Optional[str] = "nachname",
+        sort_order: Optional[str] = "asc",
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> tuple[List[models.Kind], Optional[str], Optional[int]]:
+        """Async variant of KindRepository.search_page."""
+        use_fulltext = bool(query) and await self.db.run_sync(fulltext.is_available)
+        filter_stmt, page_stmt, context = build_search_statements(
+            query, sort_by, sort_order, use_fulltext=use_fulltext, cursor=cursor
+        )
+
+        total_count = await self.db.scalar(count_statement(filter_stmt)) if include_total else None
+
+        if cursor is None:
+            page_stmt = page_stmt.offset(skip)
+
+        result = await self.db.execute(
+            page_stmt.options(*KIND_EAGER_LOADS).limit(limit + 1)
+        )
+        rows = result.unique().all()
+
+        return [row[0] for row in rows[:limit]], next_cursor(rows, limit, **context), total_count
@@ -1,18 +1,26 @@
 """Kind (Child) API Router."""
 from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db, get_read_db, get_async_db
 from app import models, auth
 from app.kind import schemas as kind_schemas
-from app.kind.repository import KindRepository
+from app.kind.repository import KindRepository, AsyncKindRepository
 from app.kind.services import KindService
 from app.kind.dtos import KindDTO
 from app.kind.mappers import map_kind_to_dto, map_kinder_to_dtos
+from app.shared.conditional import ConditionalGet
+from app.shared.pagination import InvalidCursorError
 
 router = APIRouter(prefix="/api", tags=["kind"])
 
+# Async variants of the hot read endpoints - included ahead of `router` when
+# ENABLE_ASYNC_DB is set, so they take precedence over the sync handlers.
+async_router = APIRouter(prefix="/api", tags=["kind"], include_in_schema=False)
+
 
 def get_kind_service(db: Session = Depends(get_db)) -> KindService:
     """Dependency to get KindService instance."""
@@ -20,6 +28,17 @@ def get_kind_service(db: Session = Depends(get_db)) -> KindService:
     return KindService(repo)
 
 
+def get_kind_read_service(db: Session = Depends(get_read_db)) -> KindService:
+    """Dependency to get a KindService reading from the replica (if configured)."""
+    return KindService(KindRepository(db))
+
+
+# Kind lists embed Verein, Verband and Versicherung
+kind_list_etag = ConditionalGet("kind", "verein", "verband", "versicherung")
+# The async endpoints read from the primary
+async_kind_list_etag = ConditionalGet("kind", "verein", "verband", "versicherung", primary=True)
+
+
 @router.get("/kind", response_model=List[KindDTO])
 def list_kind(
     response: Response,
@@ -28,20 +47,39 @@ def list_kind(
     search: Optional[str] = None,
     sort_by: Optional[str] = "nachname",
     sort_order: Optional[str] = "asc",
-    service: KindService = Depends(get_kind_service),
-    current_user: models.User = Depends(auth.require_app_read_permission),
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
+    service: KindService = Depends(get_kind_read_service),
+    current_user: auth.Principal = Depends(auth.require_app_read_permission),
+    etag: Dict[str, str] = Depends(kind_list_etag),
 ):
-    """Get list of all children with search, sort, and pagination. Requires read permission."""
-    results, total_count = service.search_kinder(
-        skip=skip,
-        limit=limit,
-        query=search,
-        sort_by=sort_by,
-        sort_order=sort_order
-    )
-
-    # Set pagination header
-    response.headers["X-Total-Count"] = str(total_count)
+    """Get list of all children with search, sort, and pagination. Requires read permission.
+
+    Every page returns an X-Next-Cursor header while more results exist. Passing it
+    back as `cursor` continues with keyset pagination (`skip` is then ignored).
+    X-Total-Count is sent for offset requests, and for cursor requests only
+    with include_total=true.
+    """
+    if include_total is None:
+        include_total = cursor is None
+    try:
+        results, next_cursor, total_count = service.search_kinder_page(
+            skip=skip,
+            limit=limit,
+            query=search,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            include_total=include_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Set pagination headers
+    if total_count is not None:
+        response.headers["X-Total-Count"] = str(total_count)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
     # Map ORM models to DTOs
     return map_kinder_to_dtos(results)
@@ -51,7 +89,7 @@ def list_kind(
 def get_kind(
     kind_id: int,
     service: KindService = Depends(get_kind_service),
-    current_user: models.User = Depends(auth.require_app_read_permission),
+    current_user: auth.Principal = Depends(auth.require_app_read_permission),
 ):
     """Get a specific child by ID. Requires read permission."""
     kind = service.get_kind(kind_id)
@@ -65,7 +103,7 @@ def get_kind(
 def create_kind(
     kind: kind_schemas.KindCreate,
     service: KindService = Depends(get_kind_service),
-    current_user: models.User = Depends(auth.require_app_write_permission),
+    current_user: auth.Principal = Depends(auth.require_app_write_permission),
 ):
     """Create a new child. Requires write permission."""
     created_kind = service.create_kind(kind)
@@ -78,7 +116,7 @@ def update_kind(
     kind_id: int,
     kind: kind_schemas.KindUpdate,
     service: KindService = Depends(get_kind_service),
-    current_user: models.User = Depends(auth.require_app_write_permission),
+    current_user: auth.Principal = Depends(auth.require_app_write_permission),
 ):
     """Update a child. Requires write permission."""
     db_kind = service.update_kind(kind_id, kind)
@@ -92,10 +130,64 @@ def update_kind(
 def delete_kind(
     kind_id: int,
     service: KindService = Depends(get_kind_service),
-    current_user: models.User = Depends(auth.require_app_write_permission),
+    current_user: auth.Principal = Depends(auth.require_app_write_permission),
 ):
     """Delete a child. Requires write permission."""
     deleted = service.delete_kind(kind_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Kind not found")
     return None
+
+
+# ============================================================================
+# ASYNC READ ENDPOINTS (ENABLE_ASYNC_DB)
+# ============================================================================
+
+@async_router.get("/kind", response_model=List[KindDTO])
+async def list_kind_async(
+    response: Response,
+    skip: int = 0,
+    limit: int = 20,
+    search: Optional[str] = None,
+    sort_by: Optional[str] = "nachname",
+    sort_order: Optional[str] = "asc",
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: auth.Principal = Depends(auth.require_app_read_permission_async),
+    etag: Dict[str, str] = Depends(async_kind_list_etag),
+):
+    """Async variant of list_kind."""
+    if include_total is None:
+        include_total = cursor is None
+    try:
+        results, next_cursor, total_count = await AsyncKindRepository(db).search_page(
+            skip=skip,
+            limit=limit,
+            query=search,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            include_total=include_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if total_count is not None:
+        response.headers["X-Total-Count"] = str(total_count)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return map_kinder_to_dtos(results)
+
+
+@async_router.get("/kind/{kind_id}", response_model=KindDTO)
+async def get_kind_async(
+    kind_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: auth.Principal = Depends(auth.require_app_read_permission_async),
+):
+    """Async variant of get_kind."""
+    kind = await AsyncKindRepository(db).get(kind_id)
+    if not kind:
+        raise HTTPException(status_code=404, detail="Kind not found")
+    return map_kind_to_dto(kind)
@@ -88,6 +88,40 @@ class KindService:
             sort_order=sort_order
         )
 
+    def search_kinder_page(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        query: Optional[str] = None,
+        sort_by: Optional[str] = "nachname",
+        sort_order: Optional[str] = "asc",
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> tuple[list[models.Kind], Optional[str], Optional[int]]:
+        """Search for Kinder with keyset (cursor) or offset pagination.
+
+        Args:
+            skip: Number of records to skip (ignored with a cursor)
+            limit: Maximum number of records to return
+            query: Optional search query
+            sort_by: Field to sort by
+            sort_order: Sort order (asc or desc)
+            cursor: Cursor returned for the previous page
+            include_total: Whether to count all matches
+
+        Returns:
+            Tuple of (list of Kind instances, next cursor, total count)
+        """
+        return self.repo.search_page(
+            skip=skip,
+            limit=limit,
+            query=query,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+            include_total=include_total
+        )
+
     def update_kind(self, kind_id: int, kind_data: kind_schemas.KindUpdate) -> Optional[models.Kind]:
         """Update a Kind and handle side effects.
 
@@ -0,0 +1,214 @@
+"""Login throttling and lockout (QS-04).
+
+Failed logins are counted in a sliding window per username and per client IP.
+After LOGIN_MAX_FAILURES failures for a username (or LOGIN_IP_MAX_FAILURES
+from one IP) further attempts are rejected for LOGIN_LOCKOUT_SECONDS - before
+any bcrypt work is done, so a brute-force run cannot saturate the CPU.
+
+The counters live in a ThrottleStore. InMemoryThrottleStore is enough for a
+single machine; deployments with several machines plug in a shared store
+(e.g. Redis) implementing the same interface via login_throttle.store. It
+drops keys once their window or lockout has passed and holds at most
+LOGIN_THROTTLE_MAX_KEYS keys (least recently failed evicted first), so
+attempts with random usernames or IPs cannot grow it without bound.
+
+The client IP is taken from fly.io's Fly-Client-IP header only with
+TRUST_PROXY_HEADERS (default: on when running on Fly, i.e. FLY_APP_NAME is
+set) - without the proxy in front, clients could send any value.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Protocol
+
+from fastapi import HTTPException, Request, status
+
+audit_logger = logging.getLogger("app.audit")
+
+LOGIN_MAX_FAILURES = int(os.getenv("LOGIN_MAX_FAILURES", "5"))
+LOGIN_IP_MAX_FAILURES = int(os.getenv("LOGIN_IP_MAX_FAILURES", "20"))
+LOGIN_WINDOW_SECONDS = float(os.getenv("LOGIN_WINDOW_SECONDS", "900"))
+LOGIN_LOCKOUT_SECONDS = float(os.getenv("LOGIN_LOCKOUT_SECONDS", "900"))
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "10000"))
+TRUST_PROXY_HEADERS = os.getenv(
+    "TRUST_PROXY_HEADERS", "true" if os.getenv("FLY_APP_NAME") else "false"
+).lower() == "true"
+
+# Recent lockouts kept for /api/admin/auth/lockouts
+AUDIT_HISTORY_SIZE = 200
+
+
+class ThrottleStore(Protocol):
+    """Storage for failure counters and lockouts, shared by all workers using it."""
+
+    def add_failure(self, key: str, now: float, window: float) -> int:
+        """Record a failure and return the number of failures within the window."""
+        ...
+
+    def reset(self, key: str) -> None:
+        """Forget the failures and the lockout of a key."""
+        ...
+
+    def lock(self, key: str, until: float) -> None:
+        """Lock a key until the given time."""
+        ...
+
+    def locked_until(self, key: str, now: float) -> Optional[float]:
+        """Return the end of an active lockout, or None."""
+        ...
+
+
+class InMemoryThrottleStore:
+    """Process-local ThrottleStore (single machine deployments).
+
+    Both maps are kept in least recently updated order, so expired keys are
+    swept from the front on each write and the oldest keys are evicted above
+    max_keys.
+    """
+
+    def __init__(self, max_keys: int = LOGIN_THROTTLE_MAX_KEYS):
+        self.max_keys = max_keys
+        self._failures: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._locks: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add_failure(self, key: str, now: float, window: float) -> int:
+        with self._lock:
+            failures = self._failures.pop(key, None) or deque()
+            failures.append(now)
+            while failures[0] <= now - window:
+                failures.popleft()
+            self._failures[key] = failures
+            # Keys whose latest failure left the window
+            while self._failures and next(iter(self._failures.values()))[-1] <= now - window:
+                self._failures.popitem(last=False)
+            while len(self._failures) > self.max_keys:
+                self._failures.popitem(last=False)
+            return len(failures)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._failures.pop(key, None)
+            self._locks.pop(key, None)
+
+    def lock(self, key: str, until: float) -> None:
+        with self._lock:
+            self._locks.pop(key, None)
+            self._locks[key] = until
+            self._failures.pop(key, None)
+            while len(self._locks) > self.max_keys:
+                self._locks.popitem(last=False)
+
+    def locked_until(self, key: str, now: float) -> Optional[float]:
+        with self._lock:
+            # Lockouts have the same length, so the oldest expire first
+            while self._locks and next(iter(self._locks.values())) <= now:
+                self._locks.popitem(last=False)
+            until = self._locks.get(key)
+            if until is not None and until <= now:
+                del self._locks[key]
+                return None
+            return until
+
+    def size(self) -> int:
+        """Number of keys held (failure counters and lockouts)."""
+        with self._lock:
+            return len(self._failures) + len(self._locks)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._failures.clear()
+            self._locks.clear()
+
+
+def client_ip(request: Request) -> str:
+    """Client address - behind fly.io's proxy the original one from Fly-Client-IP."""
+    forwarded = request.headers.get("Fly-Client-IP") if TRUST_PROXY_HEADERS else None
+    if forwarded:
+        return forwarded
+    return request.client.host if request.client else "unknown"
+
+
+class LoginThrottle:
+    """Sliding-window failure counter with lockout, keyed by username and IP."""
+
+    def __init__(
+        self,
+        store: Optional[ThrottleStore] = None,
+        max_failures: int = LOGIN_MAX_FAILURES,
+        ip_max_failures: int = LOGIN_IP_MAX_FAILURES,
+        window: float = LOGIN_WINDOW_SECONDS,
+        lockout: float = LOGIN_LOCKOUT_SECONDS,
+    ):
+        self.store = store if store is not None else InMemoryThrottleStore()
+        self.max_failures = max_failures
+        self.ip_max_failures = ip_max_failures
+        self.window = window
+        self.lockout = lockout
+        self._audit: Deque[dict] = deque(maxlen=AUDIT_HISTORY_SIZE)
+
+    @staticmethod
+    def _keys(username: str, ip: str) -> Dict[str, str]:
+        return {"user": f"user:{username.lower()}", "ip": f"ip:{ip}"}
+
+    def check(self, username: str, ip: str) -> None:
+        """Reject the attempt if the username or the IP is locked out.
+
+        Raises:
+            HTTPException: 429 with Retry-After while locked out
+        """
+        now = time.time()
+        for key in self._keys(username, ip).values():
+            until = self.store.locked_until(key, now)
+            if until is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many failed login attempts. Try again later.",
+                    headers={"Retry-After": str(max(1, int(until - now)))},
+                )
+
+    def record_failure(self, username: str, ip: str) -> None:
+        """Count a failed attempt and lock out the username/IP over the limit."""
+        now = time.time()
+        audit_logger.warning(f"Failed login for '{username}' from {ip}")
+        limits = {"user": self.max_failures, "ip": self.ip_max_failures}
+        for scope, key in self._keys(username, ip).items():
+            failures = self.store.add_failure(key, now, self.window)
+            if failures >= limits[scope]:
+                self.store.lock(key, now + self.lockout)
+                self._record_lockout(scope, username, ip, failures, now)
+
+    def record_success(self, username: str, ip: str) -> None:
+        """Reset the failure counter of the username after a successful login."""
+        self.store.reset(self._keys(username, ip)["user"])
+
+    def _record_lockout(self, scope: str, username: str, ip: str, failures: int, now: float) -> None:
+        event = {
+            "scope": scope,
+            "username": username,
+            "ip": ip,
+            "failures": failures,
+            "locked_at": datetime.utcfromtimestamp(now).isoformat(),
+            "locked_until": datetime.utcfromtimestamp(now + self.lockout).isoformat(),
+        }
+        self._audit.append(event)
+        audit_logger.warning(
+            f"🔒 Login locked ({scope}) for '{username}' from {ip} after {failures} failures "
+            f"until {event['locked_until']}"
+        )
+
+    def recent_lockouts(self) -> List[dict]:
+        """Lockout audit records of this process, newest first."""
+        return list(reversed(self._audit))
+
+    def clear(self) -> None:
+        """Forget all counters, lockouts and audit records (in-memory store only)."""
+        if isinstance(self.store, InMemoryThrottleStore):
+            self.store.clear()
+        self._audit.clear()
+
+
+login_throttle = LoginThrottle()
@@ -2,22 +2,36 @@
 FastAPI main application for Aquarius CRUD prototype.
 Simple CRUD operations for Kind, Wettkampf, Schwimmbad, and Saison.
 """
-from fastapi import FastAPI, Depends, HTTPException, Response
+from fastapi import FastAPI, Depends, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import text, or_, asc, desc, func, case
 from typing import List, Optional
 import os
+import math
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
 
-from app.database import get_db, engine, Base
+from app.database import (
+    get_db,
+    engine,
+    Base,
+    ENABLE_ASYNC_DB,
+    replica_engine,
+    READ_YOUR_WRITES_COOKIE,
+    TURSO_SYNC_INTERVAL,
+)
 from app import models, schemas
-from app.routers import auth, users, health, admin
+from app.routers import auth, users, health, admin, metrics
 from app.version import AQUARIUS_BACKEND_VERSION
+from app.status_sampler import status_sampler
+from app.metrics import MetricsMiddleware
+from app.compression import CompressionMiddleware
+from app.profiling import ProfilingMiddleware
+from app.spa import AssetFiles, SpaFiles
 
 # Domain routers
 from app.grunddaten import router as grunddaten_router
@@ -44,6 +58,14 @@ if not ENABLE_APP_AUTH:
 # Create tables
 Base.metadata.create_all(bind=engine)
 
+# Install the Kind full-text index and the Verband nomination counts on
+# databases created before they existed
+from app.kind import fulltext as kind_fulltext
+from app.grunddaten import nominations as verband_nominations
+with engine.begin() as connection:
+    kind_fulltext.install(connection)
+    verband_nominations.install(connection)
+
 # Import SessionLocal for startup event
 from app.database import SessionLocal
 
@@ -63,9 +85,38 @@ async def lifespan(app: FastAPI):
                 logger.warning(f"⚠️  Error initializing default app user: {e}")
             finally:
                 db.close()
-    
+
+    # Write-behind of User.last_active
+    from app.activity import activity_recorder, ACTIVITY_FLUSH_INTERVAL
+    activity_flusher = asyncio.create_task(activity_recorder.run(ACTIVITY_FLUSH_INTERVAL))
+
+    # Database latency/size samples for /api/status - the first one before serving
+    from app.status_sampler import STATUS_SAMPLE_INTERVAL
+    await asyncio.to_thread(status_sampler.sample)
+    sampler = asyncio.create_task(status_sampler.run(STATUS_SAMPLE_INTERVAL))
+
+    # Request profiling (opt-in): attribute threadpool workers to profiled requests
+    from app import profiling
+    if profiling.profiler.enabled:
+        profiling.instrument_threadpool()
+
     yield
-    # Shutdown logic (if any)
+    # Shutdown logic
+    for task in (activity_flusher, sampler):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    activity_recorder.flush()
+    profiling.uninstrument_threadpool()
+
+    from app.hashing import hash_pool
+    hash_pool.shutdown()
+
+    from app import database
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
 
 app = FastAPI(
     title="Aquarius CRUD API",
@@ -86,9 +137,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Total-Count"], # Expose pagination header
+    expose_headers=["X-Total-Count", "X-Next-Cursor"], # Expose pagination headers
 )
 
+# brotli/gzip for JSON and text responses (inside MetricsMiddleware, so it records the sent size)
+app.add_middleware(CompressionMiddleware)
+
+# Per-route latency, response size and SQL statistics for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Opt-in request profiles (X-Profile header for admins, PROFILE_SAMPLE_RATE)
+app.add_middleware(ProfilingMiddleware)
+
+# Read-your-writes: after a successful write, route this client's reads to the
+# primary until the embedded replica has synced (one sync interval)
+if replica_engine is not None:
+    logger.info(f"🔧 Embedded replica enabled (sync every {TURSO_SYNC_INTERVAL}s)")
+
+    @app.middleware("http")
+    async def read_your_writes(request: Request, call_next):
+        response = await call_next(request)
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            response.set_cookie(
+                READ_YOUR_WRITES_COOKIE,
+                "1",
+                max_age=max(1, math.ceil(TURSO_SYNC_INTERVAL)),
+                httponly=True,
+                samesite="lax",
+            )
+        return response
+
 # Mount static files for backend use
 static_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
 if not os.path.exists(static_dir):
@@ -100,6 +178,14 @@ app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(health.router)
 app.include_router(admin.router)
+app.include_router(metrics.router)
+
+# Async read endpoints must be registered before the sync routers to take precedence
+if ENABLE_ASYNC_DB:
+    app.include_router(kind_router.async_router)
+    app.include_router(wettkampf_router.async_router)
+    app.include_router(anmeldung_router.async_router)
+    logger.info("🔧 ENABLE_ASYNC_DB: async read endpoints enabled")
 
 # Domain routers
 app.include_router(grunddaten_router.router)
@@ -111,27 +197,22 @@ app.include_router(anmeldung_router.router)
 # In production: /app/frontend/dist
 # __file__ = /app/backend/app/main.py, so we go up 3 levels to /app
 frontend_dist = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "frontend", "dist")
-if os.path.exists(frontend_dist):
+spa_files = SpaFiles(frontend_dist)
+if spa_files.load():
     # Mount assets directory for CSS, JS, images
     assets_dir = os.path.join(frontend_dist, "assets")
     if os.path.exists(assets_dir):
-        app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
+        app.mount("/assets", AssetFiles(directory=assets_dir), name="assets")
 
-    logger.info(f"✓ Frontend static files mounted from {frontend_dist}")
+    logger.info(f"✓ Frontend static files loaded from {frontend_dist}")
 else:
     logger.warning(f"⚠️  Frontend dist directory not found at {frontend_dist}")
 
 @app.get("/")
-def read_root():
+def read_root(request: Request):
     """Serve the frontend application or API info."""
-    # Check if frontend is available
-    # In production: /app/frontend/dist
-    # __file__ = /app/backend/app/main.py, so we go up 3 levels to /app
-    frontend_dist = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "frontend", "dist")
-    index_html = os.path.join(frontend_dist, "index.html")
-
-    if os.path.exists(index_html):
-        return FileResponse(index_html)
+    if spa_files.index is not None:
+        return spa_files.index.response(request.headers)
     else:
         # Fallback to JSON response if frontend not available (development mode)
         return {"message": "Aquarius CRUD API", "version": AQUARIUS_BACKEND_VERSION}
@@ -154,7 +235,7 @@ def health_check(db: Session = Depends(get_db)):
     }
 
 @app.get("/api/status")
-def status_overview(db: Session = Depends(get_db)):
+def status_overview():
     """Public status overview for the documentation dashboard."""
     database_url = os.getenv("DATABASE_URL", "sqlite:///./aquarius.db")
     db_type = "turso" if database_url.startswith(("libsql://", "sqlite+libsql://")) else "sqlite"
@@ -164,64 +245,15 @@ def status_overview(db: Session = Depends(get_db)):
     environment = "fly" if (fly_region or fly_app) else "local"
     region = fly_region or ("unknown" if environment == "fly" else "local")
 
-    table_count = db.execute(
-        text("SELECT count(*) FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
-    ).scalar() or 0
-
-    page_count = db.execute(text("PRAGMA page_count")).scalar() or 0
-    page_size = db.execute(text("PRAGMA page_size")).scalar() or 0
-    db_size_bytes = page_count * page_size
-
-    health_start = time.perf_counter()
-    db.execute(text("SELECT 1"))
-    health_latency_ms = round((time.perf_counter() - health_start) * 1000, 2)
-
-    write_latency_ms = None
-    read_latency_ms = None
-    perf_rows = None
-
-    try:
-        db.execute(
-            text(
-                "CREATE TABLE IF NOT EXISTS performance_probe ("
-                "id INTEGER PRIMARY KEY, "
-                "created_at TEXT NOT NULL, "
-                "payload TEXT)"
-            )
-        )
-        db.commit()
-
-        insert_start = time.perf_counter()
-        db.execute(
-            text("INSERT INTO performance_probe (created_at, payload) VALUES (:created_at, :payload)"),
-            {
-                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                "payload": "probe",
-            },
-        )
-        db.commit()
-        write_latency_ms = round((time.perf_counter() - insert_start) * 1000, 2)
-
-        read_start = time.perf_counter()
-        perf_rows = db.execute(text("SELECT count(*) FROM performance_probe")).scalar() or 0
-        if perf_rows > 10000:
-            db.execute(
-                text(
-                    "DELETE FROM performance_probe "
-                    "WHERE id NOT IN ("
-                    "  SELECT id FROM performance_probe "
-                    "  ORDER BY id DESC "
-                    "  LIMIT 10000"
-                    ")"
-                )
-            )
-            db.commit()
-            perf_rows = db.execute(text("SELECT count(*) FROM performance_probe")).scalar() or 0
-        read_latency_ms = round((time.perf_counter() - read_start) * 1000, 2)
-    except Exception:
-        db.rollback()
+    # Probing runs in the background (app.status_sampler), never per request;
+    # until a sample succeeded the values are empty
+    snapshot = status_sampler.snapshot()
+    state = "ok" if snapshot else "warming_up"
+    snapshot = snapshot or {}
+    latency_ms = snapshot.get("latency_ms", {})
 
     return {
+        "status": state,
         "version": AQUARIUS_BACKEND_VERSION,
         "app": {
             "environment": environment,
@@ -229,19 +261,16 @@ def status_overview(db: Session = Depends(get_db)):
         },
         "database": {
             "type": db_type,
-            "table_count": table_count,
-            "size_bytes": db_size_bytes,
-            "health_latency_ms": health_latency_ms,
-            "write_latency_ms": write_latency_ms,
-            "read_latency_ms": read_latency_ms,
-            "performance_rows": perf_rows,
-        },
-        "counts": {
-            "users": db.query(models.User).count(),
-            "kind": db.query(models.Kind).count(),
-            "anmeldung": db.query(models.Anmeldung).count(),
-            "wettkampf": db.query(models.Wettkampf).count(),
+            "table_count": snapshot.get("table_count"),
+            "size_bytes": snapshot.get("size_bytes"),
+            "health_latency_ms": latency_ms.get("health"),
+            "write_latency_ms": latency_ms.get("write"),
+            "read_latency_ms": latency_ms.get("read"),
+            "performance_rows": snapshot.get("performance_rows"),
+            "latency": snapshot.get("latency"),
         },
+        "counts": snapshot.get("counts", {}),
+        "sampled_at": snapshot.get("sampled_at"),
     }
 
 
@@ -251,24 +280,15 @@ def status_overview(db: Session = Depends(get_db)):
 # This must be the LAST route to act as a catch-all for frontend routes
 
 @app.get("/{full_path:path}")
-async def serve_spa(full_path: str):
+async def serve_spa(full_path: str, request: Request):
     """
     Catch-all route to serve the React SPA for client-side routing.
-    First checks if a static file exists (e.g., vite.svg, favicon.ico).
+    First checks if a static file exists in the dist root (e.g., vite.svg, favicon.ico).
     If not, returns index.html for React Router to handle navigation.
+    Both are served from memory (see app.spa).
     """
-    # In production: /app/frontend/dist
-    # __file__ = /app/backend/app/main.py, so we go up 3 levels to /app
-    frontend_dist = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "frontend", "dist")
-
-    # Check if the requested path is a static file in dist root
-    requested_file = os.path.join(frontend_dist, full_path)
-    if os.path.isfile(requested_file):
-        return FileResponse(requested_file)
-
-    # Otherwise, serve index.html for SPA routing
-    index_html = os.path.join(frontend_dist, "index.html")
-    if os.path.exists(index_html):
-        return FileResponse(index_html)
+    cached_file = spa_files.get(full_path) or spa_files.index
+    if cached_file is not None:
+        return cached_file.response(request.headers)
     else:
         raise HTTPException(status_code=404, detail="Frontend not found")
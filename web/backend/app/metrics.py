@@ -0,0 +1,359 @@
+"""Prometheus-compatible metrics (text exposition format, served on /metrics).
+
+- MetricsMiddleware: per-route request latency and response size histograms,
+  status code counters and the number of requests in flight.
+- instrument_engine: SQL statement durations, plus statement count and SQL
+  time per request (attributed to the route of the current request).
+- TimedQueuePool / TimedAsyncAdaptedQueuePool: time spent waiting for a
+  pooled connection.
+
+Statements slower than SLOW_QUERY_MS are logged (normalized SQL and route) to
+the app.slow_query logger. With SQL_DEBUG_HEADER=true every response carries
+the number of statements it issued in X-SQL-Queries (used by the query budget
+tests, see tests/conftest.py).
+
+The handful of metric types needed here are implemented in this module, so
+no client library is required.
+"""
+import abc
+import contextvars
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+slow_query_logger = logging.getLogger("app.slow_query")
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SQL_DEBUG_HEADER = os.getenv("SQL_DEBUG_HEADER", "false").lower() == "true"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Label value for requests that matched no route (keeps the label set bounded)
+UNMATCHED_ROUTE = "unmatched"
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    @abc.abstractmethod
+    def render(self) -> List[str]:
+        """Exposition lines (HELP, TYPE and samples)."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Drop all recorded values."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in items
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> [bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._values.get(labels)
+            return series[-1] if series else 0
+
+    def sum(self, *labels: str) -> float:
+        with self._lock:
+            series = self._values.get(labels)
+            return series[-2] if series else 0.0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._values.items())
+        lines = self._header()
+        for labels, series in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, series):
+                cumulative += bucket_count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(float(series[-2]))}")
+            lines.append(f"{self.name}_count{label_str} {series[-1]}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        for metric in self._metrics:
+            metric.clear()
+
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    "aquarius_http_requests_total", "HTTP requests by route and status code", ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "aquarius_http_request_duration_seconds", "HTTP request latency", ("method", "route")
+))
+http_response_size_bytes = registry.register(Histogram(
+    "aquarius_http_response_size_bytes", "HTTP response body size", ("method", "route"), buckets=SIZE_BUCKETS
+))
+http_requests_in_flight = registry.register(Gauge(
+    "aquarius_http_requests_in_flight", "HTTP requests currently being served", ("method",)
+))
+db_query_duration_seconds = registry.register(Histogram(
+    "aquarius_db_query_duration_seconds", "Duration of single SQL statements"
+))
+db_queries_per_request = registry.register(Histogram(
+    "aquarius_db_queries_per_request", "SQL statements per HTTP request", ("method", "route"), buckets=COUNT_BUCKETS
+))
+db_time_per_request_seconds = registry.register(Histogram(
+    "aquarius_db_time_per_request_seconds", "Time spent in SQL statements per HTTP request", ("method", "route")
+))
+db_pool_checkout_wait_seconds = registry.register(Histogram(
+    "aquarius_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled database connection"
+))
+
+
+class RequestStats:
+    """SQL statistics of the current request (shared with threadpool workers)."""
+    __slots__ = ("queries", "query_seconds", "scope")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.queries = 0
+        self.query_seconds = 0.0
+        # ASGI scope of the request; the router adds the matched route to it
+        self.scope = scope
+
+
+# Set by MetricsMiddleware; the object is mutated, so updates made in
+# threadpool workers (which run in a copy of the context) are visible
+current_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "current_request_stats", default=None
+)
+
+
+def route_label(scope: dict) -> str:
+    """Path template of the matched route (e.g. /api/kind/{kind_id})."""
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request metrics."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestStats(scope)
+        token = current_request_stats.set(stats)
+        status_code = 500
+        body_size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if SQL_DEBUG_HEADER:
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-sql-queries", str(stats.queries).encode()),
+                        (b"x-sql-time-ms", f"{stats.query_seconds * 1000:.1f}".encode()),
+                    ]
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_flight.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec(method)
+            current_request_stats.reset(token)
+
+            route = route_label(scope)
+            http_requests_total.inc(method, route, str(status_code))
+            http_request_duration_seconds.observe(elapsed, method, route)
+            http_response_size_bytes.observe(body_size, method, route)
+            db_queries_per_request.observe(stats.queries, method, route)
+            db_time_per_request_seconds.observe(stats.query_seconds, method, route)
+
+
+_WHITESPACE = re.compile(r"\s+")
+_PARAMETER_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_NUMBERED_PARAMETER_LIST = re.compile(r"\((?:\s*\(\s*\?(?:\s*,\s*\?)*\s*\)\s*,)+\s*\(\s*\?(?:\s*,\s*\?)*\s*\)\s*\)")
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace and parameter lists so equal queries log the same."""
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _NUMBERED_PARAMETER_LIST.sub("((?, ...), ...)", normalized)
+    return _PARAMETER_LIST.sub("(?, ...)", normalized)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    db_query_duration_seconds.observe(elapsed)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += elapsed
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        route = route_label(stats.scope) if stats is not None and stats.scope is not None else "-"
+        slow_query_logger.warning(f"🐢 {elapsed * 1000:.1f} ms [{route}] {normalize_sql(statement)}")
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("metrics_query_start"):
+        connection.info["metrics_query_start"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record statement timings of an engine (sync engine of async engines)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class _CheckoutTimer:
+    """Pool mixin timing how long a checkout waits for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_wait_seconds.observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(_CheckoutTimer, QueuePool):
+    """QueuePool recording the checkout wait."""
+
+
+class TimedAsyncAdaptedQueuePool(_CheckoutTimer, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool recording the checkout wait."""
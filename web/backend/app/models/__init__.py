@@ -1,7 +1,7 @@
 """
 SQLAlchemy models for Aquarius CRUD prototype.
 """
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Table, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Table, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, date
 from app.database import Base
@@ -73,10 +73,17 @@ class Verband(Base):
     abkuerzung = Column(String(5), nullable=False, unique=True, index=True)
     land = Column(String, nullable=False)
     ort = Column(String, nullable=False)
+    # Number of Kinder with this verband_id, maintained by triggers (app.grunddaten.nominations)
+    nomination_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relationships
     kinder = relationship("Kind", back_populates="verband")
 
+    __table_args__ = (
+        # Verband list sorted by nomination count (name breaks ties)
+        Index("ix_verband_nomination_count_name", "nomination_count", "name"),
+    )
+
 
 class Versicherung(Base):
     """Insurance company model."""
@@ -150,6 +157,10 @@ class Figur(Base):
 class Anmeldung(Base):
     """Registration model."""
     __tablename__ = "anmeldung"
+    __table_args__ = (
+        # A startnummer is handed out once per competition (NULLs are not compared)
+        Index("ux_anmeldung_wettkampf_startnummer", "wettkampf_id", "startnummer", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     kind_id = Column(Integer, ForeignKey("kind.id"), nullable=False)
@@ -164,6 +175,30 @@ class Anmeldung(Base):
     wettkampf = relationship("Wettkampf", back_populates="anmeldungen")
     figuren = relationship("Figur", secondary=anmeldung_figur_association)
 
+
+class StartnummerSequenz(Base):
+    """Per-competition counter for startnummer allocation.
+
+    Incremented with UPDATE ... RETURNING inside the registration transaction,
+    so concurrent registrations serialize on this row instead of racing on MAX().
+    """
+    __tablename__ = "startnummer_sequenz"
+
+    wettkampf_id = Column(Integer, ForeignKey("wettkampf.id", ondelete="CASCADE"), primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
+
+
+class TableVersion(Base):
+    """Change counter per table.
+
+    Bumped in the writing transaction (see app.shared.versions), so every
+    worker can tell whether cached lists and client ETags are still current.
+    """
+    __tablename__ = "table_version"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
 # Placeholder for future Domain-Driven Models
 # from app.kind import models as kind_models
 # from app.anmeldung import models as anmeldung_models
@@ -0,0 +1,107 @@
+"""In-process cache of authenticated app principals.
+
+Resolving the user behind a token costs a database round trip per request
+(a WAN hop on Turso). The permission checks only need a handful of user
+fields, so those are cached per token subject (username) for a short time.
+
+Entries are dropped when a user is updated or deleted (routers/users.py);
+changes made outside this process become visible after PRINCIPAL_CACHE_TTL.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from app import models
+
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))  # seconds, 0 disables the cache
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024"))
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated app user as seen by the permission checks."""
+    id: int
+    username: str
+    role: str
+    is_active: bool
+    is_app_user: bool
+    can_read_all: bool
+    can_write_all: bool
+
+    @classmethod
+    def from_user(cls, user: models.User) -> "Principal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            role=user.role,
+            is_active=bool(user.is_active),
+            is_app_user=bool(user.is_app_user),
+            can_read_all=bool(user.can_read_all),
+            can_write_all=bool(user.can_write_all),
+        )
+
+
+class PrincipalCache:
+    """Thread-safe LRU cache with a time-to-live, keyed by username."""
+
+    def __init__(self, ttl: float = PRINCIPAL_CACHE_TTL, maxsize: int = PRINCIPAL_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple[float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, username: str) -> Optional[Principal]:
+        """Return the cached principal, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[username]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(username)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, principal: Principal) -> None:
+        """Cache a principal, evicting the least recently used entry if full."""
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[principal.username] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(principal.username)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, username: str) -> None:
+        """Drop the entry of a user (call after updating or deleting it)."""
+        with self._lock:
+            self._entries.pop(username, None)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+            }
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,323 @@
+"""Opt-in stack-sampling profiler for single requests.
+
+Profiling is off unless ENABLE_PROFILING is set or PROFILE_SAMPLE_RATE is
+above 0. Then a request is profiled if an admin sends `X-Profile: 1` or if it
+is picked by PROFILE_SAMPLE_RATE (fraction of /api requests). While it runs, a sampler
+thread records the Python stacks of the threads working on it every
+PROFILE_INTERVAL_MS:
+
+- the event loop thread (async endpoints and dependencies - note that other
+  requests interleaved on the loop show up there as well),
+- the threadpool workers while they run the request's sync endpoint and sync
+  dependencies (e.g. the permission checks, with or without SQL). With
+  profiling on, the app lifespan wraps FastAPI's run_in_threadpool
+  (instrument_threadpool) to attribute a worker for exactly that call.
+
+The last PROFILE_HISTORY profiles are kept in memory and can be downloaded as
+folded stacks (flamegraph.pl / speedscope) via /api/admin/profiles.
+"""
+import asyncio
+import contextvars
+import functools
+import itertools
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+
+import fastapi.concurrency
+import fastapi.dependencies.utils
+import fastapi.routing
+from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# Header-triggered profiles only; a sample rate above 0 enables profiling as well
+ENABLE_PROFILING = os.getenv("ENABLE_PROFILING", "false").lower() == "true"
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_HISTORY = int(os.getenv("PROFILE_HISTORY", "20"))
+
+# Roles allowed to request a profile via header (see auth.get_current_admin_user)
+ADMIN_ROLES = ("ADMIN", "CLEO")
+
+MAX_STACK_DEPTH = 64
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _folded_stack(frame) -> str:
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class RequestProfile:
+    """Stack samples of one request."""
+
+    def __init__(self, method: str, path: str, trigger: str):
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.route: Optional[str] = None
+        self.status_code: Optional[int] = None
+        self.duration_ms: Optional[float] = None
+        self.started_at = datetime.utcnow()
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._threads: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def add_thread(self, thread_id: int) -> None:
+        with self._lock:
+            self._threads.add(thread_id)
+
+    def remove_thread(self, thread_id: int) -> None:
+        with self._lock:
+            self._threads.discard(thread_id)
+
+    def sample(self, frames: Dict[int, object]) -> None:
+        with self._lock:
+            threads = list(self._threads)
+        self.sample_count += 1
+        for thread_id in threads:
+            frame = frames.get(thread_id)
+            if frame is not None:
+                self.samples[_folded_stack(frame)] += 1
+
+    def folded(self) -> str:
+        """Samples in folded stack format ("frame;frame;frame count")."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def top_functions(self, limit: int = 15) -> List[dict]:
+        """Functions by self samples (innermost frame)."""
+        own: Counter = Counter()
+        for stack, count in self.samples.items():
+            own[stack.rsplit(";", 1)[-1]] += count
+        total = sum(own.values()) or 1
+        return [
+            {"function": function, "samples": count, "percent": round(count * 100 / total, 1)}
+            for function, count in own.most_common(limit)
+        ]
+
+    def summary(self, profile_id: int) -> dict:
+        return {
+            "id": profile_id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status_code,
+            "duration_ms": self.duration_ms,
+            "trigger": self.trigger,
+            "started_at": self.started_at.isoformat(),
+            "samples": self.sample_count,
+        }
+
+
+# Profile of the request being handled (copied into threadpool workers)
+current_profile: contextvars.ContextVar[Optional[RequestProfile]] = contextvars.ContextVar(
+    "current_profile", default=None
+)
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, profile: RequestProfile, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.profile = profile
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.profile.sample(sys._current_frames())
+
+
+class Profiler:
+    """Decides which requests to profile and keeps the recent profiles."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        sample_rate: float = PROFILE_SAMPLE_RATE,
+        interval_ms: float = PROFILE_INTERVAL_MS,
+        history: int = PROFILE_HISTORY,
+        enabled: Optional[bool] = None,
+    ):
+        # Defaults to app.database.SessionLocal, resolved on first admin check
+        self.session_factory = session_factory
+        self.enabled = (ENABLE_PROFILING or sample_rate > 0) if enabled is None else enabled
+        self.sample_rate = sample_rate
+        self.interval_ms = interval_ms
+        self.history = history
+        self._profiles: "OrderedDict[int, RequestProfile]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def is_admin_token(self, authorization: Optional[str]) -> bool:
+        """True if the bearer token belongs to an active admin user."""
+        from app import models
+        from app.auth import SECRET_KEY, ALGORITHM
+
+        if not authorization or not authorization.lower().startswith("bearer "):
+            return False
+        try:
+            username = jwt.decode(authorization[7:], SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+        except JWTError:
+            return False
+        if not username:
+            return False
+
+        session_factory = self.session_factory
+        if session_factory is None:
+            from app.database import SessionLocal
+            session_factory = SessionLocal
+        with session_factory() as db:
+            user = db.execute(
+                select(models.User.role, models.User.is_active).where(models.User.username == username)
+            ).first()
+        return user is not None and user.is_active and user.role in ADMIN_ROLES
+
+    def store(self, profile: RequestProfile) -> int:
+        with self._lock:
+            profile_id = next(self._ids)
+            self._profiles[profile_id] = profile
+            while len(self._profiles) > self.history:
+                self._profiles.popitem(last=False)
+        return profile_id
+
+    def list(self) -> List[dict]:
+        """Summaries of the kept profiles, newest first."""
+        with self._lock:
+            items = list(self._profiles.items())
+        return [profile.summary(profile_id) for profile_id, profile in reversed(items)]
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+
+profiler = Profiler()
+
+
+def _run_attributed(profile: RequestProfile, func: Callable, *args, **kwargs):
+    thread_id = threading.get_ident()
+    profile.add_thread(thread_id)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        # The worker goes back to the pool and may serve other requests
+        profile.remove_thread(thread_id)
+
+
+async def _profiled_run_in_threadpool(func: Callable, *args, **kwargs):
+    profile = current_profile.get()
+    if profile is None:
+        return await run_in_threadpool(func, *args, **kwargs)
+    return await run_in_threadpool(functools.partial(_run_attributed, profile, func, *args, **kwargs))
+
+
+# FastAPI modules calling run_in_threadpool for sync endpoints and dependencies
+_THREADPOOL_CALLERS = (fastapi.routing, fastapi.dependencies.utils, fastapi.concurrency)
+
+# Replaced run_in_threadpool per module, restored by uninstrument_threadpool
+_original_run_in_threadpool: Dict[object, Callable] = {}
+
+
+def instrument_threadpool() -> bool:
+    """Attribute threadpool workers to the profiled request while they run its code.
+
+    Returns:
+        False if a FastAPI module no longer has run_in_threadpool (the
+        workers it starts are then not attributed)
+    """
+    complete = True
+    for module in _THREADPOOL_CALLERS:
+        current = getattr(module, "run_in_threadpool", None)
+        if current is None:
+            logger.warning(f"⚠️  {module.__name__} has no run_in_threadpool, its workers are not profiled")
+            complete = False
+        elif current is not _profiled_run_in_threadpool:
+            _original_run_in_threadpool[module] = current
+            module.run_in_threadpool = _profiled_run_in_threadpool
+    return complete
+
+
+def uninstrument_threadpool() -> None:
+    """Restore FastAPI's run_in_threadpool."""
+    while _original_run_in_threadpool:
+        module, original = _original_run_in_threadpool.popitem()
+        module.run_in_threadpool = original
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware profiling opted-in or sampled requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def _trigger(self, scope) -> Optional[str]:
+        headers = dict(scope.get("headers") or [])
+        if headers.get(PROFILE_HEADER.encode()) == b"1":
+            authorization = headers.get(b"authorization", b"").decode("latin-1")
+            if await asyncio.to_thread(profiler.is_admin_token, authorization):
+                return "header"
+        if profiler.sample_rate > 0 and scope["path"].startswith("/api/") and random.random() < profiler.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+        trigger = await self._trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        from app.metrics import route_label
+
+        profile = RequestProfile(scope["method"], scope["path"], trigger)
+        profile.add_thread(threading.get_ident())
+        token = current_profile.set(profile)
+        sampler = _Sampler(profile, profiler.interval_ms / 1000)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stopped.set()
+            # The last sample may still run - wait off the event loop
+            await asyncio.to_thread(sampler.join)
+            current_profile.reset(token)
+            profile.duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            profile.route = route_label(scope)
+            profile_id = profiler.store(profile)
+            logger.info(
+                f"📈 Profiled {profile.method} {profile.path} ({trigger}): "
+                f"{profile.duration_ms} ms, {profile.sample_count} samples, id {profile_id}"
+            )
+
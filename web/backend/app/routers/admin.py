@@ -1,10 +1,16 @@
 """Admin endpoints for system management."""
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import inspect
 from app.database import get_db
 from app import auth, models
+from app.activity import activity_recorder
+from app.hashing import hash_pool
+from app.login_throttle import login_throttle
+from app.profiling import profiler
+from app.principal_cache import principal_cache
 
 router = APIRouter(
     prefix="/api/admin",
@@ -24,9 +30,8 @@ async def get_active_user_count(
     """
     since = datetime.utcnow() - timedelta(minutes=minutes)
     
-    count = db.query(models.User).filter(
-        models.User.last_active >= since
-    ).count()
+    # Merged view of the database and the not yet flushed activity
+    count = len(activity_recorder.active_user_ids(db, since))
     
     return {
         "active_users": count,
@@ -35,6 +40,65 @@ async def get_active_user_count(
     }
 
 
+@router.get("/auth/principal-cache")
+async def get_principal_cache_stats(
+    current_user: models.User = Depends(auth.get_current_admin_user)
+):
+    """Get hit/miss counters of the authenticated-principal cache."""
+    return principal_cache.stats()
+
+
+@router.get("/auth/hash-pool")
+async def get_hash_pool_stats(
+    current_user: models.User = Depends(auth.get_current_admin_user)
+):
+    """Get queue depth and wait time of the bcrypt hashing pool."""
+    return hash_pool.stats()
+
+
+@router.get("/auth/lockouts")
+async def get_login_lockouts(
+    current_user: models.User = Depends(auth.get_current_admin_user)
+):
+    """Get the recent login lockouts (audit records of this machine)."""
+    return login_throttle.recent_lockouts()
+
+
+@router.get("/profiles")
+async def list_profiles(
+    current_user: models.User = Depends(auth.get_current_admin_user)
+):
+    """List the recent request profiles (newest first)."""
+    return profiler.list()
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: int,
+    current_user: models.User = Depends(auth.get_current_admin_user)
+):
+    """Get a request profile with its hottest functions."""
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return {**profile.summary(profile_id), "top_functions": profile.top_functions()}
+
+
+@router.get("/profiles/{profile_id}/folded", response_class=PlainTextResponse)
+async def download_profile(
+    profile_id: int,
+    current_user: models.User = Depends(auth.get_current_admin_user)
+):
+    """Download a request profile as folded stacks (flamegraph.pl, speedscope)."""
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(
+        profile.folded(),
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'},
+    )
+
+
 @router.get("/database/stats")
 async def get_database_stats(
     db: Session = Depends(get_db),
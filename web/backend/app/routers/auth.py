@@ -1,10 +1,12 @@
+import asyncio
 from datetime import timedelta, datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from app.database import get_db
 from app import schemas, models, auth, totp
+from app.login_throttle import client_ip, login_throttle
 
 router = APIRouter(
     prefix="/api/auth",
@@ -50,19 +52,29 @@ class TOTPStatusResponse(BaseModel):
 
 
 @router.post("/token", response_model=schemas.Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_for_access_token(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: Session = Depends(get_db)
+):
     """
     App login endpoint - authenticates users for the main application.
     2FA is optional for app access (required only for admin panel).
     """
+    ip = client_ip(request)
+    login_throttle.check(form_data.username, ip)
+
     user = db.query(models.User).filter(models.User.username == form_data.username).first()
-    if not user or not auth.verify_password(form_data.password, user.hashed_password):
+    if not user or not await auth.verify_password_async(form_data.password, user.hashed_password):
+        login_throttle.record_failure(form_data.username, ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    login_throttle.record_success(form_data.username, ip)
+
     # All users can login to the app with username/password
     # 2FA is only required for admin panel access (handled in /admin/auth/token)
     access_token_expires = timedelta(minutes=auth.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -75,11 +87,16 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
 @router.post("/totp/verify", response_model=schemas.Token)
 async def verify_totp_and_login(
     request: TOTPLoginRequest,
+    http_request: Request,
     db: Session = Depends(get_db)
 ):
     """Verify username/password + TOTP code and return access token."""
+    ip = client_ip(http_request)
+    login_throttle.check(request.username, ip)
+
     user = db.query(models.User).filter(models.User.username == request.username).first()
-    if not user or not auth.verify_password(request.password, user.hashed_password):
+    if not user or not await auth.verify_password_async(request.password, user.hashed_password):
+        login_throttle.record_failure(request.username, ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -93,10 +110,12 @@ async def verify_totp_and_login(
 
     # Verify TOTP code
     if not totp.verify_totp_code(user.totp_secret, request.code):
+        login_throttle.record_failure(request.username, ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid TOTP code",
         )
+    login_throttle.record_success(request.username, ip)
 
     # Success - generate token with totp_verified=true
     access_token_expires = timedelta(minutes=auth.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -110,11 +129,16 @@ async def verify_totp_and_login(
 @router.post("/totp/verify-backup", response_model=schemas.Token)
 async def verify_backup_code_and_login(
     request: BackupCodeLoginRequest,
+    http_request: Request,
     db: Session = Depends(get_db)
 ):
     """Verify username/password + backup code and return access token."""
+    ip = client_ip(http_request)
+    login_throttle.check(request.username, ip)
+
     user = db.query(models.User).filter(models.User.username == request.username).first()
-    if not user or not auth.verify_password(request.password, user.hashed_password):
+    if not user or not await auth.verify_password_async(request.password, user.hashed_password):
+        login_throttle.record_failure(request.username, ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -127,12 +151,14 @@ async def verify_backup_code_and_login(
         )
 
     # Verify backup code
-    is_valid, updated_codes = totp.verify_backup_code(user.backup_codes, request.backup_code)
+    is_valid, updated_codes = await totp.verify_backup_code_async(user.backup_codes, request.backup_code)
     if not is_valid:
+        login_throttle.record_failure(request.username, ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid backup code",
         )
+    login_throttle.record_success(request.username, ip)
 
     # Update user's backup codes (remove used code)
     user.backup_codes = updated_codes
@@ -161,12 +187,12 @@ async def setup_totp(
     """Generate TOTP secret and QR code for initial setup."""
     # Generate new secret and backup codes
     secret = totp.generate_totp_secret()
-    qr_code = totp.generate_qr_code(secret, current_user.username)
+    qr_code = await totp.generate_qr_code_async(secret, current_user.username)
     backup_codes = totp.generate_backup_codes(10)
 
     # Store secret temporarily (not enabled yet)
     current_user.totp_secret = secret
-    current_user.backup_codes = totp.hash_backup_codes(backup_codes)
+    current_user.backup_codes = await totp.hash_backup_codes_async(backup_codes)
     db.commit()
 
     return {
@@ -176,6 +202,20 @@ async def setup_totp(
     }
 
 
+@router.get("/totp/qr-code", response_class=Response)
+async def get_totp_qr_code(
+    current_user: models.User = Depends(auth.get_current_active_user)
+):
+    """Get the QR code of a pending TOTP setup as SVG (e.g. after a page reload)."""
+    if not current_user.totp_secret or current_user.totp_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No TOTP setup in progress",
+        )
+    svg = await asyncio.to_thread(totp.render_qr_code_svg, current_user.totp_secret, current_user.username)
+    return Response(content=svg, media_type="image/svg+xml", headers={"Cache-Control": "no-store"})
+
+
 @router.post("/totp/enable")
 async def enable_totp(
     request: TOTPEnableRequest,
@@ -200,6 +240,7 @@ async def enable_totp(
     current_user.totp_enabled = True
     current_user.totp_setup_at = datetime.utcnow()
     db.commit()
+    totp.forget_qr_code(current_user.totp_secret)
 
     return {"success": True, "message": "2FA enabled successfully"}
 
@@ -225,7 +266,7 @@ async def disable_totp(
 ):
     """Disable TOTP (requires password + current TOTP code)."""
     # Verify password
-    if not auth.verify_password(password, current_user.hashed_password):
+    if not await auth.verify_password_async(password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect password",
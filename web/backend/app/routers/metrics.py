@@ -0,0 +1,30 @@
+import hmac
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+
+from app import auth
+from app.database import get_db
+from app.metrics import registry
+
+# Bearer token for the scraper; without it only admins can read /metrics
+# (per-route traffic and slow queries are not public)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def read_metrics(
+    db: Session = Depends(get_db),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(auth.optional_http_bearer),
+):
+    """Prometheus text exposition of the request and database metrics."""
+    token = credentials.credentials if credentials else None
+    if not (METRICS_TOKEN and token and hmac.compare_digest(token, METRICS_TOKEN)):
+        auth.check_admin_token(token, db)
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -4,6 +4,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app import schemas, models, auth
+from app.activity import activity_recorder
+from app.principal_cache import principal_cache
 
 router = APIRouter(
     prefix="/api/users",
@@ -19,9 +21,8 @@ async def get_active_user_count(
 ):
     since = datetime.utcnow() - timedelta(minutes=minutes)
 
-    count = db.query(models.User).filter(
-        models.User.last_active >= since
-    ).count()
+    # Merged view of the database and the not yet flushed activity
+    count = len(activity_recorder.active_user_ids(db, since))
 
     return {
         "active_users": count,
@@ -41,7 +42,7 @@ def read_users(
     return users
 
 @router.post("/", response_model=schemas.User, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user: schemas.UserCreate, 
     db: Session = Depends(get_db),
     current_user: models.User = Depends(auth.get_current_admin_user)
@@ -50,7 +51,7 @@ def create_user(
     if db_user:
         raise HTTPException(status_code=400, detail="Username already registered")
     
-    hashed_password = auth.get_password_hash(user.password)
+    hashed_password = await auth.get_password_hash_async(user.password)
     new_user = models.User(
         username=user.username,
         full_name=user.full_name,
@@ -78,7 +79,7 @@ def read_user(
     return db_user
 
 @router.put("/{user_id}", response_model=schemas.User)
-def update_user(
+async def update_user(
     user_id: int, 
     user_update: schemas.UserUpdate, 
     db: Session = Depends(get_db),
@@ -88,14 +89,17 @@ def update_user(
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     
+    username = db_user.username
     update_data = user_update.model_dump(exclude_unset=True)
     if "password" in update_data:
-        update_data["hashed_password"] = auth.get_password_hash(update_data.pop("password"))
+        update_data["hashed_password"] = await auth.get_password_hash_async(update_data.pop("password"))
     
     for key, value in update_data.items():
         setattr(db_user, key, value)
     
     db.commit()
+    # Drop the cached principal (under the old username - it may have changed)
+    principal_cache.invalidate(username)
     db.refresh(db_user)
     return db_user
 
@@ -112,6 +116,8 @@ def delete_user(
     if db_user.id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot delete your own user")
         
+    username = db_user.username
     db.delete(db_user)
     db.commit()
+    principal_cache.invalidate(username)
     return None
@@ -58,6 +58,7 @@ from app.wettkampf.schemas import (
     WettkampfCreate,
     WettkampfUpdate,
     WettkampfWithDetails,
+    WettkampfDetailsProjection,
 )
 
 # Re-export Anmeldung schemas
@@ -65,6 +66,8 @@ from app.anmeldung.schemas import (
     Anmeldung,
     AnmeldungCreate,
     AnmeldungUpdate,
+    BulkAnmeldungItem,
+    BulkAnmeldungResult,
 )
 
 __all__ = [
@@ -116,10 +119,13 @@ __all__ = [
     "WettkampfCreate",
     "WettkampfUpdate",
     "WettkampfWithDetails",
+    "WettkampfDetailsProjection",
     # Anmeldung
     "Anmeldung",
     "AnmeldungCreate",
     "AnmeldungUpdate",
+    "BulkAnmeldungItem",
+    "BulkAnmeldungResult",
 ]
 
 # Resolve forward references now that all schemas are imported
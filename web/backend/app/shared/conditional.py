@@ -0,0 +1,81 @@
+"""Conditional GETs (ETag / If-None-Match) from table versions.
+
+The ETag of a response is derived from the counters of the tables it is built
+from (see app.shared.versions) and the URL, so it is known before the
+endpoint queries or maps anything. A matching If-None-Match is answered with
+304 right in the dependency; otherwise the endpoint runs as usual and the
+response carries the ETag.
+
+The counters are read through the session that serves the data - by default
+get_read_db's (the replica, if configured), with primary=True the primary's -
+so an ETag never describes data the response does not contain.
+
+Usage (after the permission dependency, so 401/403 win over 304):
+
+    etag: Dict[str, str] = Depends(ConditionalGet("figur"))
+"""
+import hashlib
+from typing import Dict, Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db, get_read_db
+from app.shared.versions import table_versions
+from app.version import AQUARIUS_BACKEND_VERSION
+
+# Clients may store the response but have to revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+class NotModified(HTTPException):
+    """304 response for a matching If-None-Match (sent without a body)."""
+
+    def __init__(self, headers: Dict[str, str]):
+        super().__init__(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+class ConditionalGet:
+    """Dependency answering conditional GETs from the versions of tables.
+
+    Args:
+        tables: Tables the response is built from
+        primary: The endpoint reads from the primary (get_db, async engine)
+            rather than from get_read_db
+    """
+
+    def __init__(self, *tables: str, primary: bool = False):
+        self.tables = tables
+        self.primary = primary
+
+    def __call__(
+        self,
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+        read_db: Session = Depends(get_read_db),
+    ) -> Dict[str, str]:
+        # Both are the sessions the endpoint gets (dependencies are cached per request)
+        versions = table_versions.current(db if self.primary else read_db)
+        marker = ":".join(
+            [AQUARIUS_BACKEND_VERSION, request.url.path, str(request.url.query)]
+            + [f"{table}={versions.get(table, 0)}" for table in self.tables]
+        )
+        headers = {
+            "ETag": f'W/"{hashlib.sha1(marker.encode()).hexdigest()[:20]}"',
+            "Cache-Control": CACHE_CONTROL,
+        }
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            raise NotModified(headers)
+        response.headers.update(headers)
+        return headers
@@ -0,0 +1,92 @@
+"""Keyset (cursor) pagination helpers shared across domains.
+
+A cursor is an opaque, URL-safe token encoding the sort key values of the last
+row of a page (always ending with the row id as tie-breaker) plus the sort
+settings it was created for. The next page continues strictly after that row,
+so deep pages cost the same as the first one - unlike OFFSET.
+"""
+import base64
+import json
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import tuple_
+from sqlalchemy.sql import Select
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded or belongs to a different sort order."""
+
+
+def encode_cursor(values: Sequence[Any], **context: Any) -> str:
+    """Encode sort key values (and the sort settings) into an opaque cursor.
+
+    Args:
+        values: Sort key values of the last row, id last
+        context: Sort settings the cursor is only valid for (e.g. sort_by)
+
+    Returns:
+        URL-safe cursor token
+    """
+    payload = json.dumps({"v": list(values), "c": context}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, **context: Any) -> List[Any]:
+    """Decode a cursor created by encode_cursor.
+
+    Args:
+        token: Cursor token from the client
+        context: Current sort settings, must match the ones in the cursor
+
+    Returns:
+        Sort key values of the last row of the previous page
+
+    Raises:
+        InvalidCursorError: If the token is malformed or the sort settings differ
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+        cursor_context = payload["c"]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursorError("Invalid cursor")
+
+    if not isinstance(values, list) or cursor_context != context:
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    return values
+
+
+def apply_keyset(stmt: Select, keys: Sequence[Any], values: Sequence[Any], descending: bool) -> Select:
+    """Restrict a statement to rows strictly after the cursor position.
+
+    Args:
+        stmt: Statement ordered by `keys` (all in the same direction)
+        keys: Sort key column expressions, id last
+        values: Sort key values decoded from the cursor
+        descending: True if the statement is ordered descending
+
+    Returns:
+        Statement with the keyset condition applied
+    """
+    if len(values) != len(keys):
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    position = tuple_(*keys)
+    boundary = tuple_(*values)
+    return stmt.where(position < boundary if descending else position > boundary)
+
+
+def next_cursor(rows: Sequence[Sequence[Any]], limit: int, **context: Any) -> Optional[str]:
+    """Build the cursor for the page after `rows`.
+
+    Args:
+        rows: Result rows of the form (entity, *sort key values), fetched with limit + 1
+        limit: Requested page size
+        context: Sort settings to embed into the cursor
+
+    Returns:
+        Cursor token, or None if this was the last page
+    """
+    if limit < 1 or len(rows) <= limit:
+        return None
+    return encode_cursor(rows[limit - 1][1:], **context)
@@ -1,4 +1,9 @@
 """Shared utility functions used across domains."""
+from typing import Iterable
+
+from sqlalchemy import Column, delete, insert, select
+from sqlalchemy.orm import Session
+
 from app import models, schemas
 
 
@@ -11,12 +16,11 @@ def kind_has_insurance(kind: models.Kind) -> bool:
 
 
 def anmeldung_with_insurance_ok(db_anmeldung: models.Anmeldung) -> schemas.Anmeldung:
-    """Build Anmeldung schema with derived insurance status."""
-    kind_dto = None
-    if db_anmeldung.kind:
-        # Explicitly convert ORM model to Pydantic model to ensure it's included
-        kind_dto = schemas.Kind.model_validate(db_anmeldung.kind)
+    """Build Anmeldung schema with derived insurance status.
 
+    Kind and figuren are passed as ORM objects and validated once by the
+    schema (from_attributes) - relationships must be loaded beforehand.
+    """
     return schemas.Anmeldung(
         id=db_anmeldung.id,
         kind_id=db_anmeldung.kind_id,
@@ -27,5 +31,42 @@ def anmeldung_with_insurance_ok(db_anmeldung: models.Anmeldung) -> schemas.Anmel
         status=db_anmeldung.status,
         figuren=db_anmeldung.figuren,
         insurance_ok=kind_has_insurance(db_anmeldung.kind),
-        kind=kind_dto,
+        kind=db_anmeldung.kind,
     )
+
+
+def set_association(
+    db: Session,
+    owner_column: Column,
+    target_column: Column,
+    owner_id: int,
+    target_ids: Iterable[int],
+) -> None:
+    """Make an association table contain exactly the given targets for one owner.
+
+    Computes the difference to the current rows and issues one bulk DELETE
+    and one bulk INSERT, instead of rebuilding the ORM collection. Does not
+    commit; already loaded relationship collections are stale until the
+    session is committed or expired.
+
+    Args:
+        db: Database session
+        owner_column: Owner foreign key column, e.g. anmeldung_figuren.c.anmeldung_id
+        target_column: Target foreign key column of the same table, e.g. anmeldung_figuren.c.figur_id
+        owner_id: ID of the owning row
+        target_ids: Target IDs that should be associated (must exist)
+    """
+    table = owner_column.table
+    wanted = set(target_ids)
+    current = set(db.scalars(select(target_column).where(owner_column == owner_id)))
+
+    removed = current - wanted
+    if removed:
+        db.execute(delete(table).where(owner_column == owner_id, target_column.in_(removed)))
+
+    added = wanted - current
+    if added:
+        db.execute(
+            insert(table),
+            [{owner_column.name: owner_id, target_column.name: target_id} for target_id in sorted(added)]
+        )
@@ -0,0 +1,167 @@
+"""Change counters per table (table_version) for caches and conditional GETs.
+
+Every transaction that writes a tracked table increments the table's counter
+once, in the same transaction - from the flush and from bulk statements issued
+through the session (insert()/update()/delete(), Query.update). Readers
+compare counters instead of the data: the Grunddaten list cache and the ETags
+of the list and detail endpoints.
+
+Counters are read with one query for all tables and reused for
+TABLE_VERSION_CHECK_SECONDS (0 = on every request), per database engine - the
+embedded replica lags behind the primary and must not share its counters.
+The writing process re-reads them right after its commit; other workers
+notice within the interval.
+"""
+import os
+import random
+import threading
+import time
+import weakref
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app import models
+
+TABLE_VERSION_CHECK_SECONDS = float(os.getenv("TABLE_VERSION_CHECK_SECONDS", "5"))
+
+# Counters bumped by writes, per written table
+TRACKED_TABLES = {
+    "saison": ("saison",),
+    "schwimmbad": ("schwimmbad",),
+    "verein": ("verein",),
+    "verband": ("verband",),
+    "versicherung": ("versicherung",),
+    "figur": ("figur",),
+    "wettkampf": ("wettkampf",),
+    "wettkampf_figuren": ("wettkampf",),
+    "kind": ("kind", "verband"),
+    "anmeldung": ("anmeldung",),
+    "anmeldung_figuren": ("anmeldung",),
+}
+
+# Session.info key collecting the tables changed in the current transaction
+_CHANGED_TABLES = "table_versions_changed"
+
+
+def bump_versions_statement(table_names: Iterable[str]):
+    """INSERT ... ON CONFLICT statement incrementing the counters of tables.
+
+    New counters start at a random value, so a recreated database does not
+    repeat the versions (and ETags) clients have seen from the previous one.
+    """
+    version = models.TableVersion
+    return (
+        sqlite_insert(version)
+        .values([
+            {"table_name": name, "version": random.randrange(1, 2**31)}
+            for name in sorted(table_names)
+        ])
+        .on_conflict_do_update(
+            index_elements=[version.table_name],
+            set_={"version": version.version + 1},
+        )
+    )
+
+
+def _changed_tables(obj, is_update: bool) -> Set[str]:
+    tables = set(TRACKED_TABLES.get(getattr(obj, "__tablename__", None), ()))
+    # Verband lists carry nomination counts: a Kind only changes them when
+    # it is added, removed or moved to another Verband
+    if is_update and isinstance(obj, models.Kind) and not inspect(obj).attrs.verband_id.history.has_changes():
+        tables.discard("verband")
+    return tables
+
+
+def _bump(session: Session, tables: Set[str]) -> None:
+    # Readers only see committed counters, so one bump per transaction is enough
+    changed = session.info.setdefault(_CHANGED_TABLES, set())
+    tables = tables - changed
+    if not tables:
+        return
+    session.connection().execute(bump_versions_statement(tables))
+    changed.update(tables)
+
+
+class TableVersions:
+    """Reads the counters per engine, reusing them for check_interval seconds."""
+
+    def __init__(self, check_interval: float = TABLE_VERSION_CHECK_SECONDS):
+        self.check_interval = check_interval
+        # engine -> (checked_at, counters)
+        self._versions: "weakref.WeakKeyDictionary[Engine, Tuple[float, Dict[str, int]]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._listeners: List[Callable[[Set[str]], None]] = []
+        self._lock = threading.Lock()
+
+    def current(self, db: Session) -> Dict[str, int]:
+        """Counters of all tables in the session's database (tables never written are missing, i.e. 0)."""
+        bind = db.get_bind()
+        engine = getattr(bind, "engine", bind)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._versions.get(engine)
+            if entry is not None and now - entry[0] < self.check_interval:
+                return entry[1]
+
+        versions = dict(db.execute(
+            select(models.TableVersion.table_name, models.TableVersion.version)
+        ).all())
+        with self._lock:
+            self._versions[engine] = (now, versions)
+        return versions
+
+    def add_listener(self, listener: Callable[[Set[str]], None]) -> None:
+        """Call listener with the changed tables after each commit of this process."""
+        self._listeners.append(listener)
+
+    def changed(self, tables: Set[str]) -> None:
+        """Re-read the counters on next access and notify the listeners."""
+        with self._lock:
+            self._versions.clear()
+        for listener in self._listeners:
+            listener(tables)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+
+
+table_versions = TableVersions()
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_after_flush(session, flush_context):
+    tables: Set[str] = set()
+    for obj in session.new:
+        tables |= _changed_tables(obj, is_update=False)
+    for obj in session.deleted:
+        tables |= _changed_tables(obj, is_update=False)
+    for obj in session.dirty:
+        if session.is_modified(obj):
+            tables |= _changed_tables(obj, is_update=True)
+    _bump(session, tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_on_bulk_statement(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    _bump(orm_execute_state.session, set(TRACKED_TABLES.get(getattr(table, "name", None), ())))
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_after_commit(session):
+    changed = session.info.pop(_CHANGED_TABLES, None)
+    if changed:
+        table_versions.changed(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session):
+    session.info.pop(_CHANGED_TABLES, None)
@@ -0,0 +1,193 @@
+"""Frontend (SPA) files - index.html and the dist root served from memory.
+
+The built frontend (frontend/dist) does not change while the process runs.
+index.html and the other files in the dist root are read once at startup and
+served with strong ETags, so deep links and refreshes do not touch the
+filesystem. Vite's content-hashed /assets get long-lived immutable
+Cache-Control headers.
+
+Precompressed variants (`app-1a2b.js.br`, `index.html.gz`, created by the
+Docker build) are sent instead of the original if the client accepts the
+encoding.
+"""
+import hashlib
+import logging
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+logger = logging.getLogger(__name__)
+
+# Preferred first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Larger root files are not served (the dist root only holds index.html and icons)
+MAX_CACHED_FILE_SIZE = 1024 * 1024
+
+INDEX_CACHE_CONTROL = "no-cache"
+ROOT_FILE_CACHE_CONTROL = "public, max-age=3600"
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> List[str]:
+    """Encodings of ENCODINGS the client accepts (q=0 excluded), preferred first."""
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        name, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if name and q > 0:
+            accepted.add(name.lower())
+    return [encoding for encoding, _ in ENCODINGS if encoding in accepted or "*" in accepted]
+
+
+def _strong_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+@dataclass(frozen=True)
+class CachedFile:
+    """A file of the dist root with its precompressed variants."""
+
+    body: bytes
+    media_type: str
+    etag: str
+    cache_control: str
+    variants: Dict[str, bytes] = field(default_factory=dict)
+
+    def response(self, request_headers: Mapping[str, str]) -> Response:
+        """Response for a request - 304, a precompressed variant or the original."""
+        encoding = next(
+            (e for e in accepted_encodings(request_headers.get("accept-encoding")) if e in self.variants),
+            None,
+        )
+        etag = self.etag if encoding is None else f'{self.etag[:-1]}-{encoding}"'
+        headers = {"ETag": etag, "Cache-Control": self.cache_control}
+        if self.variants:
+            headers["Vary"] = "Accept-Encoding"
+
+        # Weak comparison - CompressionMiddleware weakens the ETags of bodies it compresses
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match and (
+            if_none_match.strip() == "*"
+            or etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        ):
+            return Response(status_code=304, headers=headers)
+
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+            return Response(self.variants[encoding], media_type=self.media_type, headers=headers)
+        return Response(self.body, media_type=self.media_type, headers=headers)
+
+
+class SpaFiles:
+    """index.html and the other dist root files, loaded once."""
+
+    def __init__(self, dist_dir: str):
+        self.dist_dir = dist_dir
+        self._files: Dict[str, CachedFile] = {}
+
+    def load(self) -> bool:
+        """Read the dist root into memory.
+
+        Returns:
+            True if index.html was found
+        """
+        files: Dict[str, CachedFile] = {}
+        if os.path.isdir(self.dist_dir):
+            names = set(os.listdir(self.dist_dir))
+            variant_suffixes = tuple(suffix for _, suffix in ENCODINGS)
+            for name in sorted(names):
+                path = os.path.join(self.dist_dir, name)
+                if name.endswith(variant_suffixes) or not os.path.isfile(path):
+                    continue
+                if os.path.getsize(path) > MAX_CACHED_FILE_SIZE:
+                    logger.warning(f"⚠️  {name} is too large to be cached, not served")
+                    continue
+                with open(path, "rb") as f:
+                    body = f.read()
+                variants = {}
+                for encoding, suffix in ENCODINGS:
+                    if name + suffix in names:
+                        with open(path + suffix, "rb") as f:
+                            variants[encoding] = f.read()
+                files[name] = CachedFile(
+                    body=body,
+                    media_type=mimetypes.guess_type(name)[0] or "application/octet-stream",
+                    etag=_strong_etag(body),
+                    cache_control=INDEX_CACHE_CONTROL if name == "index.html" else ROOT_FILE_CACHE_CONTROL,
+                    variants=variants,
+                )
+        self._files = files
+        return "index.html" in files
+
+    @property
+    def index(self) -> Optional[CachedFile]:
+        return self._files.get("index.html")
+
+    def get(self, name: str) -> Optional[CachedFile]:
+        """A root file by name (no subdirectories, so no path traversal)."""
+        return self._files.get(name)
+
+
+class AssetFiles(StaticFiles):
+    """StaticFiles for content-hashed assets: immutable, precompressed variants.
+
+    Which variants exist is collected once at startup, so requests for files
+    without a variant cost no extra lookup.
+    """
+
+    def __init__(self, directory: str, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self._variants: Dict[str, List[str]] = {}
+        for root, _, names in os.walk(directory):
+            for name in names:
+                for encoding, suffix in ENCODINGS:
+                    if name.endswith(suffix):
+                        original = os.path.relpath(os.path.join(root, name[: -len(suffix)]), directory)
+                        self._variants.setdefault(original, []).append(encoding)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await self._variant_response(path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = ASSET_CACHE_CONTROL
+            if os.path.normpath(path) in self._variants:
+                response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    async def _variant_response(self, path: str, scope: Scope) -> Optional[Response]:
+        available = self._variants.get(os.path.normpath(path))
+        if not available or scope["method"] not in ("GET", "HEAD"):
+            return None
+        request_headers = Headers(scope=scope)
+        encoding = next((e for e in accepted_encodings(request_headers.get("accept-encoding")) if e in available), None)
+        if encoding is None:
+            return None
+
+        suffix = dict(ENCODINGS)[encoding]
+        full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+        if stat_result is None:
+            return None
+        response = FileResponse(
+            full_path,
+            stat_result=stat_result,
+            media_type=mimetypes.guess_type(path)[0] or "application/octet-stream",
+            headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,187 @@
+"""Background sampler behind the public status overview (/api/status).
+
+The documentation dashboard polls /api/status. Probing the database there
+meant a write transaction and full-table counts per visitor; instead a
+background task samples every STATUS_SAMPLE_INTERVAL seconds, keeps the last
+STATUS_SAMPLE_HISTORY latencies in ring buffers and the endpoint serves the
+latest snapshot from memory. The first sample is taken by the app lifespan
+before requests are served; the endpoint itself never probes.
+"""
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+STATUS_SAMPLE_INTERVAL = float(os.getenv("STATUS_SAMPLE_INTERVAL", "60"))  # seconds
+STATUS_SAMPLE_HISTORY = int(os.getenv("STATUS_SAMPLE_HISTORY", "120"))  # samples per ring buffer
+
+# Rows kept in the performance_probe table
+PROBE_ROWS = 10000
+
+# Relative change of the recent half of the samples against the older half
+# below which the trend counts as stable
+TREND_THRESHOLD = 0.1
+
+LATENCY_KINDS = ("health", "write", "read")
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile (p in 0..100) of a list of values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * p / 100))
+    return ordered[rank - 1]
+
+
+def trend(values: List[float]) -> Optional[str]:
+    """Compare the newer half of the samples with the older one."""
+    if len(values) < 4:
+        return None
+    half = len(values) // 2
+    older = sum(values[:half]) / half
+    newer = sum(values[-half:]) / half
+    if older == 0:
+        return "stable"
+    change = (newer - older) / older
+    if change > TREND_THRESHOLD:
+        return "rising"
+    if change < -TREND_THRESHOLD:
+        return "falling"
+    return "stable"
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+class StatusSampler:
+    """Samples database latency and sizes, keeps the history in ring buffers."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        history: int = STATUS_SAMPLE_HISTORY,
+    ):
+        # Defaults to app.database.SessionLocal, resolved on first sample
+        self.session_factory = session_factory
+        self._latencies: Dict[str, Deque[float]] = {kind: deque(maxlen=history) for kind in LATENCY_KINDS}
+        self._snapshot: Optional[dict] = None
+        self._probe_table_ready = False
+        self._lock = threading.Lock()
+        # One probe at a time - it writes to the database
+        self._sample_lock = threading.Lock()
+
+    def _probe(self, db: Session) -> dict:
+        if not self._probe_table_ready:
+            db.execute(text(
+                "CREATE TABLE IF NOT EXISTS performance_probe ("
+                "id INTEGER PRIMARY KEY, "
+                "created_at TEXT NOT NULL, "
+                "payload TEXT)"
+            ))
+            db.commit()
+            self._probe_table_ready = True
+
+        start = time.perf_counter()
+        db.execute(text("SELECT 1"))
+        health_ms = _elapsed_ms(start)
+
+        start = time.perf_counter()
+        probe_id = db.execute(
+            text("INSERT INTO performance_probe (created_at, payload) VALUES (:created_at, :payload)"),
+            {"created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "payload": "probe"},
+        ).lastrowid
+        db.commit()
+        write_ms = _elapsed_ms(start)
+
+        start = time.perf_counter()
+        probe_rows = db.execute(text("SELECT count(*) FROM performance_probe")).scalar() or 0
+        read_ms = _elapsed_ms(start)
+
+        if probe_rows > PROBE_ROWS and probe_id is not None:
+            # ids are ascending, so this keeps the newest PROBE_ROWS rows
+            db.execute(text("DELETE FROM performance_probe WHERE id <= :cutoff"), {"cutoff": probe_id - PROBE_ROWS})
+            db.commit()
+            probe_rows = min(probe_rows, PROBE_ROWS)
+
+        return {
+            "latency_ms": {"health": health_ms, "write": write_ms, "read": read_ms},
+            "performance_rows": probe_rows,
+            "table_count": db.execute(text(
+                "SELECT count(*) FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+            )).scalar() or 0,
+            "size_bytes": (db.execute(text("PRAGMA page_count")).scalar() or 0)
+            * (db.execute(text("PRAGMA page_size")).scalar() or 0),
+            "counts": {
+                "users": db.scalar(select(func.count()).select_from(models.User)),
+                "kind": db.scalar(select(func.count()).select_from(models.Kind)),
+                "anmeldung": db.scalar(select(func.count()).select_from(models.Anmeldung)),
+                "wettkampf": db.scalar(select(func.count()).select_from(models.Wettkampf)),
+            },
+        }
+
+    def sample(self) -> Optional[dict]:
+        """Take one sample and return the new snapshot (the previous one on failure)."""
+        session_factory = self.session_factory
+        if session_factory is None:
+            from app.database import SessionLocal
+            session_factory = SessionLocal
+
+        try:
+            with self._sample_lock, session_factory() as db:
+                probe = self._probe(db)
+        except Exception as e:
+            logger.warning(f"⚠️  Status sample failed: {e}")
+            with self._lock:
+                return self._snapshot
+
+        with self._lock:
+            for kind, value in probe["latency_ms"].items():
+                self._latencies[kind].append(value)
+            probe["latency"] = {
+                kind: {
+                    "p50": percentile(list(values), 50),
+                    "p95": percentile(list(values), 95),
+                    "p99": percentile(list(values), 99),
+                    "trend": trend(list(values)),
+                    "samples": len(values),
+                }
+                for kind, values in self._latencies.items()
+            }
+            probe["sampled_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            self._snapshot = probe
+            return probe
+
+    def snapshot(self) -> Optional[dict]:
+        """The latest snapshot, or None before the first sample."""
+        with self._lock:
+            return self._snapshot
+
+    def clear(self) -> None:
+        """Drop the history and the snapshot."""
+        with self._lock:
+            for values in self._latencies.values():
+                values.clear()
+            self._snapshot = None
+            self._probe_table_ready = False
+
+    async def run(self, interval: float = STATUS_SAMPLE_INTERVAL) -> None:
+        """Sample periodically until cancelled (started by the app lifespan)."""
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(self.sample)
+
+
+status_sampler = StatusSampler()
@@ -3,20 +3,34 @@ TOTP (Time-based One-Time Password) utility functions for 2FA.
 Compatible with Google Authenticator, Authy, Microsoft Authenticator.
 """
 import pyotp
-import qrcode
-import io
+import asyncio
 import base64
 import json
+import hmac
+import hashlib
+import os
 import secrets
+import threading
+import time
 from passlib.context import CryptContext
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from app.hashing import hash_pool
 
 # Password context for hashing backup codes
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Server secret for the keyed backup code identifiers
+BACKUP_CODE_SECRET = os.getenv("BACKUP_CODE_SECRET") or os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
+
 # TOTP Configuration
 TOTP_ISSUER = "Aquarius Admin"
 
+# Rendered QR codes per (secret, username) - a setup session rarely takes longer
+QR_CODE_CACHE_SECONDS = 600
+_qr_code_cache: Dict[Tuple[str, str], Tuple[float, bytes]] = {}
+_qr_code_lock = threading.Lock()
+
 
 def generate_totp_secret() -> str:
     """
@@ -28,17 +42,30 @@ def generate_totp_secret() -> str:
     return pyotp.random_base32()
 
 
-def generate_qr_code(secret: str, username: str) -> str:
+def render_qr_code_svg(secret: str, username: str) -> bytes:
     """
-    Generate a QR code for TOTP setup.
+    Render the provisioning QR code as SVG (cached per secret and username).
+
+    qrcode (which pulls in Pillow) is imported on first use, so cold starts and
+    ordinary requests do not pay for it. SVG needs no raster encoding.
 
     Args:
         secret: The TOTP secret (base32)
         username: Username for the account
 
     Returns:
-        str: Base64 encoded PNG image
+        bytes: SVG document
     """
+    key = (secret, username)
+    now = time.monotonic()
+    with _qr_code_lock:
+        cached = _qr_code_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+    import qrcode
+    import qrcode.image.svg
+
     # Create TOTP URI for Google Authenticator
     totp = pyotp.TOTP(secret)
     uri = totp.provisioning_uri(
@@ -46,26 +73,50 @@ def generate_qr_code(secret: str, username: str) -> str:
         issuer_name=TOTP_ISSUER
     )
 
-    # Generate QR code
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
         box_size=10,
         border=4,
+        image_factory=qrcode.image.svg.SvgPathImage,
     )
     qr.add_data(uri)
     qr.make(fit=True)
+    svg = qr.make_image().to_string()
 
-    # Create image
-    img = qr.make_image(fill_color="black", back_color="white")
+    with _qr_code_lock:
+        # Drop expired setup sessions while we are here
+        for expired in [k for k, (until, _) in _qr_code_cache.items() if until <= now]:
+            del _qr_code_cache[expired]
+        _qr_code_cache[key] = (now + QR_CODE_CACHE_SECONDS, svg)
+    return svg
 
-    # Convert to base64
-    buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
-    buffer.seek(0)
-    img_base64 = base64.b64encode(buffer.getvalue()).decode()
 
-    return f"data:image/png;base64,{img_base64}"
+def generate_qr_code(secret: str, username: str) -> str:
+    """
+    Generate a QR code for TOTP setup.
+
+    Args:
+        secret: The TOTP secret (base32)
+        username: Username for the account
+
+    Returns:
+        str: Data URL of the SVG image
+    """
+    svg_base64 = base64.b64encode(render_qr_code_svg(secret, username)).decode()
+    return f"data:image/svg+xml;base64,{svg_base64}"
+
+
+async def generate_qr_code_async(secret: str, username: str) -> str:
+    """generate_qr_code in a worker thread - use this in async endpoints."""
+    return await asyncio.to_thread(generate_qr_code, secret, username)
+
+
+def forget_qr_code(secret: str) -> None:
+    """Drop the cached QR codes of a secret (setup finished or cancelled)."""
+    with _qr_code_lock:
+        for key in [k for k in _qr_code_cache if k[0] == secret]:
+            del _qr_code_cache[key]
 
 
 def verify_totp_code(secret: str, code: str) -> bool:
@@ -105,6 +156,23 @@ def generate_backup_codes(count: int = 10) -> List[str]:
     return codes
 
 
+def backup_code_id(code: str) -> str:
+    """
+    Keyed identifier of a backup code (HMAC-SHA256 with the server secret).
+
+    Stored next to the bcrypt hash so verification can pick the one matching
+    entry instead of running bcrypt against every stored code.
+
+    Args:
+        code: Plain text backup code
+
+    Returns:
+        str: Hex identifier (64 bits)
+    """
+    digest = hmac.new(BACKUP_CODE_SECRET.encode(), code.strip().upper().encode(), hashlib.sha256)
+    return digest.hexdigest()[:16]
+
+
 def hash_backup_codes(codes: List[str]) -> str:
     """
     Hash backup codes for secure storage.
@@ -113,19 +181,47 @@ def hash_backup_codes(codes: List[str]) -> str:
         codes: List of plain text backup codes
 
     Returns:
-        str: JSON string of hashed codes
+        str: JSON string of {"id": keyed identifier, "hash": bcrypt hash} entries
     """
     hashed = []
     for code in codes:
-        hashed_code = pwd_context.hash(code)
-        hashed.append(hashed_code)
+        hashed.append({"id": backup_code_id(code), "hash": pwd_context.hash(code.strip().upper())})
     return json.dumps(hashed)
 
 
+def upgrade_backup_codes(hashed_codes_json: str) -> Optional[str]:
+    """
+    Convert a legacy list of bare bcrypt hashes to the entry format.
+
+    The identifier of a legacy code cannot be derived from its hash, so such
+    entries get "id": null and are still verified by trying each of them.
+    They disappear once the user generates new codes.
+
+    Args:
+        hashed_codes_json: JSON string of hashed backup codes
+
+    Returns:
+        Optional[str]: Converted JSON, or None if nothing had to change
+    """
+    try:
+        hashed_codes = json.loads(hashed_codes_json)
+    except (json.JSONDecodeError, TypeError):
+        return None
+    if not any(isinstance(entry, str) for entry in hashed_codes):
+        return None
+    return json.dumps([
+        {"id": None, "hash": entry} if isinstance(entry, str) else entry
+        for entry in hashed_codes
+    ])
+
+
 def verify_backup_code(hashed_codes_json: str, code: str) -> Tuple[bool, str]:
     """
     Verify a backup code and return updated list if valid.
 
+    The keyed identifier selects the candidate entry, so a code costs at most
+    one bcrypt round (plus one per legacy entry without identifier).
+
     Args:
         hashed_codes_json: JSON string of hashed backup codes
         code: Plain text backup code to verify
@@ -138,9 +234,15 @@ def verify_backup_code(hashed_codes_json: str, code: str) -> Tuple[bool, str]:
     except (json.JSONDecodeError, TypeError):
         return False, hashed_codes_json
 
-    # Check each hashed code
-    for i, hashed_code in enumerate(hashed_codes):
-        if pwd_context.verify(code, hashed_code):
+    code = code.strip().upper()
+    code_id = backup_code_id(code)
+
+    for i, entry in enumerate(hashed_codes):
+        if isinstance(entry, str):
+            entry = {"id": None, "hash": entry}
+        if entry["id"] is not None and not hmac.compare_digest(entry["id"], code_id):
+            continue
+        if pwd_context.verify(code, entry["hash"]):
             # Valid code found - remove it (one-time use)
             hashed_codes.pop(i)
             updated_json = json.dumps(hashed_codes)
@@ -149,6 +251,16 @@ def verify_backup_code(hashed_codes_json: str, code: str) -> Tuple[bool, str]:
     return False, hashed_codes_json
 
 
+async def hash_backup_codes_async(codes: List[str]) -> str:
+    """hash_backup_codes on the hash pool - use this in async endpoints."""
+    return await hash_pool.run(hash_backup_codes, codes)
+
+
+async def verify_backup_code_async(hashed_codes_json: str, code: str) -> Tuple[bool, str]:
+    """verify_backup_code on the hash pool - use this in async endpoints."""
+    return await hash_pool.run(verify_backup_code, hashed_codes_json, code)
+
+
 def get_remaining_backup_codes_count(hashed_codes_json: str) -> int:
     """
     Get count of remaining backup codes.
@@ -1,8 +1,74 @@
 """Wettkampf (Competition) Repository - Data access layer for Wettkampf domain."""
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Boolean, select, type_coerce
+from sqlalchemy.sql import Select
+from typing import Any, List, Optional, Sequence
 
 from app import models
+from app.grunddaten.repository import FigurRepository
+from app.kind.repository import insurance_ok_expression
+from app.shared.utils import set_association
+
+
+# Loading plan for the details response: the many-to-ones of the Wettkampf are
+# joined (one row), every collection gets its own SELECT ... IN so registrations
+# are not multiplied by figures. Kind and its many-to-ones ride along with the
+# anmeldungen query.
+WETTKAMPF_DETAILS_EAGER_LOADS = (
+    joinedload(models.Wettkampf.saison),
+    joinedload(models.Wettkampf.schwimmbad),
+    selectinload(models.Wettkampf.figuren),
+    selectinload(models.Wettkampf.anmeldungen).selectinload(models.Anmeldung.figuren),
+    selectinload(models.Wettkampf.anmeldungen).joinedload(models.Anmeldung.kind).joinedload(models.Kind.verein),
+    selectinload(models.Wettkampf.anmeldungen).joinedload(models.Anmeldung.kind).joinedload(models.Kind.verband),
+    selectinload(models.Wettkampf.anmeldungen).joinedload(models.Anmeldung.kind).joinedload(models.Kind.versicherung),
+)
+
+# Columns available for the compact details projection (?fields=...)
+PROJECTION_FIELDS = {
+    "id": models.Anmeldung.id,
+    "startnummer": models.Anmeldung.startnummer,
+    "status": models.Anmeldung.status,
+    "vorlaeufig": models.Anmeldung.vorlaeufig,
+    "anmeldedatum": models.Anmeldung.anmeldedatum,
+    "kind_id": models.Anmeldung.kind_id,
+    "vorname": models.Kind.vorname,
+    "nachname": models.Kind.nachname,
+    "geburtsdatum": models.Kind.geburtsdatum,
+    "geschlecht": models.Kind.geschlecht,
+    "verein": models.Verein.name,
+    "insurance_ok": type_coerce(insurance_ok_expression(), Boolean),
+}
+
+
+def build_projection_statement(wettkampf_id: int, fields: Sequence[str]) -> Select:
+    """Build a column-only SELECT of the requested fields for all Anmeldungen of a Wettkampf.
+
+    Args:
+        wettkampf_id: ID of the Wettkampf
+        fields: Names from PROJECTION_FIELDS, in output order
+
+    Returns:
+        Statement yielding one tuple per Anmeldung, ordered by startnummer
+
+    Raises:
+        ValueError: If a field name is unknown
+    """
+    unknown = [f for f in fields if f not in PROJECTION_FIELDS]
+    if unknown or not fields:
+        raise ValueError(
+            f"Unknown fields: {', '.join(unknown) or '(none given)'}. "
+            f"Available: {', '.join(PROJECTION_FIELDS)}"
+        )
+    return (
+        select(*(PROJECTION_FIELDS[f] for f in fields))
+        .select_from(models.Anmeldung)
+        .join(models.Kind, models.Anmeldung.kind_id == models.Kind.id)
+        .outerjoin(models.Verein, models.Kind.verein_id == models.Verein.id)
+        .where(models.Anmeldung.wettkampf_id == wettkampf_id)
+        .order_by(models.Anmeldung.startnummer, models.Anmeldung.id)
+    )
 
 
 class WettkampfRepository:
@@ -24,3 +90,111 @@ class WettkampfRepository:
         return self.db.query(models.Wettkampf).filter(
             models.Wettkampf.id == wettkampf_id
         ).first()
+
+    def set_figuren(self, wettkampf_id: int, figur_ids: List[int]) -> None:
+        """Set the allowed Figuren of a competition at once.
+
+        Only the difference to the current Figuren is written (see
+        set_association); unknown Figur IDs are ignored.
+
+        Args:
+            wettkampf_id: ID of the Wettkampf
+            figur_ids: List of Figur IDs to set
+        """
+        set_association(
+            self.db,
+            models.wettkampf_figur_association.c.wettkampf_id,
+            models.wettkampf_figur_association.c.figur_id,
+            wettkampf_id,
+            FigurRepository(self.db).existing_ids(figur_ids)
+        )
+        self.db.commit()
+
+    def get_with_details(self, wettkampf_id: int) -> Optional[models.Wettkampf]:
+        """Get a Wettkampf with figures, season, pool and all registrations.
+
+        Uses WETTKAMPF_DETAILS_EAGER_LOADS - a constant number of queries,
+        regardless of the number of registrations.
+
+        Args:
+            wettkampf_id: ID of the Wettkampf to retrieve
+
+        Returns:
+            Wettkampf model instance with eager-loaded relationships if found, None otherwise
+        """
+        return self.db.query(models.Wettkampf).options(
+            *WETTKAMPF_DETAILS_EAGER_LOADS
+        ).filter(models.Wettkampf.id == wettkampf_id).first()
+
+    def project_anmeldungen(self, wettkampf_id: int, fields: Sequence[str]) -> List[tuple[Any, ...]]:
+        """Get selected columns of all registrations of a Wettkampf as flat tuples.
+
+        Args:
+            wettkampf_id: ID of the Wettkampf
+            fields: Names from PROJECTION_FIELDS
+
+        Returns:
+            One tuple per Anmeldung with the values in the order of `fields`
+
+        Raises:
+            ValueError: If a field name is unknown
+        """
+        return [tuple(row) for row in self.db.execute(build_projection_statement(wettkampf_id, fields))]
+
+
+class AsyncWettkampfRepository:
+    """Async repository for the Wettkampf read paths (ENABLE_ASYNC_DB)."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize repository with async database session."""
+        self.db = db
+
+    async def get(self, wettkampf_id: int) -> Optional[models.Wettkampf]:
+        """Get a Wettkampf by ID.
+
+        Args:
+            wettkampf_id: ID of the Wettkampf to retrieve
+
+        Returns:
+            Wettkampf model instance if found, None otherwise
+        """
+        return await self.db.get(models.Wettkampf, wettkampf_id)
+
+    async def list(self, skip: int = 0, limit: int = 100) -> List[models.Wettkampf]:
+        """List all Wettkämpfe with pagination.
+
+        Args:
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+
+        Returns:
+            List of Wettkampf instances
+        """
+        result = await self.db.scalars(
+            select(models.Wettkampf).order_by(models.Wettkampf.id).offset(skip).limit(limit)
+        )
+        return list(result.all())
+
+    async def get_with_details(self, wettkampf_id: int) -> Optional[models.Wettkampf]:
+        """Get a Wettkampf with figures, season, pool and all registrations.
+
+        Async sessions cannot lazy-load, so the whole object graph used by the
+        details response is loaded up front (WETTKAMPF_DETAILS_EAGER_LOADS).
+
+        Args:
+            wettkampf_id: ID of the Wettkampf to retrieve
+
+        Returns:
+            Wettkampf model instance with eager-loaded relationships if found, None otherwise
+        """
+        result = await self.db.scalars(
+            select(models.Wettkampf)
+            .options(*WETTKAMPF_DETAILS_EAGER_LOADS)
+            .where(models.Wettkampf.id == wettkampf_id)
+        )
+        return result.unique().first()
+
+    async def project_anmeldungen(self, wettkampf_id: int, fields: Sequence[str]) -> List[tuple[Any, ...]]:
+        """Async variant of WettkampfRepository.project_anmeldungen."""
+        result = await self.db.execute(build_projection_statement(wettkampf_id, fields))
+        return [tuple(row) for row in result]
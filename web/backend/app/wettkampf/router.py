@@ -1,15 +1,68 @@
 """Wettkampf (Competition) API Router."""
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
-from typing import List
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Union
 
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db, get_read_db, get_async_db
 from app import models, schemas, auth
 from app.wettkampf import schemas as wettkampf_schemas
+from app.wettkampf.repository import WettkampfRepository, AsyncWettkampfRepository
+from app.shared.conditional import ConditionalGet
 from app.shared.utils import anmeldung_with_insurance_ok
 
 router = APIRouter(prefix="/api", tags=["wettkampf"])
 
+# Async variants of the hot read endpoints (see app.kind.router.async_router)
+async_router = APIRouter(prefix="/api", tags=["wettkampf"], include_in_schema=False)
+
+
+def build_wettkampf_details(wettkampf: models.Wettkampf) -> wettkampf_schemas.WettkampfWithDetails:
+    """Build the details response from a Wettkampf and its loaded relationships."""
+    return wettkampf_schemas.WettkampfWithDetails(
+        id=wettkampf.id,
+        name=wettkampf.name,
+        datum=wettkampf.datum,
+        max_teilnehmer=wettkampf.max_teilnehmer,
+        saison_id=wettkampf.saison_id,
+        schwimmbad_id=wettkampf.schwimmbad_id,
+        figuren=wettkampf.figuren,
+        anmeldungen=[anmeldung_with_insurance_ok(a) for a in wettkampf.anmeldungen],
+        saison=wettkampf.saison,
+        schwimmbad=wettkampf.schwimmbad,
+    )
+
+
+def build_wettkampf_projection(
+    wettkampf: models.Wettkampf, fields: List[str], rows: List[tuple]
+) -> wettkampf_schemas.WettkampfDetailsProjection:
+    """Build the compact details response from the projected Anmeldung rows."""
+    return wettkampf_schemas.WettkampfDetailsProjection(
+        id=wettkampf.id,
+        name=wettkampf.name,
+        datum=wettkampf.datum,
+        max_teilnehmer=wettkampf.max_teilnehmer,
+        saison_id=wettkampf.saison_id,
+        schwimmbad_id=wettkampf.schwimmbad_id,
+        fields=fields,
+        anmeldungen=rows,
+    )
+
+
+# Details embed Saison, Schwimmbad, Figuren and the Anmeldungen with their Kind
+DETAILS_TABLES = (
+    "wettkampf", "saison", "schwimmbad", "figur", "anmeldung", "kind", "verein", "verband", "versicherung"
+)
+details_etag = ConditionalGet(*DETAILS_TABLES)
+# The async endpoint reads from the primary
+async_details_etag = ConditionalGet(*DETAILS_TABLES, primary=True)
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Split the comma-separated ?fields= parameter."""
+    return [f.strip() for f in fields.split(",") if f.strip()] if fields else []
+
 
 # ============================================================================
 # WETTKAMPF CRUD ENDPOINTS
@@ -19,8 +72,8 @@ router = APIRouter(prefix="/api", tags=["wettkampf"])
 def list_wettkampf(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    db: Session = Depends(get_read_db),
+    current_user: auth.Principal = Depends(auth.require_app_read_permission)
 ):
     """Get list of all competitions."""
     return db.query(models.Wettkampf).offset(skip).limit(limit).all()
@@ -30,7 +83,7 @@ def list_wettkampf(
 def get_wettkampf(
     wettkampf_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    current_user: auth.Principal = Depends(auth.require_app_read_permission)
 ):
     """Get a specific competition by ID."""
     wettkampf = db.query(models.Wettkampf).filter(models.Wettkampf.id == wettkampf_id).first()
@@ -43,7 +96,7 @@ def get_wettkampf(
 def create_wettkampf(
     wettkampf: wettkampf_schemas.WettkampfCreate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Create a new competition."""
     db_wettkampf = models.Wettkampf(**wettkampf.model_dump())
@@ -58,7 +111,7 @@ def update_wettkampf(
     wettkampf_id: int,
     wettkampf: wettkampf_schemas.WettkampfUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Update a competition."""
     db_wettkampf = db.query(models.Wettkampf).filter(models.Wettkampf.id == wettkampf_id).first()
@@ -77,7 +130,7 @@ def update_wettkampf(
 def delete_wettkampf(
     wettkampf_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Delete a competition."""
     db_wettkampf = db.query(models.Wettkampf).filter(models.Wettkampf.id == wettkampf_id).first()
@@ -93,30 +146,38 @@ def delete_wettkampf(
 # WETTKAMPF SPECIAL ENDPOINTS
 # ============================================================================
 
-@router.get("/wettkampf/{wettkampf_id}/details", response_model=wettkampf_schemas.WettkampfWithDetails)
+@router.get(
+    "/wettkampf/{wettkampf_id}/details",
+    response_model=Union[wettkampf_schemas.WettkampfWithDetails, wettkampf_schemas.WettkampfDetailsProjection]
+)
 def get_wettkampf_with_details(
     wettkampf_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_read_permission)
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: auth.Principal = Depends(auth.require_app_read_permission),
+    etag: Dict[str, str] = Depends(details_etag)
 ):
-    """Get competition with all figures and registrations."""
-    wettkampf = db.query(models.Wettkampf).options(
-        joinedload(models.Wettkampf.anmeldungen).joinedload(models.Anmeldung.kind)
-    ).filter(models.Wettkampf.id == wettkampf_id).first()
+    """Get competition with all figures and registrations.
+
+    With `fields` (e.g. `?fields=startnummer,vorname,nachname,insurance_ok`) only
+    those registration columns are returned, as one flat row per registration.
+    """
+    repo = WettkampfRepository(db)
+    field_names = parse_fields(fields)
+    if field_names:
+        wettkampf = repo.get(wettkampf_id)
+        if not wettkampf:
+            raise HTTPException(status_code=404, detail="Wettkampf not found")
+        try:
+            rows = repo.project_anmeldungen(wettkampf_id, field_names)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return build_wettkampf_projection(wettkampf, field_names, rows)
+
+    wettkampf = repo.get_with_details(wettkampf_id)
     if not wettkampf:
         raise HTTPException(status_code=404, detail="Wettkampf not found")
-    return wettkampf_schemas.WettkampfWithDetails(
-        id=wettkampf.id,
-        name=wettkampf.name,
-        datum=wettkampf.datum,
-        max_teilnehmer=wettkampf.max_teilnehmer,
-        saison_id=wettkampf.saison_id,
-        schwimmbad_id=wettkampf.schwimmbad_id,
-        figuren=wettkampf.figuren,
-        anmeldungen=[anmeldung_with_insurance_ok(a) for a in wettkampf.anmeldungen],
-        saison=wettkampf.saison,
-        schwimmbad=wettkampf.schwimmbad,
-    )
+    return build_wettkampf_details(wettkampf)
 
 
 @router.post("/wettkampf/{wettkampf_id}/figuren/{figur_id}", status_code=201)
@@ -124,7 +185,7 @@ def add_figur_to_wettkampf(
     wettkampf_id: int,
     figur_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Add a figure to the competition's allowed figures."""
     wettkampf = db.query(models.Wettkampf).filter(models.Wettkampf.id == wettkampf_id).first()
@@ -147,7 +208,7 @@ def remove_figur_from_wettkampf(
     wettkampf_id: int,
     figur_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Remove a figure from the competition's allowed figures."""
     wettkampf = db.query(models.Wettkampf).filter(models.Wettkampf.id == wettkampf_id).first()
@@ -170,21 +231,70 @@ def set_wettkampf_figuren(
     wettkampf_id: int,
     figur_ids: List[int],
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.require_app_write_permission)
+    current_user: auth.Principal = Depends(auth.require_app_write_permission)
 ):
     """Set all allowed figures for a competition at once."""
-    wettkampf = db.query(models.Wettkampf).filter(models.Wettkampf.id == wettkampf_id).first()
-    if not wettkampf:
+    repo = WettkampfRepository(db)
+    if not repo.get(wettkampf_id):
         raise HTTPException(status_code=404, detail="Wettkampf not found")
 
-    # Clear existing figures
-    wettkampf.figuren.clear()
+    repo.set_figuren(wettkampf_id, figur_ids)
+    return {"message": f"{len(figur_ids)} figures set for Wettkampf"}
 
-    # Add new figures
-    for figur_id in figur_ids:
-        figur = db.query(models.Figur).filter(models.Figur.id == figur_id).first()
-        if figur:
-            wettkampf.figuren.append(figur)
 
-    db.commit()
-    return {"message": f"{len(figur_ids)} figures set for Wettkampf"}
+# ============================================================================
+# ASYNC READ ENDPOINTS (ENABLE_ASYNC_DB)
+# ============================================================================
+
+@async_router.get("/wettkampf", response_model=List[wettkampf_schemas.Wettkampf])
+async def list_wettkampf_async(
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: auth.Principal = Depends(auth.require_app_read_permission_async)
+):
+    """Async variant of list_wettkampf."""
+    return await AsyncWettkampfRepository(db).list(skip=skip, limit=limit)
+
+
+@async_router.get("/wettkampf/{wettkampf_id}", response_model=wettkampf_schemas.Wettkampf)
+async def get_wettkampf_async(
+    wettkampf_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: auth.Principal = Depends(auth.require_app_read_permission_async)
+):
+    """Async variant of get_wettkampf."""
+    wettkampf = await AsyncWettkampfRepository(db).get(wettkampf_id)
+    if not wettkampf:
+        raise HTTPException(status_code=404, detail="Wettkampf not found")
+    return wettkampf
+
+
+@async_router.get(
+    "/wettkampf/{wettkampf_id}/details",
+    response_model=Union[wettkampf_schemas.WettkampfWithDetails, wettkampf_schemas.WettkampfDetailsProjection]
+)
+async def get_wettkampf_with_details_async(
+    wettkampf_id: int,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: auth.Principal = Depends(auth.require_app_read_permission_async),
+    etag: Dict[str, str] = Depends(async_details_etag)
+):
+    """Async variant of get_wettkampf_with_details."""
+    repo = AsyncWettkampfRepository(db)
+    field_names = parse_fields(fields)
+    if field_names:
+        wettkampf = await repo.get(wettkampf_id)
+        if not wettkampf:
+            raise HTTPException(status_code=404, detail="Wettkampf not found")
+        try:
+            rows = await repo.project_anmeldungen(wettkampf_id, field_names)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return build_wettkampf_projection(wettkampf, field_names, rows)
+
+    wettkampf = await repo.get_with_details(wettkampf_id)
+    if not wettkampf:
+        raise HTTPException(status_code=404, detail="Wettkampf not found")
+    return build_wettkampf_details(wettkampf)
@@ -1,6 +1,6 @@
 """Wettkampf (Competition) domain schemas."""
 from datetime import date
-from typing import List, Optional, TYPE_CHECKING
+from typing import Any, List, Optional, TYPE_CHECKING
 from pydantic import BaseModel, ConfigDict
 
 if TYPE_CHECKING:
@@ -36,3 +36,9 @@ class WettkampfWithDetails(Wettkampf):
     anmeldungen: List["Anmeldung"] = []
     saison: Optional["Saison"] = None
     schwimmbad: Optional["Schwimmbad"] = None
+
+
+# Compact details (?fields=...): one flat row per Anmeldung instead of nested objects
+class WettkampfDetailsProjection(Wettkampf):
+    fields: List[str]
+    anmeldungen: List[List[Any]] = []
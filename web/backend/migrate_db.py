@@ -5,6 +5,7 @@ This handles schema changes without dropping existing data.
 import os
 from sqlalchemy import text, inspect
 from app.database import SessionLocal, engine
+from app.totp import upgrade_backup_codes
 
 def column_exists(table_name: str, column_name: str) -> bool:
     """Check if a column exists in a table."""
@@ -12,6 +13,11 @@ def column_exists(table_name: str, column_name: str) -> bool:
     columns = [col['name'] for col in inspector.get_columns(table_name)]
     return column_name in columns
 
+def index_exists(table_name: str, index_name: str) -> bool:
+    """Check if an index exists on a table."""
+    inspector = inspect(engine)
+    return index_name in [idx['name'] for idx in inspector.get_indexes(table_name)]
+
 def run_migration():
     """Run database migrations for new fields."""
     db = SessionLocal()
@@ -57,6 +63,45 @@ def run_migration():
         else:
             print("\n⏭️  'min_alter' already exists in 'figur' table")
 
+        # Migration 4: Unique startnummer per wettkampf (startnummer_sequenz is created by create_all)
+        if not index_exists('anmeldung', 'ux_anmeldung_wettkampf_startnummer'):
+            duplicates = db.execute(text(
+                "SELECT wettkampf_id, startnummer FROM anmeldung WHERE startnummer IS NOT NULL "
+                "GROUP BY wettkampf_id, startnummer HAVING COUNT(*) > 1"
+            )).fetchall()
+            if duplicates:
+                print("\n⚠️  Duplicate startnummern found, unique index not created:")
+                for wettkampf_id, startnummer in duplicates:
+                    print(f"   Wettkampf {wettkampf_id}: Startnummer {startnummer}")
+            else:
+                print("\n📝 Adding unique index on anmeldung(wettkampf_id, startnummer)...")
+                db.execute(text(
+                    "CREATE UNIQUE INDEX ux_anmeldung_wettkampf_startnummer "
+                    "ON anmeldung(wettkampf_id, startnummer)"
+                ))
+                db.commit()
+                print("   ✅ Added ux_anmeldung_wettkampf_startnummer")
+        else:
+            print("\n⏭️  'ux_anmeldung_wettkampf_startnummer' already exists on 'anmeldung' table")
+
+        # Migration 5: Backup codes as {"id", "hash"} entries (keyed lookup, see app/totp.py)
+        legacy_users = 0
+        rows = db.execute(text("SELECT id, backup_codes FROM users WHERE backup_codes IS NOT NULL")).fetchall()
+        for user_id, backup_codes in rows:
+            upgraded = upgrade_backup_codes(backup_codes)
+            if upgraded is not None:
+                db.execute(
+                    text("UPDATE users SET backup_codes = :codes WHERE id = :id"),
+                    {"codes": upgraded, "id": user_id},
+                )
+                legacy_users += 1
+        if legacy_users:
+            db.commit()
+            print(f"\n📝 Converted backup codes of {legacy_users} users to the entry format")
+            print("   ℹ️  Their old codes are still checked one by one - ask them to regenerate codes (2FA setup)")
+        else:
+            print("\n⏭️  Backup codes already in the entry format")
+
         print("\n" + "=" * 60)
         print("✅ Migration completed successfully!")
         print("\nℹ️  Note: User roles should be updated manually:")
@@ -0,0 +1,32 @@
+"""
+Recount verband.nomination_count from the kind table.
+Usage: python rebuild_nomination_counts.py
+The counts are kept current by triggers (app/grunddaten/nominations.py); run
+this after restoring a backup or editing the database with triggers disabled.
+"""
+import sys
+from app.database import engine
+from app.grunddaten import nominations
+
+def rebuild_nomination_counts():
+    """Install the triggers if missing and recount all Verbände."""
+    try:
+        with engine.begin() as connection:
+            if not nominations.install(connection):
+                print("❌ Nomination counts are only maintained on SQLite/libSQL databases")
+                return False
+            drifted = nominations.rebuild(connection)
+
+        if drifted:
+            print(f"✅ Corrected the nomination count of {drifted} Verbände")
+        else:
+            print("✅ All nomination counts were correct")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error rebuilding nomination counts: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = rebuild_nomination_counts()
+    sys.exit(0 if success else 1)
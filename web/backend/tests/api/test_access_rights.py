@@ -4,6 +4,7 @@ import pytest
 from fastapi import status
 
 from app import auth, models
+from app.hashing import hash_pool
 
 
 @pytest.fixture
@@ -315,3 +316,56 @@ def test_read_only_user_cannot_modify_anmeldung(client, db, read_only_headers):
         client.delete(f"/api/anmeldung/{anmeldung.id}", headers=read_only_headers).status_code
         == status.HTTP_403_FORBIDDEN
     )
+
+
+def test_permission_changes_apply_despite_principal_cache(client, db, app_token_headers, admin_token_headers):
+    """Updating or deleting a user drops its cached principal right away."""
+    assert client.get("/api/kind", headers=app_token_headers).status_code == status.HTTP_200_OK
+    user = db.query(models.User).filter(models.User.username == "app_test_user").first()
+
+    response = client.put(f"/api/users/{user.id}", json={"can_read_all": False}, headers=admin_token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert client.get("/api/kind", headers=app_token_headers).status_code == status.HTTP_403_FORBIDDEN
+
+    response = client.delete(f"/api/users/{user.id}", headers=admin_token_headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert client.get("/api/kind", headers=app_token_headers).status_code == status.HTTP_401_UNAUTHORIZED
+
+    stats = client.get("/api/admin/auth/principal-cache", headers=admin_token_headers).json()
+    assert stats["misses"] >= 3
+
+
+def test_login_lockout_after_failed_attempts(client, db, admin_token_headers, monkeypatch):
+    """After 5 failed logins the account is locked without running bcrypt (QS-04)."""
+    for _ in range(5):
+        response = client.post("/api/auth/token", data={"username": "admin_test", "password": "wrong"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def fail_verify(*args):
+        raise AssertionError("bcrypt must not run while locked out")
+
+    monkeypatch.setattr(auth.pwd_context, "verify", fail_verify)
+    response = client.post("/api/auth/token", data={"username": "admin_test", "password": "admin_test_password"})
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) > 0
+
+    lockouts = client.get("/api/admin/auth/lockouts", headers=admin_token_headers).json()
+    assert lockouts[0]["scope"] == "user"
+    assert lockouts[0]["username"] == "admin_test"
+
+
+def test_user_passwords_are_hashed_on_the_hash_pool(client, db, admin_token_headers):
+    """Creating a user and changing its password run bcrypt on the hash pool."""
+    completed = hash_pool.stats()["completed"]
+    response = client.post("/api/users/", json={
+        "username": "pool_user", "password": "first-password", "role": "OFFIZIELLER",
+    }, headers=admin_token_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    response = client.put(
+        f"/api/users/{response.json()['id']}", json={"password": "second-password"}, headers=admin_token_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    assert hash_pool.stats()["completed"] == completed + 2
+    user = db.query(models.User).filter(models.User.username == "pool_user").first()
+    assert auth.verify_password("second-password", user.hashed_password)
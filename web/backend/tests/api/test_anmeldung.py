@@ -532,3 +532,131 @@ def test_create_anmeldung_wettkampf_not_found(client, app_token_headers):
     )
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert "Wettkampf not found" in response.json()["detail"]
+
+
+def test_read_anmeldung_list_cursor_pagination(client, db, app_token_headers):
+    """The anmeldung list can be walked page by page via X-Next-Cursor."""
+    saison = models.Saison(name="Cursor Saison", from_date=date(2024, 1, 1), to_date=date(2024, 12, 31))
+    schwimmbad = models.Schwimmbad(name="Cursor Bad", adresse="Weg 2")
+    wettkampf = models.Wettkampf(name="Cursor Cup", datum=date(2024, 10, 15), saison=saison, schwimmbad=schwimmbad)
+    kinder = [
+        models.Kind(vorname=f"Kind{i}", nachname="Cursor", geburtsdatum=date(2015, 1, 1))
+        for i in range(5)
+    ]
+    db.add_all([
+        models.Anmeldung(kind=kind, wettkampf=wettkampf, startnummer=i + 1, status="aktiv")
+        for i, kind in enumerate(kinder)
+    ])
+    db.commit()
+
+    response = client.get("/api/anmeldung?limit=2&include_total=true", headers=app_token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Total-Count"] == "5"
+    ids = [a["id"] for a in response.json()]
+
+    cursor = response.headers["X-Next-Cursor"]
+    while cursor:
+        response = client.get(f"/api/anmeldung?limit=2&cursor={cursor}", headers=app_token_headers)
+        assert response.status_code == status.HTTP_200_OK
+        ids.extend(a["id"] for a in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+
+    assert len(ids) == len(set(ids)) == 5
+
+    response = client.get("/api/anmeldung?cursor=garbage", headers=app_token_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_read_anmeldung_list_has_no_n_plus_one(client, db, app_token_headers, count_queries):
+    """A full page costs a constant number of queries, independent of its size."""
+    saison = models.Saison(name="N+1 Saison", from_date=date(2024, 1, 1), to_date=date(2024, 12, 31))
+    schwimmbad = models.Schwimmbad(name="N+1 Bad", adresse="Weg 3")
+    wettkampf = models.Wettkampf(name="N+1 Cup", datum=date(2024, 10, 15), saison=saison, schwimmbad=schwimmbad)
+    verein = models.Verein(name="SV N+1", ort="Berlin", register_id="R3", contact="c")
+    verband = models.Verband(name="Verband N+1", abkuerzung="VN", land="Deutschland", ort="Berlin")
+    figuren = [models.Figur(name=f"Figur {i}", kategorie="Basis", schwierigkeitsgrad=10 + i) for i in range(3)]
+    for i in range(30):
+        anmeldung = models.Anmeldung(
+            kind=models.Kind(
+                vorname=f"Kind{i}", nachname="Eager", geburtsdatum=date(2015, 1, 1),
+                verein=verein, verband=verband
+            ),
+            wettkampf=wettkampf,
+            startnummer=i + 1,
+            status="aktiv"
+        )
+        anmeldung.figuren.extend(figuren)
+        db.add(anmeldung)
+    db.commit()
+    db.expire_all()
+
+    # Authentication (user lookup, cache miss) + page with Kind/Verein/Verband/Versicherung + figuren
+    with count_queries(max_queries=3):
+        response = client.get("/api/anmeldung", headers=app_token_headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert len(data) == 30
+    assert all(len(a["figuren"]) == 3 and a["kind"]["verein"]["name"] == "SV N+1" for a in data)
+
+    # Principal is cached now: Anmeldung with Kind/Verein/... + figuren
+    with count_queries(max_queries=2):
+        response = client.get(f"/api/anmeldung/{data[0]['id']}", headers=app_token_headers)
+    assert response.json()["kind"]["verband"]["abkuerzung"] == "VN"
+
+
+def test_create_anmeldungen_bulk(client, db, app_token_headers, count_queries):
+    """A roster is registered in one request with per-row status and a startnummer block."""
+    saison = models.Saison(name="Bulk Saison", from_date=date(2024, 1, 1), to_date=date(2024, 12, 31))
+    schwimmbad = models.Schwimmbad(name="Bulk Bad", adresse="Weg 5")
+    wettkampf = models.Wettkampf(
+        name="Bulk Cup", datum=date(2024, 10, 15), saison=saison, schwimmbad=schwimmbad, max_teilnehmer=3
+    )
+    verein = models.Verein(name="SV Bulk", ort="Hamburg", register_id="R5", contact="c")
+    figur = models.Figur(name="Ballettbein", kategorie="Basis", schwierigkeitsgrad=11)
+    vereinskinder = [
+        models.Kind(vorname=f"Kind{i}", nachname="Bulk", geburtsdatum=date(2015, 1, 1), verein=verein)
+        for i in range(40)
+    ]
+    ohne_versicherung = models.Kind(vorname="Ohne", nachname="Bulk", geburtsdatum=date(2015, 1, 1))
+    bereits_angemeldet = models.Kind(vorname="Schon", nachname="Bulk", geburtsdatum=date(2015, 1, 1), verein=verein)
+    db.add_all(vereinskinder + [
+        figur,
+        ohne_versicherung,
+        models.Anmeldung(kind=bereits_angemeldet, wettkampf=wettkampf, startnummer=1, vorlaeufig=0, status="aktiv"),
+    ])
+    db.commit()
+
+    roster = [{"kind_id": k.id, "figur_ids": [figur.id]} for k in vereinskinder]
+    roster += [
+        {"kind_id": ohne_versicherung.id, "figur_ids": [figur.id, 9999]},
+        {"kind_id": vereinskinder[0].id, "figur_ids": []},
+        {"kind_id": bereits_angemeldet.id, "figur_ids": [figur.id]},
+        {"kind_id": 9999, "figur_ids": []},
+    ]
+
+    # The query count does not depend on the roster size
+    with count_queries(max_queries=15):
+        response = client.post(
+            f"/api/wettkampf/{wettkampf.id}/anmeldungen:bulk", json=roster, headers=app_token_headers
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()
+    assert len(results) == 44
+    assert [r["status"] for r in results[:2]] == ["aktiv", "aktiv"]
+    assert results[2]["reasons"] == ["maximale Teilnehmerzahl erreicht"]
+    assert results[40]["status"] == "vorläufig"
+    assert results[40]["reasons"] == ["keine Versicherung", "maximale Teilnehmerzahl erreicht"]
+    assert [r["reasons"] for r in results[41:]] == [
+        ["Kind mehrfach in der Liste"], ["Kind bereits angemeldet"], ["Kind nicht gefunden"]
+    ]
+    assert all(r["anmeldung_id"] is None for r in results[41:])
+    assert [r["startnummer"] for r in results[:41]] == list(range(2, 43))
+
+    anmeldung = client.get(f"/api/anmeldung/{results[0]['anmeldung_id']}", headers=app_token_headers).json()
+    assert [f["name"] for f in anmeldung["figuren"]] == ["Ballettbein"]
+    assert anmeldung["startnummer"] == 2
+
+    response = client.post("/api/wettkampf/9999/anmeldungen:bulk", json=[], headers=app_token_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
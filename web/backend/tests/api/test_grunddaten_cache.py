@@ -0,0 +1,133 @@
+"""Grunddaten list endpoints served from the reference data cache."""
+from datetime import date
+
+from fastapi import status
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import database, models
+
+
+def create_saison(client, headers, name):
+    response = client.post(
+        "/api/saison",
+        json={"name": name, "from_date": "2024-01-01", "to_date": "2024-12-31"},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()
+
+
+def test_repeated_list_does_not_query_the_table(client, app_token_headers, count_queries):
+    create_saison(client, app_token_headers, "Saison 2024")
+    first = client.get("/api/saison", headers=app_token_headers)
+
+    with count_queries() as statements:
+        second = client.get("/api/saison", headers=app_token_headers)
+
+    assert second.json() == first.json()
+    assert not [s for s in statements if "FROM saison" in s]
+
+
+def test_list_reflects_writes(client, app_token_headers):
+    saison = create_saison(client, app_token_headers, "Alt")
+    assert [s["name"] for s in client.get("/api/saison", headers=app_token_headers).json()] == ["Alt"]
+
+    client.put(
+        f"/api/saison/{saison['id']}",
+        json={"name": "Neu", "from_date": "2024-01-01", "to_date": "2024-12-31"},
+        headers=app_token_headers,
+    )
+    assert [s["name"] for s in client.get("/api/saison", headers=app_token_headers).json()] == ["Neu"]
+
+    client.delete(f"/api/saison/{saison['id']}", headers=app_token_headers)
+    assert client.get("/api/saison", headers=app_token_headers).json() == []
+
+
+def test_verband_nomination_count_follows_kind_writes(client, db, app_token_headers):
+    from app import models
+
+    verband = models.Verband(name="Verband Cache", abkuerzung="VC", land="AT", ort="Graz")
+    db.add(verband)
+    db.commit()
+
+    def nominations():
+        rows = client.get("/api/verband", headers=app_token_headers).json()
+        return next(v["nomination_count"] for v in rows if v["name"] == "Verband Cache")
+
+    assert nominations() == 0
+    response = client.post(
+        "/api/kind",
+        json={
+            "vorname": "Max",
+            "nachname": "Muster",
+            "geburtsdatum": "2012-05-01",
+            "geschlecht": "M",
+            "verband_id": verband.id,
+        },
+        headers=app_token_headers,
+    )
+    assert response.status_code in (status.HTTP_200_OK, status.HTTP_201_CREATED), response.text
+    assert nominations() == 1
+
+
+def test_unchanged_list_answers_304(client, app_token_headers):
+    create_saison(client, app_token_headers, "Saison 2024")
+    first = client.get("/api/figur", headers=app_token_headers)
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    response = client.get("/api/figur", headers={**app_token_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    # A different query is a different representation
+    response = client.get("/api/figur?limit=5", headers={**app_token_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_write_changes_the_etag(client, app_token_headers):
+    etag = client.get("/api/saison", headers=app_token_headers).headers["ETag"]
+    create_saison(client, app_token_headers, "Neu")
+
+    response = client.get("/api/saison", headers={**app_token_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert [s["name"] for s in response.json()] == ["Neu"]
+
+
+def test_authentication_is_checked_before_304(client, app_token_headers):
+    etag = client.get("/api/verband", headers=app_token_headers).headers["ETag"]
+
+    response = client.get("/api/verband", headers={"If-None-Match": etag})
+    assert response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
+
+
+def test_etag_follows_the_session_serving_the_data(client, db, app_token_headers, tmp_path, monkeypatch):
+    # A replica that has not synced yet: /api/figur reads it, /api/saison the primary
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    database.Base.metadata.create_all(bind=replica)
+    monkeypatch.setattr(database, "ReplicaSessionLocal", sessionmaker(bind=replica))
+    figur_etag = client.get("/api/figur", headers=app_token_headers).headers["ETag"]
+    saison_etag = client.get("/api/saison", headers=app_token_headers).headers["ETag"]
+
+    db.add(models.Figur(name="Ballettbein", kategorie="Basis", schwierigkeitsgrad=11))
+    db.add(models.Saison(name="2024", from_date=date(2024, 1, 1), to_date=date(2024, 12, 31)))
+    db.commit()
+
+    response = client.get("/api/saison", headers={**app_token_headers, "If-None-Match": saison_etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert [s["name"] for s in response.json()] == ["2024"]
+
+    # The primary's new counters must not tag the replica's old body
+    response = client.get("/api/figur", headers={**app_token_headers, "If-None-Match": figur_etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # Replica caught up
+    monkeypatch.setattr(database, "ReplicaSessionLocal", None)
+    response = client.get("/api/figur", headers={**app_token_headers, "If-None-Match": figur_etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert [f["name"] for f in response.json()] == ["Ballettbein"]
+    replica.dispose()
@@ -1,3 +1,5 @@
+from datetime import date
+
 from fastapi import status
 
 from app import models
@@ -69,3 +71,46 @@ def test_kind_crud(client, db, app_token_headers):
     assert get_response.status_code == status.HTTP_404_NOT_FOUND
 
     print("testing CRUD for Kind: ok")
+
+
+def test_list_kind_cursor_pagination(client, db, app_token_headers):
+    db.add_all([
+        models.Kind(vorname=f"Kind{i}", nachname=f"Cursor{i}", geburtsdatum=date(2015, 1, 1))
+        for i in range(5)
+    ])
+    db.commit()
+
+    response = client.get("/api/kind?limit=2", headers=app_token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Total-Count"] == "5"
+    names = [k["nachname"] for k in response.json()]
+
+    cursor = response.headers["X-Next-Cursor"]
+    while cursor:
+        response = client.get(f"/api/kind?limit=2&cursor={cursor}", headers=app_token_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert "X-Total-Count" not in response.headers
+        names.extend(k["nachname"] for k in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+
+    assert names == [f"Cursor{i}" for i in range(5)]
+
+    response = client.get("/api/kind?cursor=garbage", headers=app_token_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_list_kind_conditional_get(client, db, app_token_headers):
+    verein = models.Verein(name="SC Etag", ort="Linz", register_id="E1", contact="c")
+    db.add(models.Kind(vorname="Eva", nachname="Etag", geburtsdatum=date(2015, 1, 1), verein=verein))
+    db.commit()
+
+    etag = client.get("/api/kind", headers=app_token_headers).headers["ETag"]
+    response = client.get("/api/kind", headers={**app_token_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # The list embeds the Verein, so renaming it invalidates the ETag
+    verein.name = "SC Etag Neu"
+    db.commit()
+    response = client.get("/api/kind", headers={**app_token_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()[0]["verein"]["name"] == "SC Etag Neu"
@@ -0,0 +1,29 @@
+from fastapi import status
+
+from app.metrics import instrument_engine
+from app.routers import metrics as metrics_router
+
+
+def test_metrics_endpoint_reports_route_templates(client, db, app_token_headers, admin_token_headers):
+    instrument_engine(db.get_bind())
+
+    assert client.get("/api/kind/999999", headers=app_token_headers).status_code == status.HTTP_404_NOT_FOUND
+
+    response = client.get("/metrics", headers=admin_token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'aquarius_http_requests_total{method="GET",route="/api/kind/{kind_id}",status="404"}' in body
+    assert 'aquarius_http_request_duration_seconds_count{method="GET",route="/api/kind/{kind_id}"}' in body
+    assert 'aquarius_db_queries_per_request_count{method="GET",route="/api/kind/{kind_id}"}' in body
+    assert "aquarius_http_requests_in_flight" in body
+
+
+def test_metrics_endpoint_requires_admin_or_token(client, app_token_headers, admin_token_headers, monkeypatch):
+    assert client.get("/metrics").status_code == status.HTTP_401_UNAUTHORIZED
+    assert client.get("/metrics", headers=app_token_headers).status_code == status.HTTP_403_FORBIDDEN
+
+    monkeypatch.setattr(metrics_router, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == status.HTTP_200_OK
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == status.HTTP_401_UNAUTHORIZED
+    assert client.get("/metrics", headers=admin_token_headers).status_code == status.HTTP_200_OK
@@ -0,0 +1,95 @@
+import sys
+import threading
+import time
+
+import pytest
+from fastapi import Depends, FastAPI, status
+from fastapi.testclient import TestClient
+
+from app import profiling
+from app.profiling import ProfilingMiddleware, RequestProfile, profiler
+
+
+@pytest.fixture
+def profiling_enabled(monkeypatch):
+    monkeypatch.setattr(profiler, "enabled", True)
+    assert profiling.instrument_threadpool(), "FastAPI moved run_in_threadpool - update _THREADPOOL_CALLERS"
+    yield
+    profiling.uninstrument_threadpool()
+
+
+def test_admin_can_profile_a_request(client, admin_token_headers, profiling_enabled):
+    response = client.get("/api/users/", headers={**admin_token_headers, "X-Profile": "1"})
+    assert response.status_code == status.HTTP_200_OK
+
+    profiles = client.get("/api/admin/profiles", headers=admin_token_headers).json()
+    assert len(profiles) == 1
+    assert profiles[0]["trigger"] == "header"
+    assert profiles[0]["route"] == "/api/users/"
+    assert profiles[0]["status"] == 200
+
+    profile_id = profiles[0]["id"]
+    details = client.get(f"/api/admin/profiles/{profile_id}", headers=admin_token_headers).json()
+    assert "top_functions" in details
+    response = client.get(f"/api/admin/profiles/{profile_id}/folded", headers=admin_token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert "attachment" in response.headers["content-disposition"]
+
+
+def test_profile_header_ignored_for_non_admins(client, app_token_headers, profiling_enabled):
+    response = client.get("/api/kind", headers={**app_token_headers, "X-Profile": "1"})
+    assert response.status_code == status.HTTP_200_OK
+    assert profiler.list() == []
+
+
+def test_request_profile_folds_sampled_stacks():
+    profile = RequestProfile("GET", "/api/kind", "sample")
+    profile.add_thread(threading.get_ident())
+    profile.sample(sys._current_frames())
+    profile.sample(sys._current_frames())
+
+    folded = profile.folded()
+    assert "test_request_profile_folds_sampled_stacks (test_profiling.py:" in folded
+    assert folded.endswith(" 2\n")
+    assert profile.top_functions()[0]["samples"] == 2
+
+
+def test_sync_dependencies_without_sql_are_profiled(db, monkeypatch, profiling_enabled):
+    def slow_permission_check():
+        time.sleep(0.05)
+
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/api/probe", dependencies=[Depends(slow_permission_check)])
+    def probe():
+        return {"ok": True}
+
+    monkeypatch.setattr(profiler, "sample_rate", 1.0)
+    assert TestClient(app).get("/api/probe").json() == {"ok": True}
+
+    profile = profiler.get(profiler.list()[0]["id"])
+    assert "slow_permission_check (test_profiling.py:" in profile.folded()
+    # The worker was released with the dependency - only the event loop thread is left
+    assert len(profile._threads) == 1
+
+
+def test_profiling_is_off_unless_configured(client, admin_token_headers):
+    import fastapi.routing
+
+    assert profiler.enabled is False
+    assert fastapi.routing.run_in_threadpool is not profiling._profiled_run_in_threadpool
+    response = client.get("/api/users/", headers={**admin_token_headers, "X-Profile": "1"})
+    assert response.status_code == status.HTTP_200_OK
+    assert profiler.list() == []
+
+
+def test_instrument_threadpool_reports_moved_call_sites(monkeypatch):
+    import fastapi.concurrency
+
+    monkeypatch.delattr(fastapi.concurrency, "run_in_threadpool")
+    try:
+        assert profiling.instrument_threadpool() is False
+        assert not hasattr(fastapi.concurrency, "run_in_threadpool")
+    finally:
+        profiling.uninstrument_threadpool()
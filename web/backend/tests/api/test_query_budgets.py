@@ -0,0 +1,50 @@
+"""SQL statement budgets of the hot read endpoints.
+
+Each endpoint is requested with a small and a larger data set under the same
+budget, so a lazy load per row (N+1) fails here instead of in production.
+Budgets include authentication: one user lookup on the first request, later
+requests are served by the principal cache.
+"""
+from datetime import date
+
+import pytest
+
+from app import models
+
+
+def _seed(db, starters):
+    saison = models.Saison(name="Budget Saison", from_date=date(2024, 1, 1), to_date=date(2024, 12, 31))
+    schwimmbad = models.Schwimmbad(name="Budget Bad", adresse="Weg 1")
+    verband = models.Verband(name="Budget Verband", abkuerzung="BV", land="DE", ort="Bonn")
+    versicherung = models.Versicherung(name="Budget Versicherung", kurz="BVS", land="DE", hauptsitz="Bonn")
+    verein = models.Verein(name="SV Budget", ort="Bonn", register_id="B1", contact="c")
+    figuren = [models.Figur(name=f"Budget Figur {i}", kategorie="Basis", schwierigkeitsgrad=10 + i) for i in range(3)]
+    wettkampf = models.Wettkampf(name="Budget Cup", datum=date(2024, 9, 1), saison=saison, schwimmbad=schwimmbad)
+    wettkampf.figuren.extend(figuren)
+    db.add(wettkampf)
+    for i in range(starters):
+        kind = models.Kind(
+            vorname=f"Kind{i}", nachname="Budget", geburtsdatum=date(2014, 1, 1),
+            verein=verein, verband=verband, versicherung=versicherung if i % 2 else None,
+        )
+        anmeldung = models.Anmeldung(kind=kind, wettkampf=wettkampf, startnummer=i + 1, status="aktiv")
+        anmeldung.figuren.extend(figuren)
+        db.add(anmeldung)
+    db.commit()
+    wettkampf_id = wettkampf.id
+    db.expire_all()
+    return wettkampf_id
+
+
+@pytest.mark.parametrize("starters", [5, 40])
+def test_read_endpoints_stay_within_query_budget(db, app_token_headers, assert_query_budget, starters):
+    wettkampf_id = _seed(db, starters)
+
+    # user lookup + table versions (ETag, re-read after the seed commit) + count + page
+    assert_query_budget("/api/kind?limit=100", max_queries=4, headers=app_token_headers)
+    # page with Kind/Verein/Verband/Versicherung + figuren
+    response = assert_query_budget("/api/anmeldung?limit=100", max_queries=2, headers=app_token_headers)
+    assert len(response.json()) == starters
+    # wettkampf/saison/schwimmbad + figuren + anmeldungen/kind + anmeldung figuren
+    response = assert_query_budget(f"/api/wettkampf/{wettkampf_id}/details", max_queries=4, headers=app_token_headers)
+    assert len(response.json()["anmeldungen"]) == starters
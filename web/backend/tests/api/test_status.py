@@ -0,0 +1,29 @@
+from fastapi import status
+
+from app.status_sampler import status_sampler
+
+
+def test_status_overview_served_from_snapshot(client, count_queries):
+    # The app lifespan took the first sample before serving;
+    # visitors read the snapshot - no database work per request
+    with count_queries(max_queries=0):
+        response = client.get("/api/status")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["status"] == "ok"
+    assert data["database"]["write_latency_ms"] is not None
+    assert set(data["database"]["latency"]) == {"health", "write", "read"}
+    assert data["counts"]["users"] == 0
+    assert data["sampled_at"] == status_sampler.snapshot()["sampled_at"]
+
+
+def test_status_overview_warming_up_never_probes(client, count_queries):
+    # E.g. every sample so far failed: the endpoint does not probe itself
+    status_sampler.clear()
+    with count_queries(max_queries=0):
+        response = client.get("/api/status")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["status"] == "warming_up"
+    assert data["database"]["write_latency_ms"] is None
+    assert data["counts"] == {}
@@ -0,0 +1,15 @@
+from fastapi import status
+
+
+def test_totp_qr_code_available_during_setup(client, admin_token_headers):
+    response = client.get("/api/auth/totp/qr-code", headers=admin_token_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = client.post("/api/auth/totp/setup", headers=admin_token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["qr_code"].startswith("data:image/svg+xml;base64,")
+
+    response = client.get("/api/auth/totp/qr-code", headers=admin_token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("image/svg+xml")
+    assert response.headers["cache-control"] == "no-store"
@@ -244,3 +244,116 @@ def test_wettkampf_details_with_figuren_and_anmeldungen(client, db, app_token_he
     assert "anmeldungen" in data
     assert isinstance(data["figuren"], list)
     assert isinstance(data["anmeldungen"], list)
+
+
+def _wettkampf_with_starters(db, count):
+    saison = models.Saison(name="Plan Saison", from_date=date(2024, 1, 1), to_date=date(2024, 12, 31))
+    schwimmbad = models.Schwimmbad(name="Plan Bad", adresse="Weg 4")
+    verein = models.Verein(name="SV Plan", ort="Köln", register_id="R4", contact="c")
+    figuren = [models.Figur(name=f"Figur {i}", kategorie="Basis", schwierigkeitsgrad=10 + i) for i in range(2)]
+    wettkampf = models.Wettkampf(name="Plan Cup", datum=date(2024, 8, 1), saison=saison, schwimmbad=schwimmbad)
+    wettkampf.figuren.extend(figuren)
+    db.add(wettkampf)
+    for i in range(count):
+        anmeldung = models.Anmeldung(
+            kind=models.Kind(
+                vorname=f"Kind{i}", nachname="Plan", geburtsdatum=date(2015, 1, 1),
+                verein=verein if i % 2 else None
+            ),
+            wettkampf=wettkampf,
+            startnummer=count - i,
+            status="aktiv"
+        )
+        anmeldung.figuren.extend(figuren)
+        db.add(anmeldung)
+    db.commit()
+    wettkampf_id = wettkampf.id
+    db.expire_all()
+    return wettkampf_id
+
+
+def test_wettkampf_details_query_count(client, db, app_token_headers, count_queries):
+    """The details endpoint loads each relation once, not once per registration."""
+    wettkampf_id = _wettkampf_with_starters(db, 20)
+
+    # Authentication (user lookup, cache miss) + table versions (ETag) + wettkampf/saison/schwimmbad
+    # + figuren + anmeldungen/kind + anmeldung figuren
+    with count_queries(max_queries=6):
+        response = client.get(f"/api/wettkampf/{wettkampf_id}/details", headers=app_token_headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["saison"]["name"] == "Plan Saison"
+    assert len(data["figuren"]) == 2
+    assert len(data["anmeldungen"]) == 20
+    assert all(len(a["figuren"]) == 2 for a in data["anmeldungen"])
+    assert sum(a["kind"]["verein"] is not None for a in data["anmeldungen"]) == 10
+
+
+def test_wettkampf_details_fields_projection(client, db, app_token_headers):
+    wettkampf_id = _wettkampf_with_starters(db, 3)
+
+    response = client.get(
+        f"/api/wettkampf/{wettkampf_id}/details?fields=startnummer,vorname,verein,insurance_ok",
+        headers=app_token_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["name"] == "Plan Cup"
+    assert data["fields"] == ["startnummer", "vorname", "verein", "insurance_ok"]
+    assert data["anmeldungen"] == [
+        [1, "Kind2", None, False],
+        [2, "Kind1", "SV Plan", True],
+        [3, "Kind0", None, False],
+    ]
+    assert "figuren" not in data
+
+    response = client.get(f"/api/wettkampf/{wettkampf_id}/details?fields=passwort", headers=app_token_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_set_wettkampf_figuren_writes_only_the_difference(client, db, app_token_headers, count_queries):
+    wettkampf_id = _wettkampf_with_starters(db, 0)
+    katalog = [models.Figur(name=f"Katalog {i}", kategorie="Basis", schwierigkeitsgrad=10) for i in range(60)]
+    db.add_all(katalog)
+    db.commit()
+    katalog_ids = [f.id for f in katalog]
+
+    # Authentication (user lookup, cache miss) + wettkampf + known figuren + current rows + delete + insert
+    # + wettkampf version bump
+    with count_queries(max_queries=7):
+        response = client.put(
+            f"/api/wettkampf/{wettkampf_id}/figuren", json=katalog_ids + [9999], headers=app_token_headers
+        )
+    assert response.status_code == status.HTTP_200_OK, response.text
+
+    response = client.put(
+        f"/api/wettkampf/{wettkampf_id}/figuren", json=katalog_ids[:10] + katalog_ids[:1], headers=app_token_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    data = client.get(f"/api/wettkampf/{wettkampf_id}/details", headers=app_token_headers).json()
+    assert sorted(f["id"] for f in data["figuren"]) == sorted(katalog_ids[:10])
+
+    response = client.put("/api/wettkampf/9999/figuren", json=katalog_ids, headers=app_token_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_wettkampf_details_conditional_get(client, db, app_token_headers, count_queries):
+    wettkampf_id = _wettkampf_with_starters(db, 3)
+    url = f"/api/wettkampf/{wettkampf_id}/details"
+    etag = client.get(url, headers=app_token_headers).headers["ETag"]
+
+    # Served from the table versions in memory - no query or mapping
+    with count_queries() as statements:
+        response = client.get(url, headers={**app_token_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert statements == []
+
+    anmeldung = db.query(models.Anmeldung).filter(models.Anmeldung.wettkampf_id == wettkampf_id).first()
+    anmeldung.status = "vorläufig"
+    db.commit()
+
+    response = client.get(url, headers={**app_token_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
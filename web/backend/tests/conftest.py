@@ -1,8 +1,9 @@
 import pytest
 import sys
 import os
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -15,6 +16,14 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.database import Base, get_db
 from app.main import app
 from app import models, auth
+from app.principal_cache import principal_cache
+from app.activity import activity_recorder
+from app.login_throttle import login_throttle
+from app.status_sampler import status_sampler
+from app import metrics, profiling
+from app.grunddaten.cache import reference_cache
+from app.shared.versions import table_versions
+from app.compression import compressed_body_cache
 
 # Use in-memory SQLite for tests
 SQLALCHEMY_DATABASE_URL = "sqlite://"
@@ -25,10 +34,24 @@ engine = create_engine(
     poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+metrics.instrument_engine(engine)
 
 @pytest.fixture(scope="function")
 def db():
     """Create a fresh database for each test."""
+    # Cached principals would outlive the users of the previous test
+    principal_cache.clear()
+    # Flushes (e.g. on app shutdown) must reach the test database
+    activity_recorder.session_factory = TestingSessionLocal
+    activity_recorder.clear()
+    login_throttle.clear()
+    status_sampler.session_factory = TestingSessionLocal
+    status_sampler.clear()
+    profiling.profiler.session_factory = TestingSessionLocal
+    profiling.profiler.clear()
+    reference_cache.clear()
+    table_versions.clear()
+    compressed_body_cache.clear()
     Base.metadata.create_all(bind=engine)
     db = TestingSessionLocal()
     try:
@@ -51,6 +74,61 @@ def client(db):
         yield c
     app.dependency_overrides.clear()
 
+@pytest.fixture
+def count_queries():
+    """Return a context manager that records the SQL statements issued inside it.
+
+    Fails the test if more than `max_queries` statements were executed, which
+    catches N+1 lazy loads in endpoints and mappers:
+
+        with count_queries(max_queries=4) as statements:
+            client.get("/api/anmeldung", headers=app_token_headers)
+    """
+    @contextmanager
+    def counter(max_queries=None):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        if max_queries is not None:
+            assert len(statements) <= max_queries, (
+                f"Expected at most {max_queries} SQL statements, got {len(statements)}:\n"
+                + "\n".join(statements)
+            )
+
+    return counter
+
+
+@pytest.fixture
+def assert_query_budget(client, monkeypatch):
+    """Return a function that GETs a URL and fails if it exceeds a SQL statement budget.
+
+    The count comes from the X-SQL-Queries debug header, i.e. it covers the
+    whole request including authentication:
+
+        assert_query_budget("/api/kind", max_queries=3, headers=app_token_headers)
+    """
+    monkeypatch.setattr(metrics, "SQL_DEBUG_HEADER", True)
+
+    def check(url, max_queries, headers=None):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.text
+        queries = int(response.headers["X-SQL-Queries"])
+        assert queries <= max_queries, (
+            f"GET {url} issued {queries} SQL statements, budget is {max_queries}"
+        )
+        return response
+
+    return check
+
+
 @pytest.fixture
 def admin_token_headers(client, db):
     """Create an admin user and return auth headers."""
@@ -1,10 +1,18 @@
 """Integration tests for AnmeldungRepository (Step 4)."""
 import pytest
+import threading
 from datetime import date
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
 
+from app.database import Base
 from app.anmeldung.repository import AnmeldungRepository
+from app.anmeldung.services import AnmeldungService
 from app.anmeldung import schemas as anmeldung_schemas
+from app.kind.repository import KindRepository
+from app.wettkampf.repository import WettkampfRepository
+from app.grunddaten.repository import FigurRepository
 from app import models
 
 
@@ -256,3 +264,88 @@ def test_anmeldung_repository_add_and_set_figuren(db: Session):
     assert "F2" in figur_names
     assert "F3" in figur_names
     assert "F1" not in figur_names  # Should be replaced
+
+
+def _wettkampf(db: Session) -> models.Wettkampf:
+    wettkampf = models.Wettkampf(
+        name="Sequenz Cup",
+        datum=date(2025, 6, 15),
+        saison=models.Saison(name="2025", from_date=date(2025, 1, 1), to_date=date(2025, 12, 31)),
+        schwimmbad=models.Schwimmbad(name="Pool", adresse="Weg 1")
+    )
+    db.add(wettkampf)
+    db.commit()
+    return wettkampf
+
+
+def test_anmeldung_repository_reserve_startnummern(db: Session):
+    """Blocks are consecutive, and numbers of a rolled back transaction are handed out again."""
+    repo = AnmeldungRepository(db)
+    wettkampf = _wettkampf(db)
+
+    assert repo.reserve_startnummern(wettkampf.id, 3) == range(1, 4)
+    assert repo.get_next_startnummer(wettkampf.id) == 4
+    db.rollback()
+
+    # Gap-free: the rolled back reservation is released
+    assert repo.reserve_startnummern(wettkampf.id, 2) == range(1, 3)
+    db.commit()
+    assert repo.get_next_startnummer(wettkampf.id) == 3
+
+
+def test_anmeldung_startnummer_is_unique_per_wettkampf(db: Session):
+    wettkampf = _wettkampf(db)
+    kinder = [models.Kind(vorname=f"K{i}", nachname="Unique", geburtsdatum=date(2015, 1, 1)) for i in range(2)]
+    db.add_all([models.Anmeldung(kind=k, wettkampf=wettkampf, startnummer=7) for k in kinder])
+
+    with pytest.raises(IntegrityError):
+        db.commit()
+
+
+def test_concurrent_registrations_get_distinct_startnummern(tmp_path):
+    """QS-05: clerks registering at the same time never share a startnummer."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'concurrent.db'}", connect_args={"check_same_thread": False}
+    )
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_conn, connection_record):
+        dbapi_conn.execute("PRAGMA journal_mode=WAL")
+        dbapi_conn.execute("PRAGMA busy_timeout=5000")
+
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        wettkampf_id = _wettkampf(db).id
+        kinder = [models.Kind(vorname=f"K{i}", nachname="Parallel", geburtsdatum=date(2015, 1, 1)) for i in range(30)]
+        db.add_all(kinder)
+        db.commit()
+        kind_ids = [k.id for k in kinder]
+
+    errors = []
+
+    def clerk(ids):
+        with session_factory() as db:
+            service = AnmeldungService(
+                AnmeldungRepository(db), KindRepository(db), WettkampfRepository(db), FigurRepository(db)
+            )
+            for kind_id in ids:
+                try:
+                    service.create_anmeldung(anmeldung_schemas.AnmeldungCreate(
+                        kind_id=kind_id, wettkampf_id=wettkampf_id
+                    ))
+                except Exception as e:
+                    errors.append(e)
+
+    threads = [threading.Thread(target=clerk, args=(kind_ids[i::3],)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with session_factory() as db:
+        startnummern = sorted(a.startnummer for a in db.query(models.Anmeldung).all())
+    engine.dispose()
+
+    assert errors == []
+    assert startnummern == list(range(1, 31))
@@ -0,0 +1,131 @@
+"""Integration tests for the async repository variants (ENABLE_ASYNC_DB)."""
+import asyncio
+import pytest
+from datetime import date
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.database import Base, get_async_db
+from app.kind.repository import AsyncKindRepository
+from app.anmeldung.repository import AsyncAnmeldungRepository
+from app.wettkampf.repository import AsyncWettkampfRepository
+from app.kind import router as kind_router
+from app.wettkampf import router as wettkampf_router
+from app.auth import create_access_token
+from app import models
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    """Create a file database with a small competition, shared by sync and async engines."""
+    path = tmp_path / "async.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    verein = models.Verein(name="SV Musterstadt", ort="Musterstadt", register_id="R1", contact="c")
+    saison = models.Saison(name="2025", from_date=date(2025, 1, 1), to_date=date(2025, 12, 31))
+    schwimmbad = models.Schwimmbad(name="Bad", adresse="Weg 1")
+    figur = models.Figur(name="Ballettbein", kategorie="Basis", schwierigkeitsgrad=11)
+    wettkampf = models.Wettkampf(name="Cup", datum=date(2025, 6, 1), saison=saison, schwimmbad=schwimmbad)
+    wettkampf.figuren.append(figur)
+    kinder = [
+        models.Kind(vorname="Max", nachname="Mustermann", geburtsdatum=date(2015, 1, 1), verein=verein),
+        models.Kind(vorname="Erika", nachname="Musterfrau", geburtsdatum=date(2014, 1, 1)),
+        models.Kind(vorname="Anna", nachname="Schmidt", geburtsdatum=date(2016, 1, 1)),
+    ]
+    anmeldung = models.Anmeldung(kind=kinder[0], wettkampf=wettkampf, startnummer=1, status="aktiv")
+    anmeldung.figuren.append(figur)
+    db.add_all(kinder + [anmeldung, models.User(
+        username="async_user",
+        hashed_password="x",
+        role="VERWALTUNG",
+        is_active=True,
+        is_app_user=True,
+        can_read_all=True,
+    )])
+    db.commit()
+    db.close()
+    engine.dispose()
+    return path
+
+
+def run_with_session(db_file, fn):
+    """Run an async callable with an AsyncSession on the test database."""
+    async def runner():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_file}")
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                return await fn(session)
+        finally:
+            await engine.dispose()
+    return asyncio.run(runner())
+
+
+def test_async_kind_repository_search(db_file):
+    async def search(session):
+        return await AsyncKindRepository(session).search(query="Muster", sort_by="vorname")
+
+    results, total = run_with_session(db_file, search)
+
+    assert total == 2
+    assert [k.vorname for k in results] == ["Erika", "Max"]
+    assert results[1].verein.name == "SV Musterstadt"
+
+
+def test_async_anmeldung_repository_loads_mapper_relations(db_file):
+    async def list_anmeldungen(session):
+        return await AsyncAnmeldungRepository(session).list()
+
+    anmeldungen = run_with_session(db_file, list_anmeldungen)
+
+    assert len(anmeldungen) == 1
+    # Accessing relationships must not trigger (impossible) async lazy loads
+    assert anmeldungen[0].kind.verein.name == "SV Musterstadt"
+    assert [f.name for f in anmeldungen[0].figuren] == ["Ballettbein"]
+
+
+def test_async_wettkampf_repository_get_with_details(db_file):
+    async def details(session):
+        return await AsyncWettkampfRepository(session).get_with_details(1)
+
+    wettkampf = run_with_session(db_file, details)
+
+    assert wettkampf.saison.name == "2025"
+    assert wettkampf.schwimmbad.name == "Bad"
+    assert [f.name for f in wettkampf.figuren] == ["Ballettbein"]
+    assert wettkampf.anmeldungen[0].kind.nachname == "Mustermann"
+
+
+def test_async_read_endpoints(db_file):
+    """The async routers serve the same contract as the sync endpoints."""
+    app = FastAPI()
+    app.include_router(kind_router.async_router)
+    app.include_router(wettkampf_router.async_router)
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_file}")
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'async_user'})}"}
+
+    with TestClient(app) as client:
+        response = client.get("/api/kind?search=Muster", headers=headers)
+        assert response.status_code == 200
+        assert response.headers["X-Total-Count"] == "2"
+
+        response = client.get("/api/wettkampf/1/details", headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["anmeldungen"][0]["insurance_ok"] is True
+        assert data["figuren"][0]["name"] == "Ballettbein"
+
+        response = client.get("/api/kind")
+        assert response.status_code == 401
@@ -1,9 +1,12 @@
 """Integration tests for KindRepository (Step 4)."""
 import pytest
 from datetime import date
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.kind.repository import KindRepository
+from app.kind import fulltext
+from app.shared.pagination import InvalidCursorError
 from app.kind import schemas as kind_schemas
 from app import models
 
@@ -152,3 +155,129 @@ def test_kind_repository_update_and_delete(db: Session):
     # Assert
     assert deleted is True
     assert fetched is None
+
+
+def test_kind_repository_fulltext_search(db: Session):
+    """Search uses the FTS5 index: prefix and diacritic-insensitive, kept in sync by triggers."""
+    repo = KindRepository(db)
+    assert fulltext.is_available(db)
+
+    verein = models.Verein(name="SC Wasserfreunde", ort="Köln", register_id="R1", contact="c")
+    db.add(verein)
+    db.commit()
+
+    mueller = repo.create(kind_schemas.KindCreate(
+        vorname="Lena", nachname="Müller", geburtsdatum=date(2015, 1, 1), verein_id=verein.id
+    ))
+    repo.create(kind_schemas.KindCreate(
+        vorname="Jonas", nachname="Schulz", geburtsdatum=date(2014, 1, 1)
+    ))
+
+    # Prefix + diacritic folding
+    results, total = repo.search(query="Mull")
+    assert total == 1
+    assert results[0].id == mueller.id
+
+    # Verein name is indexed, multiple tokens are combined with AND
+    results, total = repo.search(query="wasser lena")
+    assert [k.id for k in results] == [mueller.id]
+
+    # Update and Verein rename triggers keep the index current
+    repo.update(mueller.id, kind_schemas.KindUpdate(nachname="Meier"))
+    verein.name = "SV Delfin"
+    db.commit()
+    assert repo.search(query="Müller")[1] == 0
+    assert repo.search(query="Meier")[1] == 1
+    assert repo.search(query="Delfin")[1] == 1
+
+    # Delete trigger
+    repo.delete(mueller.id)
+    assert repo.search(query="Meier")[1] == 0
+
+
+def test_kind_repository_fulltext_follows_verein_delete(db: Session):
+    """A deleted or renumbered Verein no longer matches its Kinder."""
+    repo = KindRepository(db)
+    delfin = models.Verein(name="SV Delfin", ort="Bonn", register_id="R1", contact="c")
+    hai = models.Verein(name="SC Hai", ort="Köln", register_id="R2", contact="c")
+    db.add_all([delfin, hai])
+    db.commit()
+    repo.create(kind_schemas.KindCreate(
+        vorname="Lena", nachname="Müller", geburtsdatum=date(2015, 1, 1), verein_id=delfin.id
+    ))
+    repo.create(kind_schemas.KindCreate(
+        vorname="Jonas", nachname="Schulz", geburtsdatum=date(2014, 1, 1), verein_id=hai.id
+    ))
+    assert repo.search(query="Delfin")[1] == 1
+
+    db.delete(delfin)
+    db.commit()
+    assert repo.search(query="Delfin")[1] == 0
+    assert repo.search(query="Lena")[1] == 1
+
+    # The Kind still points at the old id, so the renumbered Verein leaves the index
+    db.execute(update(models.Verein).where(models.Verein.id == hai.id).values(id=hai.id + 100))
+    db.commit()
+    assert repo.search(query="Hai")[1] == 0
+    assert repo.search(query="Jonas")[1] == 1
+
+
+def test_kind_repository_search_falls_back_without_fulltext(db: Session, monkeypatch):
+    """Without the FTS5 index, search falls back to ILIKE substring matching."""
+    repo = KindRepository(db)
+    repo.create(kind_schemas.KindCreate(
+        vorname="Max", nachname="Mustermann", geburtsdatum=date(2015, 1, 1)
+    ))
+    monkeypatch.setattr(fulltext, "is_available", lambda session: False)
+
+    results, total = repo.search(query="sterm")
+    assert total == 1
+    assert results[0].nachname == "Mustermann"
+
+
+@pytest.mark.parametrize("sort_by", ["nachname", "vorname", "geburtsdatum", "verein", "insurance_ok"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_kind_repository_cursor_pagination(db: Session, sort_by, sort_order):
+    """Walking all pages via cursor returns every Kind exactly once, in offset order."""
+    repo = KindRepository(db)
+    verein = models.Verein(name="SV Delfin", ort="Bonn", register_id="R2", contact="c")
+    db.add(verein)
+    db.commit()
+    for i in range(7):
+        # Duplicate sort values force the id tie-breaker to do its job
+        repo.create(kind_schemas.KindCreate(
+            vorname=f"Kind{i % 3}",
+            nachname=f"Paging{i % 2}",
+            geburtsdatum=date(2014 + i % 2, 1, 1),
+            verein_id=verein.id if i % 2 else None
+        ))
+
+    expected, total = repo.search(limit=100, sort_by=sort_by, sort_order=sort_order)
+
+    seen = []
+    cursor = None
+    while True:
+        items, cursor, page_total = repo.search_page(
+            limit=3, sort_by=sort_by, sort_order=sort_order, cursor=cursor, include_total=False
+        )
+        assert page_total is None
+        seen.extend(k.id for k in items)
+        if cursor is None:
+            break
+
+    assert seen == [k.id for k in expected]
+    assert len(seen) == total == 7
+
+
+def test_kind_repository_cursor_rejects_other_sort_order(db: Session):
+    repo = KindRepository(db)
+    for i in range(3):
+        repo.create(kind_schemas.KindCreate(
+            vorname="Max", nachname=f"Cursor{i}", geburtsdatum=date(2015, 1, 1)
+        ))
+    _, cursor, _ = repo.search_page(limit=1, sort_by="vorname")
+
+    with pytest.raises(InvalidCursorError):
+        repo.search_page(limit=1, sort_by="nachname", cursor=cursor)
+    with pytest.raises(InvalidCursorError):
+        repo.search_page(limit=1, cursor="not-a-cursor")
@@ -78,4 +78,54 @@ def test_create_anmeldung_logic_missing_insurance(mock_repos):
     
     # Assert
     assert result.vorlaeufig == 1
-    assert "keine Versicherung" in str(result.status_reasons) # Assuming we add reasons to the model or log
\ No newline at end of file
+    assert "keine Versicherung" in str(result.status_reasons) # Assuming we add reasons to the model or log
+
+def test_create_anmeldung_retries_startnummer_conflict(mock_repos, monkeypatch):
+    """A lost race for the startnummer is rolled back and retried."""
+    from sqlalchemy.exc import IntegrityError
+    from app.anmeldung import services
+
+    monkeypatch.setattr(services, "CREATE_RETRY_DELAY", 0)
+    service = AnmeldungService(
+        anmeldung_repo=mock_repos["anmeldung"],
+        kind_repo=mock_repos["kind"],
+        wettkampf_repo=mock_repos["wettkampf"],
+        figur_repo=mock_repos["figur"]
+    )
+    mock_repos["kind"].get.return_value = models.Kind(id=1, verein_id=1)
+    mock_repos["wettkampf"].get.return_value = models.Wettkampf(id=1)
+    mock_repos["anmeldung"].get_next_startnummer.side_effect = [3, 4]
+    mock_repos["anmeldung"].set_figuren.side_effect = [
+        IntegrityError(
+            "UPDATE anmeldung", {},
+            Exception("UNIQUE constraint failed: anmeldung.wettkampf_id, anmeldung.startnummer")
+        ),
+        None,
+    ]
+
+    result = service.create_anmeldung(
+        anmeldung_schemas.AnmeldungCreate(kind_id=1, wettkampf_id=1, figur_ids=[1])
+    )
+
+    assert result.startnummer == 4
+    mock_repos["anmeldung"].db.rollback.assert_called_once()
+
+
+def test_create_anmeldung_does_not_retry_other_integrity_errors(mock_repos):
+    from sqlalchemy.exc import IntegrityError
+
+    service = AnmeldungService(
+        anmeldung_repo=mock_repos["anmeldung"],
+        kind_repo=mock_repos["kind"],
+        wettkampf_repo=mock_repos["wettkampf"],
+        figur_repo=mock_repos["figur"]
+    )
+    mock_repos["kind"].get.return_value = models.Kind(id=1, verein_id=1)
+    mock_repos["wettkampf"].get.return_value = models.Wettkampf(id=1)
+    mock_repos["anmeldung"].set_figuren.side_effect = IntegrityError(
+        "INSERT", {}, Exception("FOREIGN KEY constraint failed")
+    )
+
+    with pytest.raises(IntegrityError):
+        service.create_anmeldung(anmeldung_schemas.AnmeldungCreate(kind_id=1, wettkampf_id=1, figur_ids=[1]))
+    assert mock_repos["anmeldung"].set_figuren.call_count == 1
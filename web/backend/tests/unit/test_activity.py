@@ -0,0 +1,69 @@
+"""Tests for the write-behind recorder of User.last_active."""
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.activity import ActivityRecorder
+
+
+def make_users(db, count):
+    users = [
+        models.User(username=f"activity_{i}", hashed_password="x", role="VERWALTUNG")
+        for i in range(count)
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+def test_record_keeps_latest_timestamp():
+    recorder = ActivityRecorder()
+    later = datetime(2024, 5, 1, 12, 0)
+
+    recorder.record(1, later)
+    recorder.record(1, later - timedelta(minutes=5))
+
+    assert recorder.pending() == {1: later}
+
+
+def test_flush_writes_all_users_in_one_statement(db, count_queries):
+    users = make_users(db, 3)
+    recorder = ActivityRecorder(session_factory=sessionmaker(bind=db.get_bind()))
+    base = datetime(2024, 5, 1, 12, 0)
+    for offset, user in enumerate(users):
+        recorder.record(user.id, base + timedelta(minutes=offset))
+
+    with count_queries() as statements:
+        assert recorder.flush() == 3
+    assert len(statements) == 1
+
+    db.expire_all()
+    assert [u.last_active for u in users] == [base + timedelta(minutes=i) for i in range(3)]
+    assert recorder.pending() == {}
+    assert recorder.flush() == 0
+
+
+def test_flush_failure_keeps_timestamps():
+    def broken_session():
+        raise RuntimeError("database unavailable")
+
+    recorder = ActivityRecorder(session_factory=broken_session)
+    when = datetime(2024, 5, 1, 12, 0)
+    recorder.record(7, when)
+
+    assert recorder.flush() == 0
+    assert recorder.pending() == {7: when}
+
+
+def test_active_user_ids_include_pending_activity(db):
+    flushed, pending, idle = make_users(db, 3)
+    now = datetime.utcnow()
+    flushed.last_active = now
+    idle.last_active = now - timedelta(hours=2)
+    db.commit()
+
+    recorder = ActivityRecorder(session_factory=sessionmaker(bind=db.get_bind()))
+    recorder.record(pending.id, now)
+
+    assert recorder.active_user_ids(db, now - timedelta(minutes=15)) == {flushed.id, pending.id}
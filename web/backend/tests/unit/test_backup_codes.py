@@ -0,0 +1,47 @@
+"""Tests for the keyed backup code lookup."""
+import json
+
+from app import totp
+
+
+def count_bcrypt_verifies(monkeypatch):
+    calls = []
+    verify = totp.pwd_context.verify
+
+    def counting_verify(secret, hashed):
+        calls.append(hashed)
+        return verify(secret, hashed)
+
+    monkeypatch.setattr(totp.pwd_context, "verify", counting_verify)
+    return calls
+
+
+def test_verify_runs_bcrypt_at_most_once(monkeypatch):
+    codes = totp.generate_backup_codes(5)
+    hashed = totp.hash_backup_codes(codes)
+    calls = count_bcrypt_verifies(monkeypatch)
+
+    assert totp.verify_backup_code(hashed, "0000-0000-0000") == (False, hashed)
+    assert calls == []
+
+    is_valid, remaining = totp.verify_backup_code(hashed, codes[3].lower())
+    assert is_valid is True
+    assert len(calls) == 1
+    assert totp.get_remaining_backup_codes_count(remaining) == 4
+
+    # One-time use
+    assert totp.verify_backup_code(remaining, codes[3])[0] is False
+
+
+def test_legacy_codes_are_upgraded_and_still_verify(monkeypatch):
+    codes = totp.generate_backup_codes(2)
+    legacy = json.dumps([totp.pwd_context.hash(code) for code in codes])
+
+    upgraded = totp.upgrade_backup_codes(legacy)
+    assert [entry["id"] for entry in json.loads(upgraded)] == [None, None]
+    assert totp.upgrade_backup_codes(upgraded) is None
+
+    for stored in (legacy, upgraded):
+        is_valid, remaining = totp.verify_backup_code(stored, codes[1])
+        assert is_valid is True
+        assert totp.get_remaining_backup_codes_count(remaining) == 1
@@ -0,0 +1,126 @@
+"""Tests for the response compression middleware."""
+import gzip
+import json
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app import compression
+from app.compression import CompressionMiddleware, compressed_body_cache
+
+ROWS = [{"id": i, "verein": {"name": "SC Neptun", "ort": "Berlin"}} for i in range(200)]
+
+
+async def large(request):
+    return JSONResponse(ROWS, headers={"ETag": '"v1"'})
+
+
+async def changing(request):
+    # Same ETag, different body - e.g. a write within the version check interval
+    return JSONResponse(ROWS[: int(request.query_params["rows"])], headers={"ETag": '"v1"'})
+
+
+async def small(request):
+    return JSONResponse({"ok": True})
+
+
+async def streamed(request):
+    async def chunks():
+        for row in ROWS:
+            yield json.dumps(row).encode() + b"\n"
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+async def precompressed(request):
+    return Response(gzip.compress(b"x" * 5000), media_type="text/javascript", headers={"Content-Encoding": "gzip"})
+
+
+async def image(request):
+    return Response(b"\x89PNG" * 2000, media_type="image/png")
+
+
+@pytest.fixture
+def client():
+    compressed_body_cache.clear()
+    app = Starlette(routes=[
+        Route("/large", large),
+        Route("/changing", changing),
+        Route("/small", small),
+        Route("/streamed", streamed),
+        Route("/precompressed", precompressed),
+        Route("/image", image),
+    ])
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+def raw_get(client, url, accept_encoding="gzip"):
+    """GET without letting httpx decode the body."""
+    with client.stream("GET", url, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_large_json_is_gzipped(client):
+    response, body = raw_get(client, "/large")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) == len(body)
+    assert json.loads(gzip.decompress(body)) == ROWS
+    assert len(body) < len(json.dumps(ROWS)) / 10
+    # Strong validators become weak - the bytes differ from the original
+    assert response.headers["ETag"] == 'W/"v1"'
+
+
+def test_uncompressed_without_accept_encoding(client):
+    response, body = raw_get(client, "/large", accept_encoding="identity")
+    assert "Content-Encoding" not in response.headers
+    assert json.loads(body) == ROWS
+
+
+def test_small_body_stays_uncompressed(client):
+    response, _ = raw_get(client, "/small")
+    assert "Content-Encoding" not in response.headers
+
+
+def test_streamed_body_is_compressed_per_chunk(client):
+    response, body = raw_get(client, "/streamed")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert gzip.decompress(body).count(b"\n") == len(ROWS)
+
+
+def test_encoded_and_binary_responses_are_skipped(client):
+    response, body = raw_get(client, "/precompressed")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body) == b"x" * 5000
+
+    response, _ = raw_get(client, "/image")
+    assert "Content-Encoding" not in response.headers
+
+
+def test_bodies_with_etag_are_compressed_once(client, monkeypatch):
+    calls = []
+    original = compression.compress
+    monkeypatch.setattr(compression, "compress", lambda body, encoding: calls.append(encoding) or original(body, encoding))
+
+    first = raw_get(client, "/large")[1]
+    second = raw_get(client, "/large")[1]
+    assert first == second
+    assert calls == ["gzip"]
+
+
+def test_same_etag_with_a_new_body_is_not_served_from_cache(client):
+    raw_get(client, "/changing?rows=100")
+    # Same path and ETag - only the body tells the responses apart
+    body = raw_get(client, "/changing?rows=150")[1]
+    assert json.loads(gzip.decompress(body)) == ROWS[:150]
+
+
+def test_brotli_preferred_when_available(client):
+    brotli = pytest.importorskip("brotli")
+    response, body = raw_get(client, "/large", accept_encoding="gzip, br")
+    assert response.headers["Content-Encoding"] == "br"
+    assert json.loads(brotli.decompress(body)) == ROWS
@@ -45,3 +45,82 @@ def test_default_configuration():
         importlib.reload(database)
         
         assert str(database.engine.url) == "sqlite:///./aquarius.db"
+
+def test_default_profile_applies_sqlite_pragmas(tmp_path):
+    """Verify the default profile configures pooling and WAL pragmas for SQLite files."""
+    db_file = tmp_path / "profile.db"
+    with mock.patch.dict(os.environ, {"DATABASE_URL": f"sqlite:///{db_file}"}):
+        os.environ.pop("DB_PROFILE", None)
+        from app import database
+        importlib.reload(database)
+
+        assert database.DB_PROFILE == "default"
+        assert database.engine.pool.size() == database.DB_PROFILES["default"]["pool_size"]
+
+        with database.engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+            assert conn.exec_driver_sql("PRAGMA temp_store").scalar() == 2  # MEMORY
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+            assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+        database.engine.dispose()
+
+def test_profile_selected_from_environment():
+    """Verify DB_PROFILE selects a named profile and rejects unknown names."""
+    with mock.patch.dict(os.environ, {"DATABASE_URL": "sqlite:///./test.db", "DB_PROFILE": "high-concurrency"}):
+        from app import database
+        importlib.reload(database)
+
+        assert database.engine.pool.size() == 10
+        assert database.SQLITE_PRAGMAS["busy_timeout"] == 10000
+
+    with mock.patch.dict(os.environ, {"DATABASE_URL": "sqlite:///./test.db", "DB_PROFILE": "turbo"}):
+        from app import database
+        with pytest.raises(ValueError, match="Unknown DB_PROFILE"):
+            importlib.reload(database)
+
+def test_libsql_skips_sqlite_pragmas():
+    """Verify remote Turso connections are pooled but get no local pragmas."""
+    with mock.patch.dict(os.environ, {"DATABASE_URL": "libsql://database.turso.io"}):
+        os.environ.pop("DB_PROFILE", None)
+        from app import database
+        importlib.reload(database)
+
+        assert database.IS_REMOTE_DATABASE is True
+        assert database.SQLITE_PRAGMAS == {}
+        assert database.engine.pool.size() == database.DB_PROFILES["default"]["pool_size"]
+
+def test_libsql_refuses_async_engine(caplog):
+    """Verify ENABLE_ASYNC_DB falls back to the sync endpoints on Turso (no real async driver)."""
+    with mock.patch.dict(os.environ, {"DATABASE_URL": "libsql://database.turso.io", "ENABLE_ASYNC_DB": "true"}):
+        from app import database
+        with caplog.at_level("WARNING", logger="app.database"):
+            importlib.reload(database)
+
+        assert database.ENABLE_ASYNC_DB is False
+        assert "ENABLE_ASYNC_DB ignored" in caplog.text
+        with pytest.raises(RuntimeError, match="No async driver for sqlite\\+libsql"):
+            database.get_async_engine()
+        assert database.async_engine is None
+
+    with mock.patch.dict(os.environ, {"DATABASE_URL": "sqlite:///./test.db", "ENABLE_ASYNC_DB": "true"}):
+        importlib.reload(database)
+
+        assert database.ENABLE_ASYNC_DB is True
+        assert database.ASYNC_DATABASE_URL == "sqlite+aiosqlite:///./test.db"
+
+def test_failing_pragma_does_not_skip_the_others(tmp_path, caplog):
+    """Verify each profile pragma is applied on its own and failures are logged."""
+    db_file = tmp_path / "pragmas.db"
+    with mock.patch.dict(os.environ, {"DATABASE_URL": f"sqlite:///{db_file}"}):
+        os.environ.pop("DB_PROFILE", None)
+        from app import database
+        importlib.reload(database)
+
+        with mock.patch.object(database, "SQLITE_PRAGMAS", {"cache_size": "'broken", "busy_timeout": 1234}), \
+             caplog.at_level("WARNING", logger="app.database"):
+            with database.engine.connect() as conn:
+                assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 1234
+                assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+        assert "PRAGMA cache_size='broken failed" in caplog.text
+        database.engine.dispose()
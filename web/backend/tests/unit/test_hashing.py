@@ -0,0 +1,84 @@
+"""Tests for the bcrypt hashing pool."""
+import asyncio
+import threading
+import time
+
+from app import auth, totp
+from app.hashing import HashPool
+
+
+def test_hash_pool_bounds_concurrency_and_reports_queue_depth():
+    pool = HashPool(max_workers=2)
+    running = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def work(n):
+        with lock:
+            running.append(n)
+            peak[0] = max(peak[0], len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(n)
+        return n * 2
+
+    async def runner():
+        return await asyncio.gather(*(pool.run(work, n) for n in range(6)))
+
+    try:
+        assert asyncio.run(runner()) == [0, 2, 4, 6, 8, 10]
+    finally:
+        pool.shutdown()
+
+    stats = pool.stats()
+    assert peak[0] == 2
+    # Two run, the others wait in the queue
+    assert stats["max_queue_depth"] >= 4
+    assert stats["completed"] == 6
+    assert stats["queued"] == 0 and stats["running"] == 0
+    assert stats["avg_wait_ms"] > 0
+
+
+def test_hashing_does_not_block_the_event_loop():
+    hashed = auth.get_password_hash("secret")
+
+    async def runner():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        valid = await auth.verify_password_async("secret", hashed)
+        invalid = await auth.verify_password_async("wrong", hashed)
+        task.cancel()
+        return valid, invalid, ticks
+
+    valid, invalid, ticks = asyncio.run(runner())
+    assert valid is True and invalid is False
+    # The loop kept running while bcrypt was busy on the pool
+    assert ticks > 0
+
+
+def test_backup_codes_async_round_trip():
+    codes = totp.generate_backup_codes(2)
+
+    async def runner():
+        hashed = await totp.hash_backup_codes_async(codes)
+        return await totp.verify_backup_code_async(hashed, codes[1])
+
+    is_valid, remaining = asyncio.run(runner())
+    assert is_valid is True
+    assert totp.get_remaining_backup_codes_count(remaining) == 1
+
+
+def test_hash_pool_runs_sync_callers_on_its_workers():
+    pool = HashPool(max_workers=1)
+    try:
+        assert pool.run_sync(lambda: threading.current_thread().name).startswith("hash")
+    finally:
+        pool.shutdown()
+    assert pool.stats()["completed"] == 1
@@ -0,0 +1,93 @@
+"""Tests for the login throttle."""
+import pytest
+from fastapi import HTTPException, Request
+
+from app import login_throttle as throttle_module
+from app.login_throttle import InMemoryThrottleStore, LoginThrottle, client_ip
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(throttle_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_failures_slide_out_of_the_window(clock):
+    throttle = LoginThrottle(InMemoryThrottleStore(), max_failures=3, ip_max_failures=100, window=60, lockout=300)
+
+    throttle.record_failure("anna", "10.0.0.1")
+    throttle.record_failure("anna", "10.0.0.1")
+    clock[0] += 61
+    throttle.record_failure("anna", "10.0.0.1")
+
+    throttle.check("anna", "10.0.0.1")
+    assert throttle.recent_lockouts() == []
+
+
+def test_lockout_expires(clock):
+    throttle = LoginThrottle(InMemoryThrottleStore(), max_failures=2, ip_max_failures=100, window=60, lockout=300)
+    throttle.record_failure("Anna", "10.0.0.1")
+    throttle.record_failure("anna", "10.0.0.2")
+
+    # Username lockout applies to every IP, case-insensitive
+    with pytest.raises(HTTPException) as exc_info:
+        throttle.check("ANNA", "10.0.0.3")
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["Retry-After"] == "300"
+
+    clock[0] += 301
+    throttle.check("anna", "10.0.0.3")
+
+
+def test_ip_lockout_and_success_reset(clock):
+    throttle = LoginThrottle(InMemoryThrottleStore(), max_failures=3, ip_max_failures=4, window=60, lockout=300)
+    throttle.record_failure("anna", "10.0.0.1")
+    throttle.record_failure("anna", "10.0.0.1")
+    throttle.record_success("anna", "10.0.0.1")
+    throttle.record_failure("anna", "10.0.0.1")
+
+    # The success reset the username counter, so anna is not locked ...
+    throttle.record_failure("ben", "10.0.0.1")
+    throttle.check("anna", "10.0.0.2")
+
+    # ... but the IP reached its limit across usernames
+    with pytest.raises(HTTPException):
+        throttle.check("carl", "10.0.0.1")
+    assert [event["scope"] for event in throttle.recent_lockouts()] == ["ip"]
+
+
+def test_store_drops_expired_keys_and_caps_size(clock):
+    store = InMemoryThrottleStore(max_keys=3)
+    throttle = LoginThrottle(store, max_failures=2, ip_max_failures=100, window=60, lockout=300)
+
+    # Random usernames from one IP: the oldest counters are evicted
+    for i in range(10):
+        throttle.record_failure(f"user{i}", "10.0.0.1")
+    assert store.size() == 3
+
+    # Counters outside the window are swept on the next write
+    clock[0] += 61
+    throttle.record_failure("anna", "10.0.0.2")
+    assert store.size() == 2
+
+    # Expired lockouts are swept on the next check
+    throttle.record_failure("anna", "10.0.0.2")
+    assert store.size() == 2  # anna locked, her counter dropped
+    clock[0] += 301
+    throttle.check("ben", "10.0.0.3")
+    assert store.size() == 1
+
+
+def test_client_ip_trusts_fly_header_only_when_configured(monkeypatch):
+    request = Request({
+        "type": "http",
+        "headers": [(b"fly-client-ip", b"203.0.113.9")],
+        "client": ("10.0.0.1", 1234),
+    })
+
+    monkeypatch.setattr(throttle_module, "TRUST_PROXY_HEADERS", False)
+    assert client_ip(request) == "10.0.0.1"
+
+    monkeypatch.setattr(throttle_module, "TRUST_PROXY_HEADERS", True)
+    assert client_ip(request) == "203.0.113.9"
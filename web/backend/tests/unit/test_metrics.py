@@ -0,0 +1,84 @@
+"""Tests for the metrics primitives and the engine instrumentation."""
+import pytest
+from sqlalchemy import create_engine, text
+
+from app import metrics
+from app.metrics import (
+    Counter,
+    Histogram,
+    RequestStats,
+    TimedQueuePool,
+    _Metric,
+    current_request_stats,
+    db_pool_checkout_wait_seconds,
+    instrument_engine,
+    normalize_sql,
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_latency_seconds", "Test latency", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5.0, "/a")
+
+    lines = histogram.render()
+    assert "# TYPE test_latency_seconds histogram" in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'test_latency_seconds_count{route="/a"} 3' in lines
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("test_total", "Test counter", ("path",))
+    counter.inc('a"b')
+    counter.inc('a"b', amount=2)
+    assert counter.render()[-1] == 'test_total{path="a\\"b"} 3'
+
+
+def test_instrumented_engine_attributes_queries_to_request(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'metrics.db'}", poolclass=TimedQueuePool)
+    instrument_engine(engine)
+    instrument_engine(engine)  # idempotent
+    waits_before = db_pool_checkout_wait_seconds.count()
+
+    stats = RequestStats()
+    token = current_request_stats.set(stats)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+    finally:
+        current_request_stats.reset(token)
+        engine.dispose()
+
+    assert stats.queries == 2
+    assert stats.query_seconds > 0
+    assert db_pool_checkout_wait_seconds.count() == waits_before + 1
+
+
+def test_normalize_sql_collapses_whitespace_and_parameter_lists():
+    assert normalize_sql("SELECT a\n  FROM t\n WHERE id IN (?, ?, ?)") == "SELECT a FROM t WHERE id IN (?, ...)"
+    assert normalize_sql("WHERE (a, b) IN ((?, ?), (?, ?))") == "WHERE (a, b) IN ((?, ...), ...)"
+
+
+def test_slow_statements_are_logged(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(metrics, "SLOW_QUERY_MS", 0)
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    instrument_engine(engine)
+    with caplog.at_level("WARNING", logger="app.slow_query"):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1   WHERE 1 IN (1, 2)"))
+    engine.dispose()
+
+    assert "[-] SELECT 1 WHERE 1 IN (1, 2)" in caplog.text
+
+
+def test_metric_base_requires_render_and_clear():
+    class Incomplete(_Metric):
+        def render(self):
+            return []
+
+    with pytest.raises(TypeError):
+        Incomplete("aquarius_incomplete", "Missing clear()")
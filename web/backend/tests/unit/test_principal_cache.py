@@ -0,0 +1,67 @@
+"""Tests for the authenticated-principal cache."""
+from app.principal_cache import Principal, PrincipalCache
+
+
+def make_principal(username: str, **overrides) -> Principal:
+    fields = dict(
+        id=1,
+        username=username,
+        role="VERWALTUNG",
+        is_active=True,
+        is_app_user=True,
+        can_read_all=True,
+        can_write_all=False,
+    )
+    fields.update(overrides)
+    return Principal(**fields)
+
+
+def test_cache_counts_hits_and_misses():
+    cache = PrincipalCache(ttl=60, maxsize=10)
+
+    assert cache.get("anna") is None
+    cache.put(make_principal("anna"))
+    assert cache.get("anna").username == "anna"
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_ratio"] == 0.5
+
+
+def test_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.principal_cache.time.monotonic", lambda: now[0])
+    cache = PrincipalCache(ttl=30, maxsize=10)
+    cache.put(make_principal("anna"))
+
+    now[0] += 29
+    assert cache.get("anna") is not None
+    now[0] += 2
+    assert cache.get("anna") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = PrincipalCache(ttl=60, maxsize=2)
+    cache.put(make_principal("anna"))
+    cache.put(make_principal("ben"))
+    cache.get("anna")
+    cache.put(make_principal("carl"))
+
+    assert cache.get("ben") is None
+    assert cache.get("anna") is not None
+    assert cache.get("carl") is not None
+
+
+def test_cache_invalidate():
+    cache = PrincipalCache(ttl=60, maxsize=10)
+    cache.put(make_principal("anna"))
+
+    cache.invalidate("anna")
+    assert cache.get("anna") is None
+
+
+def test_cache_disabled_with_zero_ttl():
+    cache = PrincipalCache(ttl=0, maxsize=10)
+    cache.put(make_principal("anna"))
+    assert cache.get("anna") is None
@@ -0,0 +1,62 @@
+"""Tests for read/write routing to the Turso embedded replica."""
+import os
+import importlib
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app import database
+
+
+def make_request(cookie: str = "") -> Request:
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "method": "GET", "path": "/api/kind", "headers": headers})
+
+
+def resolve(request, primary):
+    gen = database.get_read_db(request, primary)
+    session = next(gen)
+    gen.close()
+    return session
+
+
+def test_reads_use_primary_without_replica():
+    primary = object()
+    with mock.patch.object(database, "ReplicaSessionLocal", None):
+        assert resolve(make_request(), primary) is primary
+
+
+def test_reads_use_replica_when_configured():
+    replica_factory = sessionmaker(bind=create_engine("sqlite://"))
+    primary = object()
+    with mock.patch.object(database, "ReplicaSessionLocal", replica_factory):
+        session = resolve(make_request(), primary)
+        assert session is not primary
+        assert session.bind is replica_factory.kw["bind"]
+
+
+def test_recent_writer_sticks_to_primary():
+    replica_factory = sessionmaker(bind=create_engine("sqlite://"))
+    primary = object()
+    with mock.patch.object(database, "ReplicaSessionLocal", replica_factory):
+        request = make_request(f"{database.READ_YOUR_WRITES_COOKIE}=1")
+        assert resolve(request, primary) is primary
+
+
+def test_replica_engine_configured_for_turso():
+    with mock.patch.dict(os.environ, {
+        "DATABASE_URL": "libsql://database.turso.io",
+        "TURSO_AUTH_TOKEN": "secret-token",
+        "TURSO_REPLICA_PATH": "/tmp/aquarius-replica.db",
+        "TURSO_SYNC_INTERVAL": "15",
+    }):
+        importlib.reload(database)
+        try:
+            assert database.replica_engine is not None
+            assert database.replica_engine.url.database == "/tmp/aquarius-replica.db"
+            assert database.TURSO_SYNC_INTERVAL == 15.0
+        finally:
+            os.environ.pop("TURSO_REPLICA_PATH")
+            importlib.reload(database)
@@ -0,0 +1,93 @@
+"""Tests for serving the built frontend from memory."""
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from app.spa import ASSET_CACHE_CONTROL, AssetFiles, SpaFiles, accepted_encodings
+
+
+@pytest.fixture
+def dist(tmp_path):
+    (tmp_path / "index.html").write_bytes(b"<html>app</html>")
+    (tmp_path / "index.html.gz").write_bytes(gzip.compress(b"<html>app</html>"))
+    (tmp_path / "vite.svg").write_bytes(b"<svg/>")
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    (assets / "index-1a2b3c.js").write_bytes(b"console.log(1)")
+    (assets / "index-1a2b3c.js.gz").write_bytes(gzip.compress(b"console.log(1)"))
+    (assets / "logo-4d5e6f.png").write_bytes(b"png")
+    return tmp_path
+
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip, deflate, br") == ["br", "gzip"]
+    assert accepted_encodings("br;q=0, gzip;q=0.5") == ["gzip"]
+    assert accepted_encodings("*") == ["br", "gzip"]
+    assert accepted_encodings(None) == []
+
+
+def test_index_served_from_memory(dist):
+    spa_files = SpaFiles(str(dist))
+    assert spa_files.load()
+    (dist / "index.html").unlink()
+
+    response = spa_files.index.response({})
+    assert response.body == b"<html>app</html>"
+    assert response.headers["Cache-Control"] == "no-cache"
+    etag = response.headers["ETag"]
+    assert etag.startswith('"')
+
+    assert spa_files.index.response({"if-none-match": etag}).status_code == 304
+
+
+def test_precompressed_variant_has_its_own_etag(dist):
+    spa_files = SpaFiles(str(dist))
+    spa_files.load()
+
+    plain = spa_files.index.response({})
+    compressed = spa_files.index.response({"accept-encoding": "gzip, br"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(compressed.body) == plain.body
+    assert compressed.headers["ETag"] != plain.headers["ETag"]
+
+
+def test_root_files_are_looked_up_by_name_only(dist):
+    spa_files = SpaFiles(str(dist))
+    spa_files.load()
+
+    assert spa_files.get("vite.svg").media_type == "image/svg+xml"
+    assert spa_files.get("index.html.gz") is None
+    assert spa_files.get("assets/index-1a2b3c.js") is None
+    assert spa_files.get("../etc/passwd") is None
+
+
+def test_missing_dist(tmp_path):
+    spa_files = SpaFiles(str(tmp_path / "missing"))
+    assert not spa_files.load()
+    assert spa_files.index is None
+
+
+def test_assets_are_immutable_and_precompressed(dist):
+    app = Starlette(routes=[Mount("/assets", AssetFiles(directory=str(dist / "assets")))])
+    client = TestClient(app)
+
+    response = client.get("/assets/index-1a2b3c.js", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Content-Type"].startswith("text/javascript")
+    assert response.headers["Cache-Control"] == ASSET_CACHE_CONTROL
+    assert response.content == b"console.log(1)"  # decoded by the client
+
+    response = client.get("/assets/index-1a2b3c.js", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+    response = client.get("/assets/logo-4d5e6f.png")
+    assert response.headers["Cache-Control"] == ASSET_CACHE_CONTROL
+    etag = response.headers["ETag"]
+    response = client.get("/assets/logo-4d5e6f.png", headers={"If-None-Match": etag})
+    assert response.status_code == 304
@@ -0,0 +1,79 @@
+"""Tests for the background status sampler."""
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy.orm import sessionmaker
+
+from app.status_sampler import StatusSampler, percentile, trend
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) is None
+
+
+def test_trend():
+    assert trend([1.0, 1.0, 1.0]) is None
+    assert trend([1.0, 1.0, 2.0, 2.0]) == "rising"
+    assert trend([2.0, 2.0, 1.0, 1.0]) == "falling"
+    assert trend([1.0, 1.05, 1.0, 1.05]) == "stable"
+
+
+def test_sample_keeps_ring_buffer_and_snapshot(db):
+    sampler = StatusSampler(session_factory=sessionmaker(bind=db.get_bind()), history=3)
+    assert sampler.snapshot() is None
+
+    first = sampler.sample()
+    for _ in range(4):
+        snapshot = sampler.sample()
+
+    assert sampler.snapshot() is snapshot
+    assert snapshot["performance_rows"] == first["performance_rows"] + 4
+    assert snapshot["counts"] == {"users": 0, "kind": 0, "anmeldung": 0, "wettkampf": 0}
+    assert snapshot["latency"]["write"]["samples"] == 3
+    assert snapshot["latency"]["read"]["p95"] is not None
+
+
+def test_failed_sample_keeps_previous_snapshot(db):
+    sampler = StatusSampler(session_factory=sessionmaker(bind=db.get_bind()))
+    snapshot = sampler.sample()
+
+    def broken_session():
+        raise RuntimeError("database unavailable")
+
+    sampler.session_factory = broken_session
+    assert sampler.sample() is snapshot
+
+
+def test_concurrent_samples_probe_one_at_a_time(db):
+    factory = sessionmaker(bind=db.get_bind())
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    @contextmanager
+    def tracked_session():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        try:
+            time.sleep(0.02)
+            with factory() as session:
+                yield session
+        finally:
+            with lock:
+                active[0] -= 1
+
+    sampler = StatusSampler(session_factory=tracked_session)
+    threads = [threading.Thread(target=sampler.sample) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] == 1
+    assert sampler.snapshot()["latency"]["write"]["samples"] == 4
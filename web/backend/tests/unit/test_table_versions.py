@@ -0,0 +1,142 @@
+"""Tests for the table change counters and the Grunddaten list cache built on them."""
+from datetime import date
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import Base
+from app.grunddaten.cache import ReferenceDataCache
+from app.shared.conditional import etag_matches
+from app.shared.versions import TableVersions
+
+
+def version(db, table_name):
+    return db.scalar(
+        select(models.TableVersion.version)
+        .where(models.TableVersion.table_name == table_name)
+    ) or 0
+
+
+def test_cache_skips_loader_until_version_changes(db):
+    cache = ReferenceDataCache(TableVersions(check_interval=0))
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return f"payload {len(loads)}".encode()
+
+    assert cache.get_or_load(db, "saison", (0, 100), loader) == b"payload 1"
+    assert cache.get_or_load(db, "saison", (0, 100), loader) == b"payload 1"
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    db.add(models.Saison(name="2024", from_date=date(2024, 1, 1), to_date=date(2024, 12, 31)))
+    db.commit()
+
+    assert cache.get_or_load(db, "saison", (0, 100), loader) == b"payload 2"
+
+
+def test_each_transaction_bumps_once(db):
+    db.add(models.Schwimmbad(name="Bad 0", adresse="Weg 1"))
+    db.commit()
+    before = version(db, "schwimmbad")
+    assert before > 0  # new counters start at a random value
+
+    db.add_all([models.Schwimmbad(name=f"Bad {i}", adresse="Weg 1") for i in range(1, 4)])
+    db.commit()
+    assert version(db, "schwimmbad") == before + 1
+
+    bad = db.scalars(select(models.Schwimmbad)).first()
+    bad.name = "Freibad"
+    db.commit()
+    db.delete(bad)
+    db.commit()
+
+    assert version(db, "schwimmbad") == before + 3
+
+
+def test_bulk_statements_bump(db):
+    before = version(db, "figur")
+    db.execute(insert(models.Figur), [{"name": "Ballettbein", "kategorie": "Basis", "schwierigkeitsgrad": 11}])
+    db.commit()
+
+    assert version(db, "figur") != before
+
+
+def test_other_worker_sees_change_after_check_interval(db):
+    # Two readers stand in for two worker processes sharing the database
+    slow = TableVersions(check_interval=3600)
+    fast = TableVersions(check_interval=0)
+    assert slow.current(db).get("verein", 0) == fast.current(db).get("verein", 0) == 0
+
+    db.add(models.Verein(name="SC Test", ort="Wien", register_id="R1", contact="x"))
+    db.commit()
+
+    assert fast.current(db)["verein"] == version(db, "verein")
+    assert slow.current(db).get("verein", 0) == 0
+
+
+def test_counters_are_cached_per_engine(db, tmp_path):
+    # The embedded replica lags behind the primary - it must not share its counters
+    versions = TableVersions(check_interval=3600)
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=replica)
+    db.add(models.Verein(name="SC Test", ort="Wien", register_id="R1", contact="x"))
+    db.commit()
+
+    with Session(replica) as replica_db:
+        assert versions.current(db)["verein"] == version(db, "verein")
+        assert versions.current(replica_db).get("verein", 0) == 0
+    replica.dispose()
+
+
+def test_kind_updates_bump_verband_only_on_reassignment(db):
+    verband = models.Verband(name="Verband A", abkuerzung="VA", land="AT", ort="Wien")
+    db.add(verband)
+    db.commit()
+    kind = models.Kind(vorname="Anna", nachname="Test", geburtsdatum=date(2012, 3, 4), geschlecht="W")
+    db.add(kind)
+    db.commit()
+    after_insert = version(db, "verband")
+
+    kind.vorname = "Anna-Lena"
+    db.commit()
+    assert version(db, "verband") == after_insert
+
+    kind.verband_id = verband.id
+    db.commit()
+    assert version(db, "verband") == after_insert + 1
+
+
+def test_rollback_does_not_bump(db):
+    before = version(db, "figur")
+    db.add(models.Figur(name="Ballettbein", kategorie="Test", schwierigkeitsgrad=11))
+    db.flush()
+    db.rollback()
+
+    assert version(db, "figur") == before
+
+
+def test_etag_matches_weak_comparison():
+    assert etag_matches('W/"abc"', 'W/"abc"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('W/"x", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches('W/"abd"', 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
+
+
+def test_cache_keeps_primary_and_replica_payloads(db, tmp_path):
+    # Read-your-writes clients read the primary while the replica lags
+    cache = ReferenceDataCache(TableVersions(check_interval=0))
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=replica)
+    db.add(models.Saison(name="2024", from_date=date(2024, 1, 1), to_date=date(2024, 12, 31)))
+    db.commit()
+
+    with Session(replica) as replica_db:
+        for _ in range(2):
+            assert cache.get_or_load(db, "saison", (0, 100), lambda: b"primary") == b"primary"
+            assert cache.get_or_load(replica_db, "saison", (0, 100), lambda: b"replica") == b"replica"
+    assert cache.stats() == {"hits": 2, "misses": 2, "entries": 2}
+    replica.dispose()
@@ -0,0 +1,20 @@
+"""Tests for the TOTP provisioning QR code rendering."""
+import base64
+
+from app import totp
+
+
+def test_qr_code_is_svg_and_cached_per_secret():
+    secret = totp.generate_totp_secret()
+
+    svg = totp.render_qr_code_svg(secret, "anna")
+    assert svg.startswith(b"<svg")
+    assert totp.render_qr_code_svg(secret, "anna") is svg
+
+    data_url = totp.generate_qr_code(secret, "anna")
+    assert data_url.startswith("data:image/svg+xml;base64,")
+    assert base64.b64decode(data_url.split(",", 1)[1]) == svg
+
+    totp.forget_qr_code(secret)
+    assert totp.render_qr_code_svg(secret, "anna") is not svg
+    totp.forget_qr_code(secret)
@@ -0,0 +1,67 @@
+"""Tests for the trigger-maintained Verband nomination counts."""
+from datetime import date
+
+from sqlalchemy import create_engine, text, update
+
+from app import models
+from app.grunddaten import nominations
+
+
+def make_kind(verband=None, name="Kind"):
+    return models.Kind(vorname=name, nachname="Test", geburtsdatum=date(2014, 1, 1), verband=verband)
+
+
+def counts(db, *verbaende):
+    db.expire_all()
+    return [v.nomination_count for v in verbaende]
+
+
+def test_kind_writes_maintain_counts(db):
+    a = models.Verband(name="Verband A", abkuerzung="VA", land="AT", ort="Wien")
+    b = models.Verband(name="Verband B", abkuerzung="VB", land="AT", ort="Graz")
+    kinder = [make_kind(a, f"Kind{i}") for i in range(3)] + [make_kind(None, "Ohne")]
+    db.add_all([a, b, *kinder])
+    db.commit()
+    assert counts(db, a, b) == [3, 0]
+
+    kinder[0].verband = b
+    kinder[3].verband = b
+    db.commit()
+    assert counts(db, a, b) == [2, 2]
+
+    db.delete(kinder[1])
+    db.commit()
+    assert counts(db, a, b) == [1, 2]
+
+    # Bulk statements bypass the ORM but not the triggers
+    db.execute(update(models.Kind).where(models.Kind.verband_id == b.id).values(verband_id=None))
+    db.commit()
+    assert counts(db, a, b) == [1, 0]
+
+
+def test_rebuild_repairs_drift(db):
+    verband = models.Verband(name="Verband D", abkuerzung="VD", land="AT", ort="Linz")
+    db.add_all([verband, make_kind(verband), make_kind(verband)])
+    db.commit()
+    db.execute(text("UPDATE verband SET nomination_count = 7"))
+    db.commit()
+
+    assert nominations.rebuild(db.connection()) == 1
+    db.commit()
+    assert counts(db, verband) == [2]
+    assert nominations.rebuild(db.connection()) == 0
+
+
+def test_install_fills_the_column_of_an_existing_database():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE verband (id INTEGER PRIMARY KEY, name TEXT)"))
+        connection.execute(text("CREATE TABLE kind (id INTEGER PRIMARY KEY, verband_id INTEGER)"))
+        connection.execute(text("INSERT INTO verband (id, name) VALUES (1, 'A'), (2, 'B')"))
+        connection.execute(text("INSERT INTO kind (verband_id) VALUES (1), (1), (NULL)"))
+
+        assert nominations.install(connection)
+        connection.execute(text("INSERT INTO kind (verband_id) VALUES (2)"))
+
+        rows = connection.execute(text("SELECT id, nomination_count FROM verband ORDER BY id")).all()
+    assert [tuple(row) for row in rows] == [(1, 2), (2, 1)]